@@ -1,10 +1,29 @@
+import io
 import os
-import sys
-import re
-import subprocess
-from flask import Flask, request, jsonify
+import calendar
+import json
+import time
+import hashlib
+import importlib.metadata
+import threading
+import itertools
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 
+import jobs
+import cache
+import metrics
+import i18n
+import rules
+import texts
+from bazi import compute_chart, print_chart, analyse_pillars, timeline, shen_list
+from ganzhi import zhi_seqs, jiazi_seqs, zhi_att_labels, zhi_att_bits
+from datas import empty_masks
+
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
@@ -18,136 +37,8 @@ def after_request(response):
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # ============================================================
-# MAPPINGS (FR)
+# UTILITAIRES
 # ============================================================
-TRONC_INFO = {
-    '甲': {'pinyin':'Jiǎ','element':'Bois','pol':'+'},
-    '乙': {'pinyin':'Yǐ','element':'Bois','pol':'-'},
-    '丙': {'pinyin':'Bǐng','element':'Feu','pol':'+'},
-    '丁': {'pinyin':'Dīng','element':'Feu','pol':'-'},
-    '戊': {'pinyin':'Wù','element':'Terre','pol':'+'},
-    '己': {'pinyin':'Jǐ','element':'Terre','pol':'-'},
-    '庚': {'pinyin':'Gēng','element':'Métal','pol':'+'},
-    '辛': {'pinyin':'Xīn','element':'Métal','pol':'-'},
-    '壬': {'pinyin':'Rén','element':'Eau','pol':'+'},
-    '癸': {'pinyin':'Guǐ','element':'Eau','pol':'-'},
-}
-
-BRANCHE_INFO = {
-    '子': {'pinyin':'Zǐ','element':'Eau','animal':'Rat 🐀'},
-    '丑': {'pinyin':'Chǒu','element':'Terre','animal':'Buffle 🐂'},
-    '寅': {'pinyin':'Yín','element':'Bois','animal':'Tigre 🐅'},
-    '卯': {'pinyin':'Mǎo','element':'Bois','animal':'Lapin 🐇'},
-    '辰': {'pinyin':'Chén','element':'Terre','animal':'Dragon 🐉'},
-    '巳': {'pinyin':'Sì','element':'Feu','animal':'Serpent 🐍'},
-    '午': {'pinyin':'Wǔ','element':'Feu','animal':'Cheval 🐴'},
-    '未': {'pinyin':'Wèi','element':'Terre','animal':'Chèvre 🐐'},
-    '申': {'pinyin':'Shēn','element':'Métal','animal':'Singe 🐒'},
-    '酉': {'pinyin':'Yǒu','element':'Métal','animal':'Coq 🐓'},
-    '戌': {'pinyin':'Xū','element':'Terre','animal':'Chien 🐕'},
-    '亥': {'pinyin':'Hài','element':'Eau','animal':'Cochon 🐖'},
-}
-
-# 十神 -> FR
-SHISHEN_FR = {
-    '比':'Parallèle',
-    '劫':'Rob. richesse',
-    '食':'Dieu gourmand',
-    '伤':'Officier blessant',
-    '才':'Richesse partielle',
-    '财':'Richesse directe',
-    '杀':'7e tueur',
-    '官':'Officier direct',
-    '枭':'Sceau partiel',
-    '印':'Sceau direct',
-    '--':'Maître du jour'
-}
-
-# 长生十二神 (si jamais présent dans les sorties)
-PHASE_FR = {
-    # Plein (12 phases)
-    '长生': 'Longévité (naissance)',
-    '沐浴': 'Bain (purification)',
-    '冠带': 'Couronne (mise en forme)',
-    '临官': 'Prise de fonction',
-    '帝旺': 'Apogée',
-    '衰': 'Déclin',
-    '病': 'Maladie',
-    '死': 'Fin / mort',
-    '墓': 'Tombe / stockage',
-    '绝': 'Extinction',
-    '胎': 'Fœtus',
-    '养': 'Gestation',
-
-    # Abréviations souvent imprimées par certains moteurs
-    '长': 'Longévité (naissance)',      # 长生
-    '沐': 'Bain (purification)',        # 沐浴
-    '冠': 'Couronne (mise en forme)',   # 冠带
-    '临': 'Prise de fonction',          # 临官
-    '建': 'Prise de fonction',          # 临官 / 建禄 (selon implémentation)
-    '帝': 'Apogée',                      # 帝旺
-    '旺': 'Apogée',
-}
-
-# 纳音 -> FR (avec variantes d'écriture rencontrées)
-NAYIN_FR = {
-    '海中金': "Métal dans la mer",
-    '炉中火': "Feu du four",
-    '大林木': "Bois de grande forêt",
-    '路旁土': "Terre en bord de route",
-    '剑锋金': "Métal – lame d'épée",
-    '山头火': "Feu du sommet",
-    '涧下水': "Eau du ravin",
-    '城头土': "Terre des remparts",
-    '白蜡金': "Métal de cire blanche",
-    '杨柳木': "Bois de saule",
-    '泉中水': "Eau de la source",
-    '屋上土': "Terre sur le toit",
-    '霹雳火': "Feu du tonnerre",
-    '松柏木': "Bois de pin/cyprès",
-    '长流水': "Eau de long cours",
-    '砂中金': "Métal dans le sable",
-    '沙中金': "Métal dans le sable",
-    '山下火': "Feu au pied de la montagne",
-    '平地木': "Bois de plaine",
-    '壁上土': "Terre sur le mur",
-    '金泊金': "Métal – feuille d'or",
-    '金箔金': "Métal – feuille d'or",
-    '佛灯火': "Feu de la lampe du Bouddha",
-    '天河水': "Eau de la Voie lactée",
-    '大驿土': "Terre de la grande poste",
-    '钗钏金': "Métal des bijoux",
-    '桑柘木': "Bois de mûrier",
-    '大溪水': "Eau du grand ruisseau",
-    '砂中土': "Terre dans le sable",
-    '沙中土': "Terre dans le sable",
-    '天上火': "Feu céleste",
-    '石榴木': "Bois de grenadier",
-    '大海水': "Eau de l'océan",
-    '覆灯火': "Feu de la lampe (couvrante)",
-    '井泉水': "Eau de puits / source"
-}
-
-def _strip_ansi(s: str) -> str:
-    return re.sub(r'\x1b\[[0-9;]*m', '', s or '')
-
-def _ganzhi_details(gz: str):
-    if not gz or len(gz) < 2:
-        return None
-    t, b = gz[0], gz[1]
-    ti = TRONC_INFO.get(t, {})
-    bi = BRANCHE_INFO.get(b, {})
-    return {
-        'ganzhi': gz,
-        'tronc': t,
-        'branche': b,
-        'tronc_pinyin': ti.get('pinyin', ''),
-        'branche_pinyin': bi.get('pinyin', ''),
-        'tronc_element': ti.get('element', ''),
-        'branche_element': bi.get('element', ''),
-        'animal': bi.get('animal', ''),
-    }
-
 def _safe_int(val, default, min_v=None, max_v=None):
     try:
         x = int(str(val).strip())
@@ -160,232 +51,791 @@ def _safe_int(val, default, min_v=None, max_v=None):
         return default
 
 # ============================================================
-# PARSING
+# MÉTRIQUES (GET /metrics, texte Prometheus)
 # ============================================================
-def parse_bazi_output(raw: str):
-    c = _strip_ansi(raw)
+METRIQUES = metrics.Registry()
+REQUETES = METRIQUES.counter('bazi_http_requests_total', 'Requêtes HTTP par route et statut',
+                             ('endpoint', 'status'))
+LATENCE_REQUETE = METRIQUES.histogram('bazi_http_request_duration_seconds', 'Durée des requêtes HTTP',
+                                      ('endpoint',))
+# Étapes : cache_lookup, lunar, analyse, yun (voir bazi.compute_chart), build, raw_output, cache_store.
+# Les éléments de /bazi/batch sont calculés dans le pool : leurs étapes n'apparaissent pas ici.
+LATENCE_ETAPE = METRIQUES.histogram('bazi_stage_duration_seconds', 'Durée des étapes du calcul d’un thème',
+                                    ('stage',))
+
+_en_cours = 0
+_en_cours_lock = threading.Lock()
+
+@app.before_request
+def _debut_requete():
+    global _en_cours
+    g.debut = time.perf_counter()
+    with _en_cours_lock:
+        _en_cours += 1
+
+@app.after_request
+def _mesure_requete(response):
+    endpoint = request.endpoint or 'inconnu'
+    REQUETES.inc(endpoint, response.status_code)
+    LATENCE_REQUETE.observe(time.perf_counter() - g.debut, endpoint)
+    return response
+
+@app.teardown_request
+def _fin_requete(exc):
+    global _en_cours
+    with _en_cours_lock:
+        _en_cours -= 1
+
+@METRIQUES.callback('bazi_http_requests_in_flight', 'Requêtes HTTP en cours dans ce worker')
+def _metrique_en_cours():
+    return [((), _en_cours)]
+
+def _memos():
+    # Caches en mémoire (functools.lru_cache) du worker
+    return [('analyse_pillars', analyse_pillars.cache_info()),
+            ('rules_candidates', rules.candidates.cache_info())]
+
+def _caches():
+    # (nom, succès, échecs) de chaque niveau de cache
+    caches = [(name, info.hits, info.misses) for name, info in _memos()]
+    caches.append(('resultats_disque', RESULT_CACHE.hits, RESULT_CACHE.misses))
+    return caches
+
+@METRIQUES.callback('bazi_cache_requests_total', 'Consultations des caches par résultat',
+                    ('cache', 'result'), type='counter')
+def _metrique_caches():
+    return [item for name, hits, misses in _caches()
+            for item in (((name, 'hit'), hits), ((name, 'miss'), misses))]
+
+@METRIQUES.callback('bazi_cache_hit_ratio', 'Proportion de succès des caches depuis le démarrage', ('cache',))
+def _metrique_ratio():
+    return [((name,), hits / (hits + misses) if hits + misses else 0) for name, hits, misses in _caches()]
+
+@METRIQUES.callback('bazi_cache_entries', 'Entrées des caches en mémoire', ('cache',))
+def _metrique_entrees():
+    return [((name,), info.currsize) for name, info in _memos()]
+
+@METRIQUES.callback('bazi_single_flight_total', 'Calculs lancés, appels regroupés, attentes expirées, erreurs',
+                    ('result',), type='counter')
+def _metrique_single_flight():
+    stats = SINGLE_FLIGHT.stats()
+    return [((name,), stats[name]) for name in ('leaders', 'coalesced', 'timeouts', 'errors')]
+
+@METRIQUES.callback('bazi_single_flight_in_flight', 'Calculs regroupables en cours')
+def _metrique_single_flight_en_cours():
+    return [((), SINGLE_FLIGHT.stats()['in_flight'])]
+
+@METRIQUES.callback('process_resident_memory_bytes', 'Mémoire résidente du worker')
+def _metrique_rss():
+    return [((), metrics.rss_bytes())]
+
+@METRIQUES.callback('bazi_engine_info', 'Version du moteur servie par ce worker', ('version',))
+def _metrique_version():
+    return [((ENGINE_VERSION,), 1)]
+
+
+# ============================================================
+# CALCUL (dans le processus, sans sous-processus)
+# ============================================================
+PILIER_NOMS = ['annee', 'mois', 'jour', 'heure']
+
+# Champs de la réponse sélectionnables avec fields=, et sections de bazi.py
+# qu'ils demandent (voir bazi.section_deps). Les *_details suivent leur palais.
+CHAMPS = {
+    'quatre_piliers': (), 'piliers': (), 'wuxing': (), 'force': (), 'moyenne': (),
+    'organes': ('organs',), 'dayun': ('dayun',),
+    'date_solaire': (), 'date_lunaire': (), 'mois_intercalaire': (),
+    'ming_gong': (), 'tai_yuan': (), 'shen_gong': (),
+    'resume_fr': ('dayun',),
+    'textes': ('classics',),
+}
+
+# Champs lus par build_resume_fr
+RESUME_CHAMPS = ('quatre_piliers', 'date_solaire', 'date_lunaire', 'piliers', 'wuxing',
+                 'force', 'moyenne', 'ming_gong', 'tai_yuan', 'shen_gong', 'dayun')
+
+ORGANES_FR = {'胆':'vesicule','肝':'foie','小肠':'intestin_grele',
+              '心':'coeur','胃':'estomac','脾':'rate',
+              '大肠':'gros_intestin','肺':'poumon',
+              '膀胱':'vessie','肾':'rein'}
+
+def api_sections(fields=None):
+    """Sections de bazi.py à calculer pour les champs demandés (tous si None)."""
+    return sorted({section for name in (fields or CHAMPS) for section in CHAMPS[name]})
+
+
+def build_bazi_result(chart, fields=None, lang=i18n.LANGUE_DEFAUT):
+    """Construit la réponse JSON directement depuis un bazi.Chart, limitée aux champs demandés.
+
+    Les piliers, grandes fortunes et *_details sont les fragments pré-construits de i18n.
+    """
+    fields = set(fields or CHAMPS)
+    # resume_fr est construit à partir d'autres champs, retirés ensuite s'ils n'ont pas été demandés
+    need = fields | set(RESUME_CHAMPS) if 'resume_fr' in fields else fields
     result = {}
+    zhus = [gan + zhi for gan, zhi in chart.zhus]
 
-    # --- QUATRE PILIERS ---
-    m = re.search(r'四柱：(\S{2})\s+(\S{2})\s+(\S{2})\s+(\S{2})', c)
-    if m:
-        pillars = [m.group(1), m.group(2), m.group(3), m.group(4)]
-        result['quatre_piliers'] = ' '.join(pillars)
-        names = ['annee','mois','jour','heure']
-        result['piliers'] = {}
-        for i, name in enumerate(names):
-            det = _ganzhi_details(pillars[i]) or {'ganzhi': pillars[i]}
-            result['piliers'][name] = {
-                'tronc': det.get('tronc',''),
-                'branche': det.get('branche',''),
-                'binome': det.get('ganzhi', pillars[i]),
-                'tronc_pinyin': det.get('tronc_pinyin',''),
-                'branche_pinyin': det.get('branche_pinyin',''),
-                'tronc_element': det.get('tronc_element',''),
-                'branche_element': det.get('branche_element',''),
-                'animal': det.get('animal',''),
-            }
-
-    # --- DIX DIEUX (SHISHEN) ---
-    m = re.search(
-        r'([甲乙丙丁戊己庚辛壬癸])\s+([甲乙丙丁戊己庚辛壬癸])\s+([甲乙丙丁戊己庚辛壬癸])\s+([甲乙丙丁戊己庚辛壬癸])\s+'
-        r'(比|劫|食|伤|才|财|杀|官|枭|印|--)\s+(比|劫|食|伤|才|财|杀|官|枭|印|--)\s+(比|劫|食|伤|才|财|杀|官|枭|印|--)\s+(比|劫|食|伤|才|财|杀|官|枭|印|--)',
-        c)
-    if m and 'piliers' in result:
-        gods = [m.group(5), m.group(6), m.group(7), m.group(8)]
-        for i, name in enumerate(['annee','mois','jour','heure']):
-            result['piliers'][name]['shishen'] = gods[i]
-            result['piliers'][name]['shishen_fr'] = SHISHEN_FR.get(gods[i], gods[i])
+    # --- QUATRE PILIERS + DIX DIEUX ---
+    if 'quatre_piliers' in need:
+        result['quatre_piliers'] = ' '.join(zhus)
+    if 'piliers' in need:
+        piliers = i18n.PILIERS[lang]
+        result['piliers'] = {name: piliers[chart.jiazi_ids[i]][i18n.shishen_id(chart.gan_shens[i])]
+                             for i, name in enumerate(PILIER_NOMS)}
 
     # --- CINQ ELEMENTS ---
-    m = re.search(r'金(\d+)\s+木(\d+)\s+水(\d+)\s+火(\d+)\s+土(\d+)', c)
-    if m:
+    if 'wuxing' in need:
+        scores = chart.scores
         result['wuxing'] = {
-            'metal': int(m.group(1)), 'bois': int(m.group(2)),
-            'eau': int(m.group(3)), 'feu': int(m.group(4)),
-            'terre': int(m.group(5))
+            'metal': scores['金'], 'bois': scores['木'],
+            'eau': scores['水'], 'feu': scores['火'],
+            'terre': scores['土']
         }
 
     # --- FORCE ---
-    m = re.search(r'强弱:(\d+)\s+中值(\d+)', c)
-    if m:
-        result['force'] = int(m.group(1))
-        result['moyenne'] = int(m.group(2))
+    if 'force' in need:
+        result['force'] = chart.strong
+    if 'moyenne' in need:
+        result['moyenne'] = 29
 
     # --- ORGANES ---
-    organes = {}
-    for cn, fr in {'胆':'vesicule','肝':'foie','小肠':'intestin_grele',
-                   '心':'coeur','胃':'estomac','脾':'rate',
-                   '大肠':'gros_intestin','肺':'poumon',
-                   '膀胱':'vessie','肾':'rein'}.items():
-        m2 = re.search(cn + r':\s*(\d+)', c)
-        if m2:
-            organes[fr] = int(m2.group(1))
-    if organes:
-        result['organes'] = organes
+    if 'organes' in need:
+        result['organes'] = {ORGANES_FR[cn]: n for cn, n in chart.organs.items() if cn in ORGANES_FR}
 
     # --- DA YUN (grandes fortunes) ---
-    # NB: dans ton bazi.py, le champ (\S+) après le Ganzhi est souvent un indicateur (souvent 十神),
-    # on garde la clé "phase" pour compat, et on ajoute phase_fr si possible.
-    dayun = []
-    for m2 in re.finditer(
-        r'^(\d+)\s{2,}([甲乙丙丁戊己庚辛壬癸][子丑寅卯辰巳午未申酉戌亥])\s+(\S+)\s+(\S+)',
-        c, re.MULTILINE):
-        gz = m2.group(2)
-        det = _ganzhi_details(gz) or {}
-        phase_raw = m2.group(3)
-        nayin_raw = m2.group(4)
-        phase_fr = PHASE_FR.get(phase_raw) or SHISHEN_FR.get(phase_raw) or phase_raw
-        nayin_fr = NAYIN_FR.get(nayin_raw, nayin_raw)
-        dayun.append({
-            'age': int(m2.group(1)),
-            'ganzhi': gz,
-            'tronc': det.get('tronc',''),
-            'branche': det.get('branche',''),
-            'tronc_element': det.get('tronc_element',''),
-            'branche_element': det.get('branche_element',''),
-            'animal': det.get('animal',''),
-            'phase': phase_raw,
-            'phase_fr': phase_fr,
-            'nayin': nayin_raw,
-            'nayin_fr': nayin_fr,
-        })
-    if dayun:
-        # Certaines sorties peuvent contenir la table DaYun en double.
-        # On déduplique en gardant l’ordre (clé: (age, ganzhi)).
-        seen = set()
-        uniq = []
-        for d in dayun:
-            key = (d.get('age'), d.get('ganzhi'))
-            if key in seen:
-                continue
-            seen.add(key)
-            uniq.append(d)
-        result['dayun'] = uniq
+    # phase = phase de croissance (长生十二神) du maître du jour sur la branche
+    if 'dayun' in need:
+        me_dayun = i18n.DAYUN[lang][chart.gan_ids[2]]
+        result['dayun'] = [dict(me_dayun[jiazi_seqs[item.getGanZhi()]], age=item.getStartAge())
+                           for item in chart.yun.getDaYun()[1:]]
 
     # --- DATES ---
-    m = re.search(r'公历:\s*(\d+)年(\d+)月(\d+)日', c)
-    if m:
-        result['date_solaire'] = f"{m.group(1)}-{m.group(2).zfill(2)}-{m.group(3).zfill(2)}"
-    m = re.search(r'农历:\s*(\d+)年(\d+)月(\d+)日', c)
-    if m:
-        result['date_lunaire'] = f"{m.group(1)}-{m.group(2)}-{m.group(3)}"
+    solar, lunar = chart.solar, chart.lunar
+    if 'date_solaire' in need:
+        result['date_solaire'] = f"{solar.getYear()}-{solar.getMonth():02d}-{solar.getDay():02d}"
+    # lunar_python note le mois intercalaire (闰月) par un mois négatif
+    if 'date_lunaire' in need:
+        result['date_lunaire'] = f"{lunar.getYear()}-{abs(lunar.getMonth())}-{lunar.getDay()}"
+    if 'mois_intercalaire' in need:
+        result['mois_intercalaire'] = lunar.getMonth() < 0
 
     # --- PALAIS SPECIAUX ---
-    for pat, key in [('命宫:(\S+)','ming_gong'),
-                     ('胎元:(\S+)','tai_yuan'),
-                     ('身宫:(\S+)','shen_gong')]:
-        m = re.search(pat, c)
-        if m:
-            gz = m.group(1)
+    for key, get in [('ming_gong', chart.ba.getMingGong),
+                     ('tai_yuan', chart.ba.getTaiYuan),
+                     ('shen_gong', chart.ba.getShenGong)]:
+        if key in need:
+            gz = get()
             result[key] = gz
-            result[key + '_details'] = _ganzhi_details(gz)
+            result[key + '_details'] = i18n.details(gz, lang)
+
+    # --- TEXTES CLASSIQUES (identifiants, corps servis par /texts/<id>) ---
+    if 'textes' in need:
+        result['textes'] = texts.references(chart)
+
+    if 'resume_fr' in fields:
+        result['resume_fr'] = build_resume_fr(result, lang)
+        result = {key: value for key, value in result.items()
+                  if key in fields or key.endswith('_details') and key[:-len('_details')] in fields}
 
     return result
 
 
-def build_resume_fr(parsed: dict) -> str:
-    # Simple résumé lisible (utile si ton front affichait sortie_brute)
+def sortie_brute(chart):
+    """Sortie texte de bazi.py (sans les classiques), pour debug=1.
+
+    print_chart écrit dans son propre tampon : sys.stdout n'est pas touché,
+    les requêtes debug=1 concurrentes ne se mélangent pas.
+    """
+    out = io.StringIO()
+    print_chart(chart, classics=False, file=out)
+    return out.getvalue()
+
+
+def build_resume_fr(parsed: dict, lang=i18n.LANGUE_DEFAUT) -> str:
+    # Simple résumé lisible (utile si ton front affichait sortie_brute), dans la langue lang
+    labels = i18n.RESUME[lang]
     lines = []
-    if parsed.get('quatre_piliers'):
-        lines.append(f"4 Piliers: {parsed['quatre_piliers']}")
-    if parsed.get('date_solaire'):
-        lines.append(f"Date solaire: {parsed['date_solaire']}")
-    if parsed.get('date_lunaire'):
-        lines.append(f"Date lunaire: {parsed['date_lunaire']}")
+    for key in ('quatre_piliers', 'date_solaire', 'date_lunaire'):
+        if parsed.get(key):
+            lines.append(labels[key].format(parsed[key]))
     piliers = parsed.get('piliers') or {}
-    if piliers:
-        lab = {'annee':'Année','mois':'Mois','jour':'Jour','heure':'Heure'}
-        for k in ['annee','mois','jour','heure']:
-            p = piliers.get(k) or {}
-            if not p:
-                continue
-            sg = p.get('shishen_fr') or p.get('shishen') or ''
-            lines.append(f"{lab[k]}: {p.get('binome','')} ({p.get('tronc_pinyin','')} {p.get('branche_pinyin','')}) – {p.get('tronc_element','')}/{p.get('branche_element','')} – {p.get('animal','')} – {sg}".strip())
+    for k, name in enumerate(PILIER_NOMS):
+        p = piliers.get(name) or {}
+        if p.get('binome') in jiazi_seqs:
+            lines.append(i18n.LIGNES_PILIERS[lang][k][jiazi_seqs[p['binome']]][i18n.shishen_id(p.get('shishen'))])
     if parsed.get('wuxing'):
-        w = parsed['wuxing']
-        lines.append(f"5 éléments (scores): Métal {w.get('metal')}, Bois {w.get('bois')}, Eau {w.get('eau')}, Feu {w.get('feu')}, Terre {w.get('terre')}")
+        lines.append(labels['wuxing'].format(**parsed['wuxing']))
     if parsed.get('force') is not None:
-        lines.append(f"Force: {parsed.get('force')} (moyenne {parsed.get('moyenne')})")
-    for key, label in [('ming_gong','Ming Gong'),('tai_yuan','Tai Yuan'),('shen_gong','Shen Gong')]:
+        lines.append(labels['force'].format(parsed.get('force'), parsed.get('moyenne')))
+    for key, label in labels['palais'].items():
         if parsed.get(key):
             det = parsed.get(key + '_details') or {}
             lines.append(f"{label}: {parsed[key]} ({det.get('tronc_pinyin','')} {det.get('branche_pinyin','')})")
     if parsed.get('dayun'):
-        lines.append("DaYun (extrait):")
+        lines.append(labels['dayun'])
         for d in (parsed['dayun'][:8] if isinstance(parsed['dayun'], list) else []):
-            lines.append(f"  - {d.get('age')} ans: {d.get('ganzhi')} / {d.get('animal','')} / {d.get('nayin_fr','')}")
+            lines.append(labels['age'].format(d.get('age')) + i18n.LIGNES_DAYUN[lang][jiazi_seqs[d['ganzhi']]])
     return "\n".join(lines).strip()
 
 
+# ============================================================
+# CACHE (HTTP et disque)
+# ============================================================
+# Version du moteur : toute modification des modules de calcul ou des
+# traductions change l'ETag, un déploiement invalide donc les caches.
+# lunar_python (calendrier, piliers, grandes fortunes) n'est pas figé dans
+# requirements.txt : sa version compte aussi.
+ENGINE_FILES = ('bazi.py', 'rules.py', 'datas.py', 'ganzhi.py', 'common.py',
+                'sizi.py', 'yue.py', 'texts.py', 'i18n.py', 'app.py')
+ENGINE_PACKAGES = ('lunar_python',)
+
+def _engine_version():
+    h = hashlib.sha1()
+    for name in ENGINE_FILES:
+        with open(os.path.join(BASE_DIR, name), 'rb') as f:
+            h.update(f.read())
+    for package in ENGINE_PACKAGES:
+        try:
+            h.update('{}=={}'.format(package, importlib.metadata.version(package)).encode())
+        except importlib.metadata.PackageNotFoundError:
+            h.update(package.encode())
+    return h.hexdigest()[:12]
+
+ENGINE_VERSION = os.environ.get('BAZI_ENGINE_VERSION') or _engine_version()
+
+# Un résultat ne change qu'avec la version du moteur, qui fait partie de l'ETag
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+def bazi_etag(params):
+    """ETag d'une réponse /bazi, calculé à partir des paramètres normalisés sans calculer le thème."""
+    key = '{}:{}'.format(ENGINE_VERSION, ':'.join(str(item) for item in params))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+# Deuxième niveau partagé entre les workers, clé = ETag (voir cache.py)
+RESULT_CACHE = cache.from_env()
+
+# Les requêtes identiques simultanées attendent un seul calcul (clé = ETag)
+SINGLE_FLIGHT = cache.SingleFlight(timeout=_safe_int(os.environ.get('BAZI_SINGLE_FLIGHT_TIMEOUT'), 30, 1))
+
+
+def _with_cache_headers(response, etag):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+def _fields_param(value):
+    # fields= : liste JSON ou chaîne "a,b,c" ; None = tous les champs
+    if value is None or value == '':
+        return None
+    names = value.split(',') if isinstance(value, str) else value
+    names = {str(name).strip() for name in names} - {''}
+    unknown = names - set(CHAMPS)
+    if unknown:
+        raise ValueError('champs inconnus : {} (disponibles : {})'.format(
+            ', '.join(sorted(unknown)), ', '.join(CHAMPS)))
+    return tuple(sorted(names)) if names else None
+
+
+def bazi_corps(raw):
+    """Corps d'un POST /bazi : un dict ({} si vide ou null), quel que soit le Content-Type.
+
+    ValueError si ce n'est pas du JSON ou pas un objet ; même réponse 400 sous WSGI et ASGI.
+    """
+    try:
+        data = json.loads(raw) if raw else {}
+    except ValueError as e:
+        raise ValueError(f'JSON invalide : {e}')
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError('objet JSON attendu')
+    return data
+
+
+def bazi_params(data):
+    """Paramètres normalisés de /bazi : (year, month, day, hour, gender 'M'/'F', debug, fields, lang).
+
+    fields est un tuple trié de noms de CHAMPS, ou None pour tous ; lang une langue de i18n.LANGUES.
+    ValueError si un champ ou la langue est inconnu, ou si la date n'existe pas.
+    """
+    year = _safe_int(data.get('year', 1990), 1990, 1800, 2200)
+    month = _safe_int(data.get('month', 5), 5, 1, 12)
+    day = _safe_int(data.get('day', 15), 15, 1, 31)
+    # lunar_python décalerait silencieusement le 30 février au 1er mars
+    if day > calendar.monthrange(year, month)[1]:
+        raise ValueError(f'day invalide : {year}-{month:02d}-{day:02d} n\'existe pas')
+    hour = _safe_int(data.get('hour', 8), 8, 0, 23)
+    gender = 'F' if str(data.get('gender', 'M')).upper().strip() == 'F' else 'M'
+
+    debug = str(data.get('debug', '0')).strip() == '1'
+    fields = _fields_param(data.get('fields'))
+    lang = i18n.langue(data.get('lang'))
+    return year, month, day, hour, gender, debug, fields, lang
+
+
+def compute_bazi(data, timings=None, caches=None):
+    """Calcule la réponse de /bazi pour un dictionnaire {year, month, day, hour, gender, debug, fields, lang}.
+
+    timings et caches, s'ils sont donnés, reçoivent la durée de chaque étape (secondes)
+    et le résultat de chaque cache ('hit', 'miss' ou 'off'), voir profile_bazi.
+    """
+    params = bazi_params(data)
+    key = bazi_etag(params)
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    parsed = RESULT_CACHE.get(key)
+    timings['cache_lookup'] = time.perf_counter() - start
+    if caches is not None:
+        caches['resultats'] = 'off' if isinstance(RESULT_CACHE, cache.NullCache) else \
+            'miss' if parsed is None else 'hit'
+    if parsed is None:
+        year, month, day, hour, gender, debug, fields, lang = params
+
+        # Avec debug=1 on calcule tout pour la sortie brute ; sinon seulement ce que demandent les champs
+        chart = compute_chart(year, month, day, hour, solar=True, female=(gender == 'F'),
+                              sections=None if debug else api_sections(fields), timings=timings, caches=caches)
+
+        start = time.perf_counter()
+        parsed = build_bazi_result(chart, fields, lang)
+        parsed['success'] = True
+        timings['build'] = time.perf_counter() - start
+
+        # IMPORTANT: on n’envoie plus la sortie brute (chinois) par défaut
+        if debug:
+            start = time.perf_counter()
+            parsed['sortie_brute'] = sortie_brute(chart)
+            timings['raw_output'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        RESULT_CACHE.set(key, parsed)
+        timings['cache_store'] = time.perf_counter() - start
+
+    for stage, seconds in timings.items():
+        LATENCE_ETAPE.observe(seconds, stage)
+    return parsed
+
+
+def profile_bazi(data):
+    """Réponse de /bazi avec profile=1 : le champ profil donne la durée de chaque étape en ms
+    (params, cache_lookup, lunar, analyse et analyse.*, yun, build, raw_output, cache_store,
+    serialize) et le résultat de chaque cache.
+
+    Calculée pour cette requête, sans single-flight ; ValueError si les paramètres sont invalides.
+    """
+    timings, caches = {}, {'single_flight': 'off'}
+    begin = time.perf_counter()
+    bazi_params(data)
+    timings['params'] = time.perf_counter() - begin
+    result = dict(compute_bazi(data, timings, caches))
+    start = time.perf_counter()
+    app.json.dumps(result)
+    timings['serialize'] = time.perf_counter() - start
+    result['profil'] = {
+        'etapes_ms': {stage: round(seconds * 1000, 3) for stage, seconds in timings.items()},
+        'total_ms': round((time.perf_counter() - begin) * 1000, 3),
+        'caches': caches,
+        'pid': os.getpid(),
+    }
+    return result
+
+
 # ============================================================
 # ROUTES
 # ============================================================
+ACCUEIL = {
+    'message': '🏮 API BaZi active',
+    'usage': 'GET/POST /bazi avec {year, month, day, hour, gender}. Options: debug=1, fields=champ1,champ2, '
+             'lang=fr|en|zh, profile=1 (durée des étapes). '
+             'POST /bazi/batch avec un tableau JSON ou du NDJSON de ces objets, réponse en NDJSON. '
+             'GET/POST /bazi/timeline avec les mêmes paramètres et from_year, to_year, limit, cursor, '
+             'liuyue=1, stream=1 : grandes fortunes et années. '
+             'GET /texts/<id> : texte classique dont l’identifiant figure dans le champ textes. '
+             'POST /jobs avec un fichier JSON ou NDJSON (très grands lots), état GET /jobs/<id>, '
+             'résultats GET /jobs/<id>/results?format=ndjson|csv'
+}
+
 @app.route('/')
 def index():
+    return jsonify(ACCUEIL)
+
+@app.route('/health')
+def sante():
+    return jsonify({'status': 'ok'})
+
+def _erreur_interne(e):
+    # À appeler dans un bloc except : la trace est celle de l'exception en cours
     return jsonify({
-        'message': '🏮 API BaZi active',
-        'usage': 'GET/POST /bazi avec {year, month, day, hour, gender}. Options: debug=1'
-    })
+        'success': False,
+        'error': str(e),
+        'trace': traceback.format_exc()
+    }), 500
 
 @app.route('/bazi', methods=['GET','POST'])
 def calculate_bazi():
     try:
-        data = request.get_json() if request.method == 'POST' else request.args
-        data = data or {}
-
-        year = _safe_int(data.get('year', 1990), 1990, 1800, 2200)
-        month = _safe_int(data.get('month', 5), 5, 1, 12)
-        day = _safe_int(data.get('day', 15), 15, 1, 31)
-        hour = _safe_int(data.get('hour', 8), 8, 0, 23)
-        gender = str(data.get('gender', 'M')).upper().strip()
-
-        debug = str(data.get('debug', '0')).strip() == '1'
-
-        cmd = [
-            sys.executable,
-            os.path.join(BASE_DIR, 'bazi.py'),
-            str(year), str(month), str(day), str(hour),
-            '-g',
-            '--no-classics'
-        ]
-        if gender == 'F':
-            cmd.append('-n')
-
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=30, cwd=BASE_DIR)
-
-        if proc.returncode != 0:
-            return jsonify({
-                'success': False,
-                'error': 'Erreur d’exécution bazi.py',
-                'stderr': proc.stderr
-            }), 500
-
-        output = proc.stdout or ""
-        if not output.strip():
-            return jsonify({
-                'success': False,
-                'error': 'Pas de sortie du calcul',
-                'stderr': proc.stderr
-            }), 500
-
-        parsed = parse_bazi_output(output)
-        parsed['success'] = True
-        parsed['resume_fr'] = build_resume_fr(parsed)
+        try:
+            data = bazi_corps(request.get_data()) if request.method == 'POST' else request.args
+            etag = bazi_etag(bazi_params(data))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        # profile=1 : réponse propre à la requête, jamais mise en cache
+        if str(data.get('profile', '0')).strip() == '1':
+            return jsonify(profile_bazi(data))
+        # Seul GET est mis en cache : If-None-Match est résolu avant tout calcul
+        if request.method == 'GET' and request.if_none_match.contains(etag):
+            return _with_cache_headers(app.response_class(status=304), etag)
+
+        response = jsonify(SINGLE_FLIGHT.do(etag, lambda: compute_bazi(data)))
+        if request.method == 'GET':
+            return _with_cache_headers(response, etag)
+        return response
+
+    except TimeoutError as e:
+        return jsonify({'success': False, 'error': str(e)}), 504
+
+    except Exception as e:
+        return _erreur_interne(e)
+
+
+@app.route('/texts/<text_id>')
+def texte(text_id):
+    corps = texts.TEXTES.get(text_id)
+    if corps is None:
+        return jsonify({'success': False, 'error': 'texte inconnu'}), 404
+    # Le contenu ne dépend que de l'identifiant, qui sert d'ETag
+    if request.if_none_match.contains(text_id):
+        return _with_cache_headers(app.response_class(status=304), text_id)
+    body, body_gzip = corps
+    if 'gzip' in request.accept_encodings:
+        response = Response(body_gzip, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    return _with_cache_headers(response, text_id)
+
+
+@app.route('/metrics')
+def metriques():
+    return Response(METRIQUES.render(), mimetype='text/plain; version=0.0.4')
+
+
+# ============================================================
+# LOT (POST /bazi/batch)
+# ============================================================
+# Nombre maximal d'éléments par requête et de processus de calcul par worker
+BATCH_MAX = _safe_int(os.environ.get('BAZI_BATCH_MAX'), 10000, 1)
+BATCH_PROCESSUS = _safe_int(os.environ.get('BAZI_BATCH_WORKERS'), os.cpu_count() or 1, 1)
+
+_batch_pool = None
+_batch_pool_pid = None
+_batch_pool_lock = threading.Lock()
+
+def process_context():
+    """Contexte multiprocessing des pools de calcul : processus issus d'un serveur de fork.
+
+    Forker directement un worker qui a plusieurs threads (asgi, gthread) peut copier un
+    verrou tenu par un autre thread, par exemple celui de lunar_python.LunarYear, et
+    bloquer le processus enfant. Le serveur de fork charge app une fois, sans threads.
+    """
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(['app'])
+    return context
+
+def _get_batch_pool():
+    # Créé à la demande dans chaque worker : un pool hérité du maître (preload) serait inutilisable
+    global _batch_pool, _batch_pool_pid
+    with _batch_pool_lock:
+        if _batch_pool is None or _batch_pool_pid != os.getpid():
+            _batch_pool = ProcessPoolExecutor(max_workers=BATCH_PROCESSUS, mp_context=process_context())
+            _batch_pool_pid = os.getpid()
+        return _batch_pool
+
+def _drop_batch_pool(pool):
+    # Pool cassé (un processus enfant est mort) : le prochain _get_batch_pool en crée un autre
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is pool:
+            _batch_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _ndjson_items(lines):
+    # Un dict ou une erreur (ValueError) par ligne non vide
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f'JSON invalide : {e}')
+            continue
+        yield item if isinstance(item, dict) else ValueError('objet attendu')
+
+
+def _batch_items(raw: str):
+    """Lit un tableau JSON ou du NDJSON ; renvoie une liste de dict ou d'erreurs (ValueError)."""
+    raw = raw.strip()
+    if raw.startswith('['):
+        return [item if isinstance(item, dict) else ValueError('objet attendu') for item in json.loads(raw)]
+    return list(_ndjson_items(raw.splitlines()))
+
+
+def _batch_item(index, data):
+    # Exécuté dans le pool : les erreurs sont renvoyées dans la ligne de l'élément
+    if isinstance(data, ValueError):
+        return {'index': index, 'success': False, 'error': str(data)}
+    try:
+        result = dict(compute_bazi(data))
+    except Exception as e:
+        return {'index': index, 'success': False, 'error': str(e)}
+    result['index'] = index
+    return result
+
+
+def _batch_result(future, index, pool):
+    # Ligne d'un élément ; si le pool est cassé, l'élément échoue seul et le pool est remplacé
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        _drop_batch_pool(pool)
+        return {'index': index, 'success': False, 'error': 'processus de calcul interrompu'}
+
+
+def _batch_stream(items):
+    # Au plus 2 éléments en cours par processus ; chaque ligne part dès qu'elle est prête
+    pool = _get_batch_pool()
+    pending = {} # future -> (index, pool)
+    for index, data in enumerate(items):
+        try:
+            future = pool.submit(_batch_item, index, data)
+        except BrokenProcessPool:
+            _drop_batch_pool(pool)
+            pool = _get_batch_pool()
+            future = pool.submit(_batch_item, index, data)
+        pending[future] = (index, pool)
+        if len(pending) >= 2 * BATCH_PROCESSUS:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield json.dumps(_batch_result(future, *pending.pop(future))) + '\n'
+    for future in as_completed(pending):
+        yield json.dumps(_batch_result(future, *pending[future])) + '\n'
+
+
+@app.route('/bazi/batch', methods=['POST'])
+def calculate_bazi_batch():
+    try:
+        items = _batch_items(request.get_data(as_text=True))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'JSON invalide : {e}'}), 400
+    if len(items) > BATCH_MAX:
+        return jsonify({'success': False, 'error': f'au plus {BATCH_MAX} éléments par lot'}), 413
+
+    # Les lignes arrivent dans l'ordre de fin de calcul, "index" donne la position dans le lot
+    return Response(_batch_stream(items), mimetype='application/x-ndjson')
 
-        # IMPORTANT: on n’envoie plus la sortie brute (chinois) par défaut
-        if debug:
-            parsed['sortie_brute'] = output
 
-        return jsonify(parsed)
+# ============================================================
+# TRAVAUX (POST /jobs, voir jobs.py)
+# ============================================================
+# Exécutés par le pool de /bazi/batch, éléments et lignes de résultat identiques
+TRAVAUX = jobs.from_env(_get_batch_pool, _batch_item, _drop_batch_pool)
+
+def _job_items(stream):
+    """Éléments d'un fichier binaire : tableau JSON (lu en entier) ou NDJSON (lu ligne à ligne)."""
+    lines = io.TextIOWrapper(stream, encoding='utf-8')
+    first = ''
+    for first in lines:
+        if first.strip():
+            break
+    if first.lstrip().startswith('['):
+        raw = first + lines.read()
+        return [item if isinstance(item, dict) else ValueError('objet attendu') for item in json.loads(raw)]
+    return _ndjson_items(itertools.chain([first], lines))
+
+
+def _job_etat(etat):
+    etat = dict(etat)
+    etat['resultats'] = {fmt: f"/jobs/{etat['id']}/results?format={fmt}" for fmt in ('ndjson', 'csv')}
+    return etat
+
+
+@app.route('/jobs', methods=['POST'])
+def soumettre_travail():
+    # Fichier envoyé en multipart (champ "file") ou corps brut
+    upload = request.files.get('file')
+    try:
+        etat = TRAVAUX.create(_job_items(upload.stream if upload is not None else request.stream))
+    except jobs.Depassement as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except jobs.TravailVide as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'JSON invalide : {e}'}), 400
+    response = jsonify(_job_etat(etat))
+    response.status_code = 202
+    response.headers['Location'] = f"/jobs/{etat['id']}"
+    return response
+
+
+@app.route('/jobs/<job_id>')
+def etat_travail(job_id):
+    TRAVAUX.start()
+    etat = TRAVAUX.status(job_id)
+    if etat is None:
+        return jsonify({'success': False, 'error': 'travail inconnu'}), 404
+    return jsonify(_job_etat(etat))
+
+
+@app.route('/jobs/<job_id>/results')
+def resultats_travail(job_id):
+    # Lignes déjà calculées, dans l'ordre de l'entrée ; complet quand statut vaut "termine"
+    etat = TRAVAUX.status(job_id)
+    if etat is None:
+        return jsonify({'success': False, 'error': 'travail inconnu'}), 404
+    fmt = request.args.get('format', 'ndjson')
+    if fmt == 'csv':
+        response = Response(TRAVAUX.csv(etat), mimetype='text/csv')
+    elif fmt == 'ndjson':
+        response = Response(TRAVAUX.ndjson(etat), mimetype='application/x-ndjson')
+    else:
+        return jsonify({'success': False, 'error': 'format : ndjson ou csv'}), 400
+    response.headers['Content-Disposition'] = f'attachment; filename="{job_id}.{fmt}"'
+    response.headers['X-Job-Status'] = etat['statut']
+    return response
 
+
+# ============================================================
+# FRISE (GET/POST /bazi/timeline)
+# ============================================================
+# Années par page : par défaut et au plus
+FRISE_PAGE = _safe_int(os.environ.get('BAZI_TIMELINE_PAGE'), 20, 1)
+FRISE_PAGE_MAX = 200
+
+def _frise_ganzhi(chart, gz, lang):
+    # Champs communs aux grandes fortunes, années et mois, vus du maître du jour
+    seq = jiazi_seqs[gz]
+    return dict(i18n.FRISE[lang][chart.gan_ids[2]][seq],
+                vide=bool(empty_masks[chart.jiazi_ids[2]] >> seq % 12 & 1))
+
+
+def _frise_dayun(chart, dayun, lang):
+    gz = dayun.getGanZhi()
+    row = {'type': 'dayun', 'index': dayun.getIndex(), 'age': dayun.getStartAge(),
+           'annee_debut': dayun.getStartYear(), 'annee_fin': dayun.getEndYear()}
+    if not gz:
+        # Avant le début des grandes fortunes (起运前)
+        row['ganzhi'] = None
+        return row
+    row.update(_frise_ganzhi(chart, gz, lang))
+    row['relations'] = zhi_att_labels(zhi_seqs[gz[1]], chart.zhi_ids)
+    row['shensha'] = shen_list(chart.gans, chart.zhis, gz[0], gz[1])
+    return row
+
+
+def _frise_liunian(chart, dayun, liunian, liuyue=False, lang=i18n.LANGUE_DEFAUT):
+    gz, dayun_gz = liunian.getGanZhi(), dayun.getGanZhi()
+    row = {'type': 'liunian', 'annee': liunian.getYear(), 'age': liunian.getAge(), 'dayun': dayun_gz or None}
+    row.update(_frise_ganzhi(chart, gz, lang))
+    # Relations avec les branches du thème et de la grande fortune, sans 破 comme la sortie texte
+    zhi_ids = chart.zhi_ids + ((zhi_seqs[dayun_gz[1]],) if dayun_gz else ())
+    row['relations'] = zhi_att_labels(zhi_seqs[gz[1]], zhi_ids, skip=zhi_att_bits['破'])
+    row['shensha'] = shen_list(chart.gans, chart.zhis, gz[0], gz[1])
+    if liuyue:
+        row['liuyue'] = [dict(_frise_ganzhi(chart, month.getGanZhi(), lang), mois=month.getMonthInChinese())
+                         for month in liunian.getLiuYue()]
+    return row
+
+
+def frise_params(data):
+    """Fenêtre de /bazi/timeline : (from_year, to_year, limit, cursor, liuyue, stream).
+
+    from_year et to_year valent None si absents ; cursor est l'année de reprise ;
+    ValueError si une valeur est invalide.
+    """
+    window = []
+    for name in ('from_year', 'to_year'):
+        value = data.get(name)
+        if value in (None, ''):
+            window.append(None)
+            continue
+        year = _safe_int(value, None, 1800, 2400)
+        if year is None:
+            raise ValueError(f'{name} invalide : {value}')
+        window.append(year)
+    from_year, to_year = window
+
+    limit = _safe_int(data.get('limit', FRISE_PAGE), FRISE_PAGE, 1, FRISE_PAGE_MAX)
+    cursor = data.get('cursor')
+    if cursor not in (None, ''):
+        # Le curseur est opaque pour le client : c'est l'année de la première ligne de la page
+        cursor = _safe_int(cursor, None, 1800, 2400)
+        if cursor is None:
+            raise ValueError('cursor invalide')
+    else:
+        cursor = None
+    liuyue = str(data.get('liuyue', '0')).strip() == '1'
+    stream = str(data.get('stream', '0')).strip() == '1'
+    return from_year, to_year, limit, cursor, liuyue, stream
+
+
+def _frise_lignes(chart, rows, liuyue, lang):
+    # Une ligne de grande fortune avant la première année de chacune
+    index = None
+    for dayun, liunian in rows:
+        if dayun.getIndex() != index:
+            index = dayun.getIndex()
+            yield _frise_dayun(chart, dayun, lang)
+        yield _frise_liunian(chart, dayun, liunian, liuyue, lang)
+
+
+def _frise_flux(chart, rows, liuyue, lang):
+    # Le statut 200 est déjà parti : une erreur en cours de flux devient la dernière ligne
+    try:
+        for line in _frise_lignes(chart, rows, liuyue, lang):
+            yield json.dumps(line) + '\n'
     except Exception as e:
-        import traceback
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'trace': traceback.format_exc()
-        }), 500
+        yield json.dumps({'success': False, 'error': str(e)}) + '\n'
+
+
+@app.route('/bazi/timeline', methods=['GET', 'POST'])
+def calculate_timeline():
+    data = (request.get_json(silent=True) if request.method == 'POST' else request.args) or {}
+    try:
+        year, month, day, hour, gender, _, _, lang = bazi_params(data)
+        from_year, to_year, limit, cursor, liuyue, stream = frise_params(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    etag = bazi_etag(('timeline', year, month, day, hour, gender,
+                      from_year, to_year, limit, cursor, liuyue, stream, lang))
+    if request.method == 'GET' and request.if_none_match.contains(etag):
+        return _with_cache_headers(app.response_class(status=304), etag)
+
+    try:
+        # Seules les grandes fortunes sont calculées, puis les années de la fenêtre demandée
+        chart = compute_chart(year, month, day, hour, solar=True, female=(gender == 'F'), sections=['dayun'])
+        start = from_year if cursor is None else max(cursor, from_year or cursor)
+        rows = timeline(chart, start, to_year)
+
+        if stream:
+            # Toute la fenêtre en NDJSON, une ligne par grande fortune et par année
+            response = Response(_frise_flux(chart, rows, liuyue, lang), mimetype='application/x-ndjson')
+        else:
+            page = list(itertools.islice(rows, limit + 1))
+            suivant = str(page.pop()[1].getYear()) if len(page) > limit else None
+            result = {'success': True, 'dayun': [], 'liunian': [], 'curseur_suivant': suivant}
+            for line in _frise_lignes(chart, page, liuyue, lang):
+                result[line['type']].append(line)
+            response = jsonify(result)
+    except Exception as e:
+        return _erreur_interne(e)
+    if request.method == 'GET':
+        return _with_cache_headers(response, etag)
+    return response
+
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,271 @@
+# Point d'entrée ASGI, à côté de l'application Flask : uvicorn asgi:app
+#
+# /, /health et /metrics répondent directement dans la boucle asyncio et
+# restent réactifs sous charge. Les calculs de /bazi passent par un exécuteur
+# borné (threads ou processus) : au plus BAZI_ASYNC_CONCURRENCY calculs en
+# cours, BAZI_ASYNC_QUEUE requêtes en attente (au-delà : 503), et chaque
+# requête a une échéance de BAZI_DEADLINE secondes. Une requête dont
+# l'échéance passe en file d'attente n'est jamais calculée (504). Les autres
+# routes (/bazi/batch, /jobs, OPTIONS...) sont servies par l'application Flask
+# dans un thread, et leur réponse est transmise au fur et à mesure (NDJSON de
+# /bazi/batch, stream=1 de /bazi/timeline). Le corps des requêtes est gardé en
+# mémoire jusqu'à 1 Mo puis dans un fichier temporaire, au plus
+# BAZI_ASYNC_MAX_BODY octets (413 au-delà).
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import traceback
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from urllib.parse import parse_qsl
+
+import app as web
+
+EXECUTEUR = os.environ.get('BAZI_ASYNC_EXECUTOR', 'thread') # thread ou process
+CONCURRENCE = web._safe_int(os.environ.get('BAZI_ASYNC_CONCURRENCY'), os.cpu_count() or 1, 1)
+FILE_MAX = web._safe_int(os.environ.get('BAZI_ASYNC_QUEUE'), 100, 0)
+try:
+    ECHEANCE = float(os.environ.get('BAZI_DEADLINE', 10))
+except ValueError:
+    ECHEANCE = 10.0
+# Taille des corps : au plus, en mémoire avant le fichier temporaire, et pour /bazi
+CORPS_MAX = web._safe_int(os.environ.get('BAZI_ASYNC_MAX_BODY'), 512 * 1024 * 1024, 0)
+CORPS_MEMOIRE = 1024 * 1024
+CORPS_BAZI_MAX = 64 * 1024
+
+CORS = [(b'access-control-allow-origin', b'*'),
+        (b'access-control-allow-headers', b'Content-Type'),
+        (b'access-control-allow-methods', b'GET, POST, OPTIONS')]
+
+_executor = None
+_semaphore = asyncio.Semaphore(CONCURRENCE)
+_en_attente = 0 # requêtes en file
+_en_cours = 0 # calculs lancés et pas encore terminés
+
+
+class Surcharge(Exception):
+    """File d'attente pleine."""
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        if EXECUTEUR == 'process':
+            _executor = ProcessPoolExecutor(max_workers=CONCURRENCE, mp_context=web.process_context())
+        else:
+            _executor = ThreadPoolExecutor(max_workers=CONCURRENCE)
+    return _executor
+
+
+async def run_bounded(deadline, fn, *args):
+    """Exécute fn(*args) dans l'exécuteur avant l'échéance deadline (horloge de la boucle).
+
+    Surcharge si la file est pleine ; TimeoutError si l'échéance passe, en file
+    (le calcul n'est alors pas lancé) ou pendant le calcul (le résultat est ignoré).
+    """
+    global _en_attente, _en_cours
+    loop = asyncio.get_running_loop()
+    if _en_attente + _en_cours >= CONCURRENCE + FILE_MAX:
+        raise Surcharge()
+    _en_attente += 1
+    try:
+        await asyncio.wait_for(_semaphore.acquire(), deadline - loop.time())
+    finally:
+        _en_attente -= 1
+
+    # La place n'est rendue qu'à la fin réelle du calcul, même si la requête a expiré
+    _en_cours += 1
+    future = _get_executor().submit(fn, *args)
+    future.add_done_callback(lambda _: loop.call_soon_threadsafe(_liberer))
+    return await asyncio.wait_for(asyncio.wrap_future(future), max(0, deadline - loop.time()))
+
+
+def _liberer():
+    global _en_cours
+    _en_cours -= 1
+    _semaphore.release()
+
+
+def _calcul(etag, data):
+    # Exécuté dans l'exécuteur
+    return web.SINGLE_FLIGHT.do(etag, lambda: web.compute_bazi(data))
+
+
+def _json(status, obj, headers=()):
+    # Même encodage que jsonify (clés triées, ASCII, compact)
+    body = json.dumps(obj, sort_keys=True, separators=(',', ':')).encode() + b'\n'
+    return status, [(b'content-type', b'application/json')] + list(headers), body
+
+
+def _etag_match(header, etag):
+    if not header:
+        return False
+    tags = [item.strip() for item in header.split(',')]
+    return '*' in tags or '"{}"'.format(etag) in tags or 'W/"{}"'.format(etag) in tags
+
+
+async def _bazi(method, query, headers, body):
+    try:
+        if method == 'POST':
+            data = web.bazi_corps(body)
+        else:
+            data = {}
+            for key, value in parse_qsl(query):
+                data.setdefault(key, value)
+        etag = web.bazi_etag(web.bazi_params(data))
+    except ValueError as e:
+        return _json(400, {'success': False, 'error': str(e)})
+    profile = str(data.get('profile', '0')).strip() == '1'
+    cache_headers = [(b'etag', '"{}"'.format(etag).encode()), (b'cache-control', web.CACHE_CONTROL.encode())]
+    if method == 'GET' and not profile and _etag_match(headers.get('if-none-match'), etag):
+        return 304, cache_headers, b''
+
+    deadline = asyncio.get_running_loop().time() + ECHEANCE
+    try:
+        if profile:
+            # Mesurée pour cette requête : hors single-flight et sans en-têtes de cache
+            result = await run_bounded(deadline, web.profile_bazi, data)
+            cache_headers = []
+        else:
+            result = await run_bounded(deadline, _calcul, etag, data)
+    except Surcharge:
+        return _json(503, {'success': False, 'error': 'serveur saturé, réessayer plus tard'},
+                     [(b'retry-after', b'1')])
+    except TimeoutError:
+        return _json(504, {'success': False, 'error': 'échéance de {} s dépassée'.format(ECHEANCE)})
+    except Exception as e:
+        return _json(500, {'success': False, 'error': str(e), 'trace': traceback.format_exc()})
+    return _json(200, result, cache_headers if method == 'GET' else ())
+
+
+async def _corps(receive, limit):
+    """Lit le corps de la requête dans un fichier temporaire ; None s'il dépasse limit octets."""
+    corps = tempfile.SpooledTemporaryFile(max_size=CORPS_MEMOIRE)
+    taille = 0
+    while True:
+        message = await receive()
+        chunk = message.get('body', b'')
+        taille += len(chunk)
+        if taille > limit:
+            corps.close()
+            return None
+        corps.write(chunk)
+        if not message.get('more_body'):
+            break
+    corps.seek(0)
+    return corps
+
+
+def _environ(scope, headers, corps):
+    taille = corps.seek(0, os.SEEK_END)
+    corps.seek(0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': '',
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': (scope.get('server') or ('localhost', 80))[0],
+        'SERVER_PORT': str((scope.get('server') or ('localhost', 80))[1]),
+        'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': corps,
+        'wsgi.input_terminated': True,
+        'CONTENT_LENGTH': str(taille),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in headers.items():
+        # Le corps est déjà lu en entier : CONTENT_LENGTH vient de sa taille
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        elif name not in ('content-length', 'transfer-encoding'):
+            environ['HTTP_' + name.upper().replace('-', '_')] = value
+    return environ
+
+
+async def _wsgi(scope, headers, corps, send):
+    """Sert la requête avec l'application Flask ; chaque morceau de la réponse part dès qu'il est produit."""
+    loop = asyncio.get_running_loop()
+    reponse = []
+    def start_response(status, response_headers, exc_info=None):
+        reponse[:] = [int(status.split()[0]), [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                                               for k, v in response_headers]]
+
+    # L'application et chaque next() tournent dans un thread : un générateur lent ne bloque pas la boucle
+    chunks = await loop.run_in_executor(None, web.app, _environ(scope, headers, corps), start_response)
+    try:
+        iterator = iter(chunks)
+        await send({'type': 'http.response.start', 'status': reponse[0], 'headers': reponse[1]})
+        while True:
+            chunk = await loop.run_in_executor(None, next, iterator, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        if hasattr(chunks, 'close'):
+            await loop.run_in_executor(None, chunks.close)
+        corps.close()
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Reprise des travaux de POST /jobs laissés en cours (voir jobs.py)
+            web.TRAVAUX.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await _lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    start = time.perf_counter()
+    method, path = scope['method'], scope['path']
+    headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope['headers']}
+    bazi = method in ('GET', 'POST') and path == '/bazi'
+    corps = await _corps(receive, CORPS_BAZI_MAX if bazi else CORPS_MAX)
+    if corps is None:
+        status, response_headers, content = _json(413, {'success': False, 'error': 'corps de requête trop grand'})
+        await send({'type': 'http.response.start', 'status': status, 'headers': response_headers + CORS})
+        await send({'type': 'http.response.body', 'body': content})
+        return
+
+    if not (method == 'GET' and path in ('/', '/health', '/metrics')) and not bazi:
+        # Flask applique lui-même CORS et ses métriques
+        return await _wsgi(scope, headers, corps, send)
+
+    with corps:
+        body = corps.read()
+    if method == 'GET' and path == '/':
+        endpoint, (status, response_headers, content) = 'index', _json(200, web.ACCUEIL)
+    elif method == 'GET' and path == '/health':
+        endpoint, (status, response_headers, content) = 'sante', _json(200, {'status': 'ok'})
+    elif method == 'GET' and path == '/metrics':
+        endpoint, status, content = 'metriques', 200, web.METRIQUES.render().encode()
+        response_headers = [(b'content-type', b'text/plain; version=0.0.4; charset=utf-8')]
+    else:
+        endpoint = 'calculate_bazi'
+        status, response_headers, content = await _bazi(method, scope['query_string'].decode('latin-1'),
+                                                        headers, body)
+
+    response_headers = response_headers + CORS
+    web.REQUETES.inc(endpoint, status)
+    web.LATENCE_REQUETE.observe(time.perf_counter() - start, endpoint)
+    await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+    await send({'type': 'http.response.body', 'body': content})
@@ -0,0 +1,169 @@
+# Cache de résultats partagé par les processus d'une même machine
+#
+# Deuxième niveau, après le cache en mémoire de bazi.analyse_pillars : les
+# réponses sérialisées sont rangées dans une base SQLite en mode WAL, que tous
+# les workers gunicorn (et les processus du pool de /bazi/batch) lisent sans
+# se bloquer. Le cache survit au recyclage des workers et aux redémarrages ;
+# les clés contiennent la version du moteur. Il n'est actif que si BAZI_CACHE
+# donne un chemin : un emplacement par défaut dans le répertoire temporaire
+# partagé pourrait être créé d'avance par un autre utilisateur de la machine.
+#
+# SingleFlight regroupe dans un processus les calculs identiques simultanés.
+import os
+import json
+import zlib
+import sqlite3
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class NullCache:
+    """Cache désactivé."""
+    hits = misses = 0
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+
+class SQLiteCache:
+    """Cache clé -> objet JSON dans un fichier SQLite, borné à max_entries.
+
+    Une connexion par processus et par thread. L'éviction supprime les entrées
+    les plus anciennes (ordre d'insertion), toutes les evict_every écritures.
+    Une erreur SQLite n'est jamais remontée : lecture manquée, écriture ignorée.
+    """
+
+    def __init__(self, path, max_entries=100000, evict_every=256):
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self._local = threading.local()
+        # Compteurs du processus, lus par /metrics ; incrémentés par les threads gthread
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _conn(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            # Après un fork on ne réutilise pas la connexion du parent
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS resultats (cle TEXT PRIMARY KEY, valeur BLOB NOT NULL)')
+            local.conn, local.pid, local.writes = conn, os.getpid(), 0
+        return local.conn
+
+    def get(self, key):
+        try:
+            row = self._conn().execute('SELECT valeur FROM resultats WHERE cle = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            log.warning('cache %s : lecture impossible (%s)', self.path, e)
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, key, value):
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode(), 1)
+        try:
+            conn = self._conn()
+            conn.execute('INSERT OR REPLACE INTO resultats (cle, valeur) VALUES (?, ?)', (key, blob))
+            self._local.writes += 1
+            if self._local.writes % self.evict_every == 0:
+                # INSERT OR REPLACE attribue un nouveau rowid : les petits rowid sont les plus anciens
+                conn.execute('DELETE FROM resultats WHERE rowid <= (SELECT max(rowid) FROM resultats) - ?',
+                             (self.max_entries,))
+        except sqlite3.Error as e:
+            log.warning('cache %s : écriture impossible (%s)', self.path, e)
+
+
+def from_env():
+    """Cache configuré par BAZI_CACHE (chemin du fichier SQLite) et BAZI_CACHE_MAX.
+
+    Désactivé si BAZI_CACHE est absent, vide ou "off".
+    """
+    path = os.environ.get('BAZI_CACHE', '')
+    if path.lower() in ('', '0', 'off', 'none'):
+        return NullCache()
+    try:
+        max_entries = int(os.environ.get('BAZI_CACHE_MAX', 100000))
+    except ValueError:
+        max_entries = 100000
+    return SQLiteCache(path, max_entries=max_entries)
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Regroupe les appels concurrents de même clé sur un seul calcul (par processus).
+
+    Le premier appelant calcule ; les suivants attendent au plus timeout secondes
+    son résultat, ou reçoivent son exception. Le résultat est partagé, les
+    appelants ne doivent pas le modifier.
+    """
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        # Compteurs : calculs lancés, appels regroupés, attentes expirées, calculs en erreur
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self.errors += 1
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+            return call.result
+
+        if not call.event.wait(self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError('calcul identique toujours en cours après {} s'.format(self.timeout))
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {'leaders': self.leaders, 'coalesced': self.coalesced,
+                    'timeouts': self.timeouts, 'errors': self.errors,
+                    'in_flight': len(self._calls)}
@@ -14,6 +14,25 @@ from datas import *
 from ganzhi import *
 from sizi import summarys
 
+def jin_jiao(first, second):
+    return True if zhi_seqs[second] - zhi_seqs[first] == 1 else False
+
+def is_ku(zhi):
+    return True if zhi in "辰戌丑未" else False  
+
+def zhi_ku(zhi, items):
+    return True if is_ku(zhi) and min(zhi5[zhi], key=zhi5[zhi].get) in items else False
+
+def is_yang(me):
+    return True if gan_seqs[me] % 2 == 0 else False
+
+def not_yang(me):
+    return False if gan_seqs[me] % 2 == 0 else True
+
+def gan_ke(gan1, gan2):
+    return True if ten_deities[gan1]['克'] == ten_deities[gan2]['本'] or ten_deities[gan2]['克'] == ten_deities[gan1]['本'] else False
+
+
 def check_gan(gan, gans):
     result = ''
     if ten_deities[gan]['合'] in gans:
@@ -24,25 +43,24 @@ def check_gan(gan, gans):
 
 def yinyang(item):
     if item in Gan:
-        return '＋' if Gan.index(item)%2 == 0 else '－'
+        return '＋' if gan_seqs[item]%2 == 0 else '－'
     else:
-        return '＋' if Zhi.index(item)%2 == 0 else '－'
+        return '＋' if zhi_seqs[item]%2 == 0 else '－'
     
-def yinyangs(zhis):
+def yinyangs(zhis, file=None):
     result = []
     for item in zhis:
         result.append(yinyang(item))
     if set(result) == set('＋'):
-        print("四柱全阳")
+        print("四柱全阳", file=file)
     if set(result) == set('－'):
-        print("四柱全阴")
+        print("四柱全阴", file=file)
     
     
     
     
 def get_empty(zhu, zhi):
-    empty = empties[zhu]
-    if zhi in empty:
+    if empty_masks[jiazi_seqs[''.join(zhu)]] >> zhi_seqs[zhi] & 1:
         return "空"
     return ""
 
@@ -423,6 +423,21 @@ g_shens = {
             "庚": "戌", "辛":"酉", "壬": "子", "癸":"申"},       
 }
 
+def shen_masks(shens, refs, targets):
+    """把一族神煞编成位掩码表[参照干支序号][目标干支序号]，各神煞按字典顺序占一位。"""
+    return tuple(tuple(sum(1 << seq for seq, item in enumerate(shens) if target in shens[item][ref]) 
+                       for target in targets) for ref in refs)
+
+def shen_names(mask, shens):
+    """由位掩码解出神煞名。"""
+    return [item for seq, item in enumerate(shens) if mask >> seq & 1]
+
+# 年支、日支、日干查地支；月支兼查天干和地支，地支的序号加10
+year_shen_masks = shen_masks(year_shens, Zhi, Zhi)
+month_shen_masks = shen_masks(month_shens, Zhi, Gan + Zhi)
+day_shen_masks = shen_masks(day_shens, Zhi, Zhi)
+g_shen_masks = shen_masks(g_shens, Gan, Zhi)
+
 shens_infos = {
     '孤辰': "孤僻、孤独：月支容易不合群、容易30岁以后才结婚。女命官杀月干坐顾辰、独居概率大，时支则有阴道之心。",
     '寡宿': "类似孤辰，同柱有天月德没关系。男怕孤，女怕寡。",  
@@ -871,4 +886,13 @@ chens = {
     "酉": "酉时初\n家舍是光辉，朝中着紫衣，度民连夜喜，文武贵人提。\n酉时初父母双全，一生利官近贵，文武皆知，六亲有靠，兄弟难为，子息可为，头目官之命。\n\n酉时中\n衣禄不为亏，声名报晓鸡，朝夕惭惶泪，且做别人儿。\n酉时中先克父，为人性宽，兄弟不利，长子难招，早年不遂，末限好，男刑妻，女克夫，离祖过房。\n\n酉时末\n衣禄好安排，人情事可谐，为人心性好，作事有时来。\n酉时末先克母，衣禄平常，兄弟少力，初年晦气辛苦，三十七岁发财，夫妻刑克，男子迟能，女子淫乱，克子。",
     "戌": "戌时初\n慈心行公道，浮财入手来，且有自作力，常得贵人抬。\n戌时初先克母，为人性急心慈，手足不得力，作事有权柄，六亲平常，初年奔波辛苦，三十七八岁发财，衣食好。\n\n戌时中\n平等心无漏，生来本有防，胆有天来大，开口作颠狂。\n戌时中先克父，六亲兄弟少力，夫妻刑克，长子难招，早年奔波劳苦，四十二后渐好，衣禄平平，晚景有旺。\n\n戌时末\n衣禄自安然，平生福自宽，凡事如心意，福享泰锦人。\n戌时末父母双全，为人性急，文武皆通，六亲兄弟有靠，只宜手艺，学术精巧，夫妻偕老，离祖则吉。",
     "亥": "亥时初\n命带自然有，初运未通，一朝时运至，白手整家风。\n亥时初先克母，为人性宽，六亲少力，手足情疏，子息二三，一生近贵，衣禄平常，初年欠遂，末限胜前。\n\n亥时中\n有事会谋施，生来福自余，心好存公道，衣禄更无亏。\n亥时中父母俱全，为人聪明性急，亲戚平和，兄弟子息有分，女秉男权，末限胜前，兴家之命。\n\n亥时末\n衣禄自难量，男女带克伤，夫妇无良德，二姓子相当\n亥时末先克父，为人性燥心慈，六亲少力，兄弟难为，早年劳苦，男克二妻，女刑三夫，末限好。"
-}
\ No newline at end of file
+}
+
+
+# 以六十甲子序号索引的表，见ganzhi.jiazis
+nayin_table = tuple(nayins[tuple(item)] for item in jiazis)
+# 旬空的地支掩码：第n位表示地支序号n落空
+empty_masks = tuple(sum(1 << zhi_seqs[zhi] for zhi in empties[tuple(item)]) for item in jiazis)
+emptie4_table = tuple(emptie4s.get(tuple(item), 0) for item in jiazis)
+rizhu_table = tuple(rizhus[item] for item in jiazis)
+days60_table = tuple(days60[item] for item in jiazis)
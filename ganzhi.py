@@ -10,6 +10,18 @@ Gan = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
 
 Zhi = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
 
+# 干支的序号：天干0-9，地支0-11，代替Gan.index、Zhi.index的线性查找
+gan_seqs = {item: seq for seq, item in enumerate(Gan)}
+zhi_seqs = {item: seq for seq, item in enumerate(Zhi)}
+
+# 六十甲子序号：甲子为0，癸亥为59
+jiazis = tuple(Gan[seq % 10] + Zhi[seq % 12] for seq in range(60))
+jiazi_seqs = {item: seq for seq, item in enumerate(jiazis)}
+
+def jiazi_seq(gan, zhi):
+    """由天干、地支序号求六十甲子序号，天干地支须同阴阳。"""
+    return (6*gan - 5*zhi) % 60
+
 datouxiu = ("壬子", "癸丑", "丙辰", "丁巳", "戊午", "己未", "庚申", "辛酉")
 
 xiaotouxiu = ("壬午", "癸未", "庚子", "辛丑", "戊子", "己丑")
@@ -136,6 +148,27 @@ ju = {
     '本':'刃', '被克':'杀',  '克':'才', '生':'伤', '生我':'枭',
 }
 
+# 十神、十二长生的序号表，由ten_deities生成，均以日主天干序号为第一维
+# shen_table[me][gan]：十神序号(shis)，stage_table[me][zhi]：长生序号(stages)
+# shen_gans[me][shen]、stage_zhis[me][stage]为反查
+shis = ('比', '劫', '食', '伤', '才', '财', '杀', '官', '枭', '印')
+stages = ('长', '沐', '冠', '建', '帝', '衰', '病', '死', '墓', '绝', '胎', '养')
+shi_seqs = {item: seq for seq, item in enumerate(shis)}
+stage_seqs = {item: seq for seq, item in enumerate(stages)}
+
+shen_table = tuple(tuple(shi_seqs[ten_deities[me][gan]] for gan in Gan) for me in Gan)
+stage_table = tuple(tuple(stage_seqs[ten_deities[me][zhi]] for zhi in Zhi) for me in Gan)
+shen_gans = tuple(tuple(Gan.index(ten_deities[me].inverse[shen]) for shen in shis) for me in Gan)
+stage_zhis = tuple(tuple(Zhi.index(ten_deities[me].inverse[stage]) for stage in stages) for me in Gan)
+
+# 地支主气的天干序号
+zhi_main_gans = tuple(Gan.index(max(zhi5[zhi], key=zhi5[zhi].get)) for zhi in Zhi)
+
+# 各日主下每个十神的禄、帝旺、库所在地支序号
+shen_lus = tuple(tuple(stage_zhis[gan][stage_seqs['建']] for gan in row) for row in shen_gans)
+shen_dis = tuple(tuple(stage_zhis[gan][stage_seqs['帝']] for gan in row) for row in shen_gans)
+shen_kus = tuple(tuple(Zhi.index(ten_deities[Gan[gan]]['库'][0]) for gan in row) for row in shen_gans)
+
 shengxiaos = bidict({
     "子":"鼠", "丑":"牛", "寅":"虎", "卯":"兔", "辰":"龙", "巳":"蛇", 
     "午":"马", "未":"羊", "申":"猴", "酉":"鸡", "戌":"狗", "亥":"猪"})
@@ -158,6 +191,18 @@ zhi_atts = {
 
 
 
+# zhi_atts的位掩码表：zhi_att_masks[a][b]的第seq位表示地支b是地支a的zhi_att_types[seq]，a、b为地支序号
+zhi_att_types = ('冲', '刑', '被刑', '合', '会', '害', '破', '六', '暗')
+zhi_att_bits = {type_: 1 << seq for seq, type_ in enumerate(zhi_att_types)}
+zhi_att_masks = tuple(tuple(sum(zhi_att_bits[type_] for type_ in zhi_att_types if zhi2 in zhi_atts[zhi1][type_]) 
+                            for zhi2 in Zhi) for zhi1 in Zhi)
+
+def zhi_att_labels(zhi, zhi_ids, skip=0):
+    """地支序号zhi与zhi_ids各支的关系，返回["冲:午", ...]，skip为不输出的关系掩码。"""
+    row = zhi_att_masks[zhi]
+    masks = [(item, row[item] & ~skip) for item in dict.fromkeys(zhi_ids)]
+    return [type_ + ":" + Zhi[item] for seq, type_ in enumerate(zhi_att_types) 
+            for item, mask in masks if mask >> seq & 1]
 
 kus = {'辰':"水土", '戌':'火土', '丑':'金', '未':'木',}
 
@@ -389,8 +434,8 @@ def getGZ(gzStr):
 
 def get_jizhu(gan, zhi):
     
-    gan_index = Gan.index(gan)
-    zhi_index = Zhi.index(zhi) 
+    gan_index = gan_seqs[gan]
+    zhi_index = zhi_seqs[zhi]
     result = {}
     alls = []
     for i in range(6):
@@ -0,0 +1,39 @@
+# Configuration gunicorn (lue par défaut depuis le répertoire courant)
+#
+# L'application est importée une seule fois dans le maître (preload_app) :
+# datas, ganzhi, sizi.summarys, yue.months, les bidict et rules.py sont
+# chargés avant le fork et partagés par les workers en copy-on-write.
+# gc.freeze() déplace ces objets dans la génération permanente : le
+# ramasse-miettes des workers ne les parcourt plus et n'écrit plus dans
+# leurs pages, qui restent partagées.
+import gc
+import os
+
+preload_app = True
+
+# Workers à threads : les requêtes /bazi identiques et simultanées d'un même
+# worker partagent un seul calcul (app.SINGLE_FLIGHT, propre à chaque processus).
+# Avec des workers sync à un thread, deux requêtes ne se rencontrent jamais.
+worker_class = 'gthread'
+try:
+    threads = max(1, int(os.environ.get('BAZI_THREADS', 4)))
+except ValueError:
+    threads = 4
+
+# Pas de collecte pendant le chargement des tables : sinon les objets
+# survivants sont déplacés d'une génération à l'autre avant le gel.
+gc.disable()
+
+
+def when_ready(server):
+    # Appelé dans le maître après le chargement de l'application, avant le premier fork
+    gc.collect()
+    gc.freeze()
+    gc.enable()
+    server.log.info("Tables gelées avant fork : %d objets", gc.get_freeze_count())
+
+
+def post_worker_init(worker):
+    # Chaque worker peut reprendre les travaux de POST /jobs laissés en cours (voir jobs.py)
+    import app
+    app.TRAVAUX.start()
@@ -0,0 +1,258 @@
+# Couche de traduction de l'API, compilée au chargement (fr, en, zh)
+#
+# Les tables sources sont indexées par les caractères chinois ; au chargement
+# elles sont compilées en tuples indexés par les numéros de bazi.py (tronc,
+# branche, dix dieux, phase, 60 jiazi), puis les fragments de réponse sont
+# pré-construits pour chaque langue : détails des 60 binômes, piliers
+# (binôme x dix dieux), grandes fortunes (maître du jour x binôme) et lignes
+# du résumé. Une réponse ne fait que référencer ces fragments : ajouter une
+# langue ne coûte que de la mémoire, chargée avant le fork avec gunicorn.
+#
+# Les fragments sont partagés par toutes les réponses : ne pas les modifier.
+# Les champs gardent leur nom dans toutes les langues (shishen_fr, phase_fr,
+# nayin_fr, resume_fr portent la langue demandée).
+from ganzhi import Gan, Zhi, jiazis, jiazi_seqs, shis, shi_seqs, stages, stage_table, shen_table
+from datas import nayin_table
+
+LANGUES = ('fr', 'en', 'zh')
+LANGUE_DEFAUT = 'fr'
+
+# ============================================================
+# TABLES SOURCES
+# ============================================================
+PINYIN = {
+    '甲':'Jiǎ', '乙':'Yǐ', '丙':'Bǐng', '丁':'Dīng', '戊':'Wù',
+    '己':'Jǐ', '庚':'Gēng', '辛':'Xīn', '壬':'Rén', '癸':'Guǐ',
+    '子':'Zǐ', '丑':'Chǒu', '寅':'Yín', '卯':'Mǎo', '辰':'Chén', '巳':'Sì',
+    '午':'Wǔ', '未':'Wèi', '申':'Shēn', '酉':'Yǒu', '戌':'Xū', '亥':'Hài',
+}
+
+# Élément de chaque tronc et branche
+WUXING = {
+    '甲':'木', '乙':'木', '丙':'火', '丁':'火', '戊':'土',
+    '己':'土', '庚':'金', '辛':'金', '壬':'水', '癸':'水',
+    '子':'水', '丑':'土', '寅':'木', '卯':'木', '辰':'土', '巳':'火',
+    '午':'火', '未':'土', '申':'金', '酉':'金', '戌':'土', '亥':'水',
+}
+
+ELEMENTS = {
+    'fr': {'木':'Bois', '火':'Feu', '土':'Terre', '金':'Métal', '水':'Eau'},
+    'en': {'木':'Wood', '火':'Fire', '土':'Earth', '金':'Metal', '水':'Water'},
+    'zh': {'木':'木', '火':'火', '土':'土', '金':'金', '水':'水'},
+}
+
+ANIMAUX = {
+    'fr': ('Rat 🐀', 'Buffle 🐂', 'Tigre 🐅', 'Lapin 🐇', 'Dragon 🐉', 'Serpent 🐍',
+           'Cheval 🐴', 'Chèvre 🐐', 'Singe 🐒', 'Coq 🐓', 'Chien 🐕', 'Cochon 🐖'),
+    'en': ('Rat 🐀', 'Ox 🐂', 'Tiger 🐅', 'Rabbit 🐇', 'Dragon 🐉', 'Snake 🐍',
+           'Horse 🐴', 'Goat 🐐', 'Monkey 🐒', 'Rooster 🐓', 'Dog 🐕', 'Pig 🐖'),
+    'zh': ('鼠 🐀', '牛 🐂', '虎 🐅', '兔 🐇', '龙 🐉', '蛇 🐍',
+           '马 🐴', '羊 🐐', '猴 🐒', '鸡 🐓', '狗 🐕', '猪 🐖'),
+}
+
+# 十神, dans l'ordre de ganzhi.shis, puis le maître du jour ('--')
+SHISHEN = {
+    'fr': ('Parallèle', 'Rob. richesse', 'Dieu gourmand', 'Officier blessant', 'Richesse partielle',
+           'Richesse directe', '7e tueur', 'Officier direct', 'Sceau partiel', 'Sceau direct',
+           'Maître du jour'),
+    'en': ('Friend', 'Rob Wealth', 'Eating God', 'Hurting Officer', 'Indirect Wealth',
+           'Direct Wealth', 'Seven Killings', 'Direct Officer', 'Indirect Resource', 'Direct Resource',
+           'Day Master'),
+    'zh': ('比肩', '劫财', '食神', '伤官', '偏财', '正财', '七杀', '正官', '偏印', '正印', '日主'),
+}
+MAITRE = len(shis) # numéro du maître du jour dans SHISHEN
+
+# 长生十二神, dans l'ordre de ganzhi.stages
+PHASES = {
+    'fr': ('Longévité (naissance)', 'Bain (purification)', 'Couronne (mise en forme)',
+           'Prise de fonction', 'Apogée', 'Déclin', 'Maladie', 'Fin / mort', 'Tombe / stockage',
+           'Extinction', 'Fœtus', 'Gestation'),
+    'en': ('Birth', 'Bath', 'Crown Belt', 'Coming of Age', 'Peak', 'Decline', 'Sickness',
+           'Death', 'Tomb', 'Extinction', 'Conception', 'Nurture'),
+    'zh': ('长生', '沐浴', '冠带', '临官', '帝旺', '衰', '病', '死', '墓', '绝', '胎', '养'),
+}
+
+# 纳音, tels qu'écrits dans datas.nayins
+NAYINS = {
+    'fr': {
+        '海中金': "Métal dans la mer", '炉中火': "Feu du four",
+        '大林木': "Bois de grande forêt", '路旁土': "Terre en bord de route",
+        '剑锋金': "Métal – lame d'épée", '山头火': "Feu du sommet",
+        '涧下水': "Eau du ravin", '城头土': "Terre des remparts",
+        '白蜡金': "Métal de cire blanche", '杨柳木': "Bois de saule",
+        '泉中水': "Eau de la source", '屋上土': "Terre sur le toit",
+        '霹雳火': "Feu du tonnerre", '松柏木': "Bois de pin/cyprès",
+        '长流水': "Eau de long cours", '砂中金': "Métal dans le sable",
+        '山下火': "Feu au pied de la montagne", '平地木': "Bois de plaine",
+        '壁上土': "Terre sur le mur", '金泊金': "Métal – feuille d'or",
+        '覆灯火': "Feu de la lampe (couvrante)", '天河水': "Eau de la Voie lactée",
+        '大驿土': "Terre de la grande poste", '钗钏金': "Métal des bijoux",
+        '桑柘木': "Bois de mûrier", '大溪水': "Eau du grand ruisseau",
+        '砂中土': "Terre dans le sable", '天上火': "Feu céleste",
+        '石榴木': "Bois de grenadier", '大海水': "Eau de l'océan",
+        '井泉水': "Eau de puits / source",
+    },
+    'en': {
+        '海中金': "Gold in the Sea", '炉中火': "Fire in the Furnace",
+        '大林木': "Wood of the Great Forest", '路旁土': "Earth by the Roadside",
+        '剑锋金': "Sword-edge Metal", '山头火': "Fire on the Mountain Top",
+        '涧下水': "Water in the Ravine", '城头土': "Earth on the City Wall",
+        '白蜡金': "White Wax Metal", '杨柳木': "Willow Wood",
+        '泉中水': "Spring Water", '屋上土': "Earth on the Roof",
+        '霹雳火': "Thunderbolt Fire", '松柏木': "Pine and Cypress Wood",
+        '长流水': "Long-flowing Water", '砂中金': "Gold in the Sand",
+        '山下火': "Fire at the Foot of the Mountain", '平地木': "Wood of the Plain",
+        '壁上土': "Earth on the Wall", '金泊金': "Gold Leaf Metal",
+        '覆灯火': "Lamp Fire", '天河水': "Water of the Milky Way",
+        '大驿土': "Earth of the Great Post Road", '钗钏金': "Hairpin and Bracelet Metal",
+        '桑柘木': "Mulberry Wood", '大溪水': "Great Stream Water",
+        '砂中土': "Earth in the Sand", '天上火': "Heavenly Fire",
+        '石榴木': "Pomegranate Wood", '大海水': "Ocean Water",
+        '井泉水': "Well Water",
+    },
+    'zh': {},
+}
+
+# Libellés du résumé (resume_fr)
+RESUME = {
+    'fr': {
+        'quatre_piliers': '4 Piliers: {}', 'date_solaire': 'Date solaire: {}', 'date_lunaire': 'Date lunaire: {}',
+        'piliers': ('Année', 'Mois', 'Jour', 'Heure'),
+        'wuxing': '5 éléments (scores): Métal {metal}, Bois {bois}, Eau {eau}, Feu {feu}, Terre {terre}',
+        'force': 'Force: {} (moyenne {})',
+        'palais': {'ming_gong': 'Ming Gong', 'tai_yuan': 'Tai Yuan', 'shen_gong': 'Shen Gong'},
+        'dayun': 'DaYun (extrait):', 'age': '  - {} ans: ',
+    },
+    'en': {
+        'quatre_piliers': '4 Pillars: {}', 'date_solaire': 'Solar date: {}', 'date_lunaire': 'Lunar date: {}',
+        'piliers': ('Year', 'Month', 'Day', 'Hour'),
+        'wuxing': '5 elements (scores): Metal {metal}, Wood {bois}, Water {eau}, Fire {feu}, Earth {terre}',
+        'force': 'Strength: {} (average {})',
+        'palais': {'ming_gong': 'Ming Gong', 'tai_yuan': 'Tai Yuan', 'shen_gong': 'Shen Gong'},
+        'dayun': 'DaYun (excerpt):', 'age': '  - age {}: ',
+    },
+    'zh': {
+        'quatre_piliers': '四柱: {}', 'date_solaire': '公历: {}', 'date_lunaire': '农历: {}',
+        'piliers': ('年柱', '月柱', '日柱', '时柱'),
+        'wuxing': '五行分数: 金 {metal}, 木 {bois}, 水 {eau}, 火 {feu}, 土 {terre}',
+        'force': '强弱: {} (平均 {})',
+        'palais': {'ming_gong': '命宫', 'tai_yuan': '胎元', 'shen_gong': '身宫'},
+        'dayun': '大运（节选）:', 'age': '  - {}岁: ',
+    },
+}
+
+
+# ============================================================
+# COMPILATION
+# ============================================================
+def _details(lang, seq):
+    gz = jiazis[seq]
+    elements, animaux = ELEMENTS[lang], ANIMAUX[lang]
+    return {
+        'ganzhi': gz,
+        'tronc': gz[0],
+        'branche': gz[1],
+        'tronc_pinyin': PINYIN[gz[0]],
+        'branche_pinyin': PINYIN[gz[1]],
+        'tronc_element': elements[WUXING[gz[0]]],
+        'branche_element': elements[WUXING[gz[1]]],
+        'animal': animaux[Zhi.index(gz[1])],
+    }
+
+
+def _pilier(lang, det, shi):
+    god = shis[shi] if shi < MAITRE else '--'
+    return {
+        'tronc': det['tronc'],
+        'branche': det['branche'],
+        'binome': det['ganzhi'],
+        'tronc_pinyin': det['tronc_pinyin'],
+        'branche_pinyin': det['branche_pinyin'],
+        'tronc_element': det['tronc_element'],
+        'branche_element': det['branche_element'],
+        'animal': det['animal'],
+        'shishen': god,
+        'shishen_fr': SHISHEN[lang][shi],
+    }
+
+
+def _dayun(lang, det, me, seq):
+    gz = det['ganzhi']
+    phase = stages[stage_table[me][seq % 12]]
+    nayin = nayin_table[seq]
+    return {
+        'ganzhi': gz,
+        'tronc': det['tronc'],
+        'branche': det['branche'],
+        'tronc_element': det['tronc_element'],
+        'branche_element': det['branche_element'],
+        'animal': det['animal'],
+        'phase': phase,
+        'phase_fr': PHASES[lang][stage_table[me][seq % 12]],
+        'nayin': nayin,
+        'nayin_fr': NAYINS[lang].get(nayin, nayin),
+    }
+
+
+def _frise(lang, det, me, seq):
+    shi = shen_table[me][seq % 10]
+    dayun = _dayun(lang, det, me, seq)
+    return {
+        'ganzhi': dayun['ganzhi'],
+        'tronc': dayun['tronc'],
+        'branche': dayun['branche'],
+        'shishen': shis[shi],
+        'shishen_fr': SHISHEN[lang][shi],
+        'phase': dayun['phase'],
+        'phase_fr': dayun['phase_fr'],
+        'nayin': dayun['nayin'],
+        'nayin_fr': dayun['nayin_fr'],
+    }
+
+
+def _ligne_pilier(label, pilier):
+    return "{}: {} ({} {}) – {}/{} – {} – {}".format(
+        label, pilier['binome'], pilier['tronc_pinyin'], pilier['branche_pinyin'],
+        pilier['tronc_element'], pilier['branche_element'], pilier['animal'], pilier['shishen_fr'])
+
+
+# Pour chaque langue, indexés par numéros :
+# DETAILS[lang][jiazi], PILIERS[lang][jiazi][dix dieux ou MAITRE],
+# DAYUN[lang][maître du jour][jiazi], FRISE[lang][maître du jour][jiazi],
+# LIGNES_PILIERS[lang][pilier][jiazi][dix dieux ou MAITRE], LIGNES_DAYUN[lang][jiazi]
+DETAILS, PILIERS, DAYUN, FRISE, LIGNES_PILIERS, LIGNES_DAYUN = {}, {}, {}, {}, {}, {}
+for _lang in LANGUES:
+    DETAILS[_lang] = tuple(_details(_lang, seq) for seq in range(60))
+    PILIERS[_lang] = tuple(tuple(_pilier(_lang, det, shi) for shi in range(MAITRE + 1))
+                           for det in DETAILS[_lang])
+    DAYUN[_lang] = tuple(tuple(_dayun(_lang, det, me, seq) for seq, det in enumerate(DETAILS[_lang]))
+                         for me in range(len(Gan)))
+    FRISE[_lang] = tuple(tuple(_frise(_lang, det, me, seq) for seq, det in enumerate(DETAILS[_lang]))
+                         for me in range(len(Gan)))
+    LIGNES_PILIERS[_lang] = tuple(tuple(tuple(_ligne_pilier(label, pilier) for pilier in piliers)
+                                        for piliers in PILIERS[_lang])
+                                  for label in RESUME[_lang]['piliers'])
+    LIGNES_DAYUN[_lang] = tuple('{} / {} / {}'.format(item['ganzhi'], item['animal'], item['nayin_fr'])
+                                for item in DAYUN[_lang][0])
+del _lang
+
+
+def langue(value):
+    """Langue demandée (lang=), LANGUE_DEFAUT si absente ; ValueError si inconnue."""
+    if value in (None, ''):
+        return LANGUE_DEFAUT
+    value = str(value).strip().lower()
+    if value not in LANGUES:
+        raise ValueError('langue inconnue : {}, disponibles : {}'.format(value, ', '.join(LANGUES)))
+    return value
+
+
+def details(gz, lang=LANGUE_DEFAUT):
+    """Détails d'un binôme (tronc, branche, pinyin, éléments, animal), None s'il n'en est pas un."""
+    seq = jiazi_seqs.get(gz)
+    return None if seq is None else DETAILS[lang][seq]
+
+
+def shishen_id(name):
+    """Numéro d'un dix dieux abrégé de ganzhi.shis, MAITRE pour '--'."""
+    return shi_seqs.get(name, MAITRE)
@@ -0,0 +1,287 @@
+# Travaux asynchrones : très grands lots de thèmes, calculés en arrière-plan
+#
+# Chaque travail est un répertoire sous BAZI_JOBS_DIR :
+#   entree.ndjson   un élément par ligne (objet JSON, ou message d'erreur en chaîne JSON)
+#   etat.json       total, faits, position dans resultats.ndjson, statut, dates
+#   resultats.ndjson une ligne par élément, dans l'ordre de l'entrée
+#
+# Un seul travail à la fois par machine : le thread d'exécution de chaque
+# processus (worker gunicorn ou uvicorn) attend le verrou commun, puis traite
+# les travaux non terminés du plus ancien au plus récent, par paquets envoyés
+# au pool de processus. Après chaque paquet les résultats sont écrits sur
+# disque puis etat.json est remplacé : si le processus meurt, un autre reprend
+# au dernier paquet enregistré et tronque ce qui a été écrit après.
+# Un travail qui échoue max_echecs fois de suite est terminé avec une erreur
+# (champ "erreur") : les travaux suivants ne restent pas bloqués derrière lui.
+import os
+import csv
+import json
+import time
+import uuid
+import fcntl
+import shutil
+import logging
+import tempfile
+import threading
+import itertools
+from concurrent.futures.process import BrokenProcessPool
+
+log = logging.getLogger(__name__)
+
+EN_ATTENTE, EN_COURS, TERMINE = 'en_attente', 'en_cours', 'termine'
+
+
+class Depassement(ValueError):
+    """Travail de plus de max_items éléments."""
+
+
+class TravailVide(ValueError):
+    """Travail sans aucun élément."""
+
+
+def _ecrire_json(path, obj):
+    # Remplacement atomique : etat.json est toujours complet
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(obj, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _aplatir(obj, prefix=''):
+    # {'piliers': {'jour': {'binome': ...}}} -> {'piliers.jour.binome': ...}, listes en JSON
+    row = {}
+    for key, value in obj.items():
+        name = prefix + str(key)
+        if isinstance(value, dict):
+            row.update(_aplatir(value, name + '.'))
+        elif isinstance(value, list):
+            row[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            row[name] = value
+    return row
+
+
+class Jobs:
+    """Travaux sur disque dans directory, exécutés avec pool() (un concurrent.futures.Executor).
+
+    item(index, data) calcule un élément (data peut être une ValueError) et renvoie
+    la ligne de résultat ; il est envoyé au pool, il doit donc être importable.
+    drop_pool(executor), si donné, est appelé quand le pool est cassé (processus
+    enfant mort) pour que pool() en renvoie un nouveau.
+    """
+
+    def __init__(self, directory, pool, item, chunk=512, max_items=1000000, poll=2.0,
+                 drop_pool=None, max_echecs=3):
+        self.directory = directory
+        self.pool = pool
+        self.drop_pool = drop_pool
+        self.max_echecs = max_echecs
+        self.item = item
+        self.chunk = chunk
+        self.max_items = max_items
+        self.poll = poll
+        self._reveil = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _path(self, job_id, name=''):
+        # Les identifiants sont des uuid hexadécimaux : pas de chemin arbitraire
+        if not job_id or not all(c in '0123456789abcdef' for c in job_id):
+            raise KeyError(job_id)
+        return os.path.join(self.directory, job_id, name)
+
+    # --- Soumission ---
+    def create(self, items):
+        """Enregistre un travail ; items est un itérable de dict ou de ValueError. Renvoie son état.
+
+        Depassement si le travail dépasse max_items éléments, TravailVide s'il n'en a aucun ;
+        rien n'est alors laissé sur le disque.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        # Écrit à côté puis renommé : le thread d'exécution ne voit jamais un travail incomplet
+        tmp = tempfile.mkdtemp(prefix='.', dir=self.directory)
+        try:
+            total = 0
+            with open(os.path.join(tmp, 'entree.ndjson'), 'w') as f:
+                for item in items:
+                    total += 1
+                    if total > self.max_items:
+                        raise Depassement('au plus {} éléments par travail'.format(self.max_items))
+                    f.write(json.dumps(str(item) if isinstance(item, ValueError) else item) + '\n')
+            if not total:
+                raise TravailVide('aucun élément')
+            open(os.path.join(tmp, 'resultats.ndjson'), 'w').close()
+            etat = {'id': job_id, 'statut': EN_ATTENTE, 'total': total, 'faits': 0, 'erreurs': 0,
+                    'position': 0, 'echecs': 0, 'cree': time.time(), 'debut': None, 'fin': None}
+            _ecrire_json(os.path.join(tmp, 'etat.json'), etat)
+            os.rename(tmp, self._path(job_id))
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.start()
+        self._reveil.set()
+        return etat
+
+    # --- Lecture ---
+    def status(self, job_id):
+        """État d'un travail, None s'il n'existe pas."""
+        try:
+            with open(self._path(job_id, 'etat.json')) as f:
+                return json.load(f)
+        except (KeyError, OSError, ValueError):
+            return None
+
+    def _resultats(self, etat):
+        # Seules les lignes enregistrées (jusqu'à la position de etat.json) sont lues
+        with open(self._path(etat['id'], 'resultats.ndjson'), 'rb') as f:
+            remaining = etat['position']
+            for line in f:
+                if remaining <= 0:
+                    break
+                remaining -= len(line)
+                yield line.decode()
+
+    def ndjson(self, etat):
+        """Résultats déjà calculés, en NDJSON."""
+        return self._resultats(etat)
+
+    def csv(self, etat):
+        """Résultats déjà calculés, en CSV (colonnes aplaties 'piliers.jour.binome', listes en JSON).
+
+        Deux lectures du fichier : la première établit les colonnes.
+        """
+        columns = {'index': None, 'success': None}
+        for line in self._resultats(etat):
+            columns.update(dict.fromkeys(_aplatir(json.loads(line))))
+        out = _Tampon()
+        writer = csv.DictWriter(out, fieldnames=list(columns), extrasaction='ignore')
+        writer.writeheader()
+        yield out.vider()
+        for line in self._resultats(etat):
+            writer.writerow(_aplatir(json.loads(line)))
+            yield out.vider()
+
+    # --- Exécution ---
+    def start(self):
+        """Démarre le thread d'exécution de ce processus (sans effet s'il tourne déjà)."""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._boucle, name='bazi-jobs', daemon=True)
+            self._thread.start()
+
+    def _en_suspens(self):
+        etats = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        for name in names:
+            if name.startswith('.'):
+                continue
+            etat = self.status(name)
+            if etat is not None and etat['statut'] != TERMINE:
+                etats.append(etat)
+        return sorted(etats, key=lambda etat: etat['cree'])
+
+    def _boucle(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, '.verrou'), 'a') as verrou:
+            while True:
+                self._reveil.wait(self.poll)
+                self._reveil.clear()
+                try:
+                    fcntl.flock(verrou, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue # un autre processus exécute les travaux
+                try:
+                    for etat in self._en_suspens():
+                        try:
+                            self._executer(etat)
+                        except Exception as e:
+                            self._echec(etat['id'], e)
+                finally:
+                    fcntl.flock(verrou, fcntl.LOCK_UN)
+
+    def _echec(self, job_id, error):
+        # Compté dans etat.json : au-delà de max_echecs le travail est terminé avec l'erreur
+        etat = self.status(job_id)
+        if etat is None:
+            return
+        etat['echecs'] = etat.get('echecs', 0) + 1
+        if etat['echecs'] >= self.max_echecs:
+            log.exception('travail %s : abandonné après %d échecs', job_id, etat['echecs'])
+            etat.update(statut=TERMINE, fin=time.time(), erreur=str(error) or type(error).__name__)
+        else:
+            log.exception('travail %s : échec %d, nouvel essai dans %s s', job_id, etat['echecs'], self.poll)
+        _ecrire_json(self._path(job_id, 'etat.json'), etat)
+
+    def _executer(self, etat):
+        job_id = etat['id']
+        etat_path = self._path(job_id, 'etat.json')
+        if etat['statut'] == EN_COURS:
+            log.info('travail %s : reprise après %d éléments', job_id, etat['faits'])
+        etat.update(statut=EN_COURS, debut=etat['debut'] or time.time())
+        _ecrire_json(etat_path, etat)
+
+        with open(self._path(job_id, 'entree.ndjson')) as entree, \
+                open(self._path(job_id, 'resultats.ndjson'), 'r+b') as sortie:
+            # Ce qui suit le dernier paquet enregistré est refait
+            sortie.truncate(etat['position'])
+            sortie.seek(etat['position'])
+            lines = itertools.islice(entree, etat['faits'], None)
+            index = etat['faits']
+            while True:
+                paquet = list(itertools.islice(lines, self.chunk))
+                if not paquet:
+                    break
+                datas = []
+                for line in paquet:
+                    data = json.loads(line)
+                    datas.append(ValueError(data) if isinstance(data, str) else data)
+                pool = self.pool()
+                try:
+                    results = list(pool.map(self.item, range(index, index + len(datas)), datas, chunksize=16))
+                except BrokenProcessPool:
+                    if self.drop_pool is not None:
+                        self.drop_pool(pool)
+                    raise
+                sortie.write(b''.join(json.dumps(result).encode() + b'\n' for result in results))
+                sortie.flush()
+                os.fsync(sortie.fileno())
+                index += len(datas)
+                etat.update(faits=index, position=sortie.tell(), echecs=0,
+                            erreurs=etat['erreurs'] + sum(1 for result in results if not result.get('success')))
+                _ecrire_json(etat_path, etat)
+
+        etat.update(statut=TERMINE, fin=time.time())
+        _ecrire_json(etat_path, etat)
+
+
+class _Tampon:
+    # Fichier minimal pour csv.writer : renvoie ce qui a été écrit depuis le dernier appel
+    def __init__(self):
+        self._parts = []
+
+    def write(self, text):
+        self._parts.append(text)
+
+    def vider(self):
+        text = ''.join(self._parts)
+        self._parts = []
+        return text
+
+
+def from_env(pool, item, drop_pool=None):
+    """Travaux dans BAZI_JOBS_DIR (par défaut dans le répertoire temporaire), au plus BAZI_JOBS_MAX éléments."""
+    directory = os.environ.get('BAZI_JOBS_DIR', os.path.join(tempfile.gettempdir(), 'bazi-jobs'))
+    try:
+        max_items = int(os.environ.get('BAZI_JOBS_MAX', 1000000))
+    except ValueError:
+        max_items = 1000000
+    return Jobs(directory, pool, item, max_items=max_items, drop_pool=drop_pool)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Générateur de charge hors ligne pour l'API (app.py)
+#
+#   python loadtest.py --url http://127.0.0.1:8000 -c 16 -n 5000 -o avant.json
+#   python loadtest.py --url http://127.0.0.1:8000 -c 16 -n 5000 --baseline avant.json
+#
+# Sans --url, l'application est chargée dans ce processus et appelée avec le
+# client de test Flask (pas de réseau, utile pour comparer deux versions du
+# moteur sans serveur). Les requêtes sont tirées d'un générateur à graine fixe :
+# deux exécutions avec les mêmes options envoient la même suite de requêtes.
+# Le rapport JSON donne le débit, les latences p50/p95/p99 et le taux d'erreur,
+# au total et par route ; avec --baseline il est comparé à un rapport précédent.
+#
+# Si le serveur a un cache SQLite (BAZI_CACHE), il survit aux exécutions : pour
+# mesurer le calcul, lancer le serveur sans BAZI_CACHE ou changer --seed.
+import sys
+import json
+import time
+import random
+import argparse
+import calendar
+import threading
+import http.client
+import urllib.parse
+
+ROUTES = ('bazi', 'timeline', 'batch')
+
+
+def percentile(values, q):
+    """Percentile q (0-100) par rang le plus proche, values triées ; None si vide."""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * q // 100))
+    return values[int(rank) - 1]
+
+
+class Generateur:
+    """Suite reproductible de requêtes (route, méthode, chemin, corps).
+
+    Les années de naissance suivent une loi normale (centre, écart type) bornée
+    à 1930-2020, mois, jour et heure sont uniformes. Avec la probabilité
+    hit_ratio, une date déjà envoyée est réutilisée (succès attendu des caches).
+    """
+
+    def __init__(self, mix, seed=0, hit_ratio=0.5, center=1985, spread=15, batch_size=50, fields=None):
+        self.routes = [route for route, weight in mix.items() for _ in range(weight)]
+        self.rng = random.Random(seed)
+        self.hit_ratio = hit_ratio
+        self.center, self.spread = center, spread
+        self.batch_size = batch_size
+        self.fields = fields
+        self.vues = []
+        self._lock = threading.Lock()
+
+    def _date(self):
+        rng = self.rng
+        if self.vues and rng.random() < self.hit_ratio:
+            return rng.choice(self.vues)
+        year = min(max(int(rng.gauss(self.center, self.spread)), 1930), 2020)
+        month = rng.randint(1, 12)
+        date = {'year': year, 'month': month, 'day': rng.randint(1, calendar.monthrange(year, month)[1]),
+                'hour': rng.randrange(24), 'gender': rng.choice('MF')}
+        if self.fields:
+            date['fields'] = self.fields
+        self.vues.append(date)
+        return date
+
+    def suivante(self):
+        with self._lock:
+            route = self.rng.choice(self.routes)
+            if route == 'batch':
+                body = ''.join(json.dumps(self._date()) + '\n' for _ in range(self.batch_size))
+                return route, 'POST', '/bazi/batch', body.encode()
+            date = self._date()
+            if route == 'timeline':
+                start = date['year'] + self.rng.randrange(80)
+                params = dict(date, from_year=start, to_year=start + 9)
+                return route, 'GET', '/bazi/timeline?' + urllib.parse.urlencode(params), None
+            return route, 'GET', '/bazi?' + urllib.parse.urlencode(date), None
+
+
+class ClientHTTP:
+    # Une connexion persistante par thread
+    def __init__(self, url, timeout):
+        parts = urllib.parse.urlsplit(url)
+        connection = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self._nouvelle = lambda: connection(parts.hostname, parts.port, timeout=timeout)
+        self._prefix = parts.path.rstrip('/')
+        self._conn = None
+
+    def envoyer(self, method, path, body):
+        if self._conn is None:
+            self._conn = self._nouvelle()
+        headers = {'Content-Type': 'application/x-ndjson'} if body is not None else {}
+        try:
+            self._conn.request(method, self._prefix + path, body=body, headers=headers)
+            response = self._conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            self._conn = None
+            raise
+        return response.status, data
+
+
+class ClientLocal:
+    # Application chargée dans ce processus (client de test Flask)
+    def __init__(self, application):
+        self._client = application.test_client()
+
+    def envoyer(self, method, path, body):
+        response = self._client.open(path, method=method, data=body,
+                                     content_type='application/x-ndjson' if body is not None else None)
+        return response.status_code, response.get_data()
+
+
+def _version(client):
+    # Version du moteur lue dans /metrics (bazi_engine_info), None si indisponible
+    try:
+        status, data = client.envoyer('GET', '/metrics', None)
+    except Exception:
+        return None
+    for line in data.decode('utf-8', 'replace').splitlines():
+        if line.startswith('bazi_engine_info{'):
+            return line.split('version="', 1)[1].split('"', 1)[0]
+    return None
+
+
+def executer(args):
+    """Lance la charge décrite par args ; renvoie le rapport (dict)."""
+    mix = _mix(args.mix)
+    generateur = Generateur(mix, args.seed, args.hit_ratio, args.center, args.spread, args.batch_size, args.fields)
+    if args.url:
+        nouveau_client = lambda: ClientHTTP(args.url, args.timeout)
+    else:
+        import app
+        nouveau_client = lambda: ClientLocal(app.app)
+
+    mesures = {route: [] for route in mix} # (latence, statut, erreur)
+    lock = threading.Lock()
+    restantes = [args.warmup, args.requests]
+    fin = None
+
+    def travailler(mesure):
+        client = nouveau_client()
+        while True:
+            with lock:
+                if not mesure:
+                    if restantes[0] <= 0:
+                        return
+                    restantes[0] -= 1
+                elif fin is not None:
+                    if time.perf_counter() >= fin:
+                        return
+                elif restantes[1] <= 0:
+                    return
+                else:
+                    restantes[1] -= 1
+            route, method, path, body = generateur.suivante()
+            start = time.perf_counter()
+            try:
+                status, data = client.envoyer(method, path, body)
+                erreur = status >= 400 or (route == 'batch' and b'"success": false' in data)
+            except Exception:
+                status, erreur = None, True
+            if mesure:
+                with lock:
+                    mesures[route].append((time.perf_counter() - start, status, erreur))
+
+    # Échauffement (non mesuré), puis charge mesurée
+    if args.warmup:
+        threads = [threading.Thread(target=travailler, args=(False,)) for _ in range(args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    debut = time.perf_counter()
+    if args.duration:
+        fin = debut + args.duration
+    threads = [threading.Thread(target=travailler, args=(True,)) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duree = time.perf_counter() - debut
+
+    rapport = {
+        'config': {'cible': args.url or 'local', 'concurrence': args.concurrency, 'mix': mix,
+                   'requetes': args.requests if not args.duration else None, 'duree': args.duration,
+                   'seed': args.seed, 'hit_ratio': args.hit_ratio, 'batch_size': args.batch_size,
+                   'fields': args.fields, 'python': sys.version.split()[0]},
+        'version_moteur': _version(nouveau_client()),
+        'duree_s': round(duree, 3),
+    }
+    toutes = [item for items in mesures.values() for item in items]
+    rapport['total'] = _stats(toutes, duree)
+    rapport['routes'] = {route: _stats(items, duree) for route, items in mesures.items()}
+    return rapport
+
+
+def _stats(items, duree):
+    latences = sorted(latence for latence, status, erreur in items)
+    statuts = {}
+    for latence, status, erreur in items:
+        statuts[str(status)] = statuts.get(str(status), 0) + 1
+    erreurs = sum(1 for latence, status, erreur in items if erreur)
+    ms = lambda value: None if value is None else round(value * 1000, 3)
+    return {
+        'requetes': len(items),
+        'debit_rps': round(len(items) / duree, 2) if duree else None,
+        'erreurs': erreurs,
+        'taux_erreur': round(erreurs / len(items), 4) if items else None,
+        'latence_ms': {'moyenne': ms(sum(latences) / len(latences)) if latences else None,
+                       'p50': ms(percentile(latences, 50)), 'p95': ms(percentile(latences, 95)),
+                       'p99': ms(percentile(latences, 99)), 'max': ms(latences[-1] if latences else None)},
+        'statuts': statuts,
+    }
+
+
+def comparer(rapport, reference):
+    """Rapport nouveau / référence pour le débit et les latences, au total et par route."""
+    def ratio(new, old):
+        return round(new / old, 3) if new is not None and old else None
+
+    def section(new, old):
+        return {
+            'debit_rps': ratio(new['debit_rps'], old['debit_rps']),
+            'taux_erreur': [old['taux_erreur'], new['taux_erreur']],
+            'latence_ms': {key: ratio(new['latence_ms'][key], old['latence_ms'][key])
+                           for key in ('p50', 'p95', 'p99')},
+        }
+
+    return {
+        'versions': [reference.get('version_moteur'), rapport.get('version_moteur')],
+        'total': section(rapport['total'], reference['total']),
+        'routes': {route: section(stats, reference['routes'][route])
+                   for route, stats in rapport['routes'].items() if route in reference.get('routes', {})},
+    }
+
+
+def _mix(value):
+    # "bazi=8,timeline=1,batch=1" -> {'bazi': 8, 'timeline': 1, 'batch': 1}
+    mix = {}
+    for item in value.split(','):
+        route, _, weight = item.partition('=')
+        route = route.strip()
+        if route not in ROUTES:
+            raise argparse.ArgumentTypeError('route inconnue : {} (routes : {})'.format(route, ', '.join(ROUTES)))
+        try:
+            mix[route] = int(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError('poids invalide : {}'.format(item))
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError('au moins une route de poids non nul')
+    return {route: weight for route, weight in mix.items() if weight > 0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Charge reproductible sur /bazi, /bazi/timeline et /bazi/batch, '
+                                                 'rapport JSON sur la sortie standard.')
+    parser.add_argument('--url', help='serveur à charger, ex. http://127.0.0.1:8000 (par défaut : app.py dans ce processus)')
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help='requêtes simultanées (8)')
+    parser.add_argument('-n', '--requests', type=int, default=1000, help='requêtes mesurées (1000)')
+    parser.add_argument('-d', '--duration', type=float, help='durée en secondes, remplace -n')
+    parser.add_argument('--warmup', type=int, default=0, help='requêtes d\'échauffement non mesurées (0)')
+    parser.add_argument('--mix', default='bazi=1', help='routes et poids, ex. bazi=8,timeline=1,batch=1')
+    parser.add_argument('--hit-ratio', type=float, default=0.5, help='part des requêtes qui répètent une date (0.5)')
+    parser.add_argument('--center', type=int, default=1985, help='année de naissance moyenne (1985)')
+    parser.add_argument('--spread', type=float, default=15, help='écart type des années (15)')
+    parser.add_argument('--batch-size', type=int, default=50, help='éléments par requête /bazi/batch (50)')
+    parser.add_argument('--fields', help='fields= envoyé avec chaque thème')
+    parser.add_argument('--seed', type=int, default=0, help='graine du générateur (0)')
+    parser.add_argument('--timeout', type=float, default=30, help='délai réseau par requête en secondes (30)')
+    parser.add_argument('-o', '--output', help='écrit aussi le rapport dans ce fichier')
+    parser.add_argument('--baseline', help='rapport précédent à comparer (champ comparaison)')
+    args = parser.parse_args(argv)
+    try:
+        _mix(args.mix)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    rapport = executer(args)
+    if args.baseline:
+        with open(args.baseline) as f:
+            rapport['comparaison'] = comparer(rapport, json.load(f))
+    text = json.dumps(rapport, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
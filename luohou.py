@@ -14,7 +14,7 @@ import collections
 from lunar_python import Lunar
 from colorama import init
 
-from ganzhi import Gan, Zhi, ymc, rmc, zhi_time, jis, zhi_atts, get_jizhu, datouxiu, xiaotouxiu
+from ganzhi import Gan, Zhi, ymc, rmc, zhi_time, jis, zhi_atts, get_jizhu, datouxiu, xiaotouxiu, jiazis, jiazi_seq
 
 def get_hou(d, xiazhi, dongzhi):
     cal_day = sxtwl.fromSolar(d.year, d.month, d.day)
@@ -49,7 +49,7 @@ def get_hou(d, xiazhi, dongzhi):
         print(item + zhi_time[item], end='')
     
     
-    day_ganzhi = gans[2] + zhis[2]
+    day_ganzhi = jiazis[jiazi_seq(dTG.tg, dTG.dz)]
     
     if day_ganzhi == year_hous[zhis[0]]:
         print(" 年猴:{}年{}日".format(zhis[0], day_ganzhi), end=' ')
@@ -84,9 +84,9 @@ def get_hou(d, xiazhi, dongzhi):
     elif zhis.day == zhi_atts[zhis.month]["冲"]:
         zeri += "\t月破，大事不宜" 
     #print(gans.day + zhis.day)
-    if gans.day + zhis.day in datouxiu:
+    if day_ganzhi in datouxiu:
         zeri += "\t大偷休" 
-    elif gans.day + zhis.day in xiaotouxiu:
+    elif day_ganzhi in xiaotouxiu:
             zeri += "\t小偷休"    
     print(zeri)
 
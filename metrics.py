@@ -0,0 +1,111 @@
+# Métriques au format texte Prometheus, sans dépendance externe
+#
+# Compteurs et histogrammes protégés par un verrou ; les valeurs lues au moment
+# de la collecte (caches, RSS, requêtes en cours) sont fournies par des
+# fonctions enregistrées avec Registry.callback. Chaque worker gunicorn a ses
+# propres valeurs, /metrics renvoie celles du worker qui répond.
+import os
+import threading
+
+# Bornes des histogrammes de latence, en secondes
+LATENCE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(name, str(value).replace('\\', r'\\').replace('"', r'\"'))
+                          for name, value in zip(names, values)) + '}'
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        yield '# HELP {} {}'.format(self.name, self.help)
+        yield '# TYPE {} counter'.format(self.name)
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield '{}{} {}'.format(self.name, _labels(self.labels, labels), value)
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=LATENCE_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {} # labels -> [compte par borne..., somme, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def render(self):
+        yield '# HELP {} {}'.format(self.name, self.help)
+        yield '# TYPE {} histogram'.format(self.name)
+        with self._lock:
+            items = sorted((labels, list(counts)) for labels, counts in self._values.items())
+        for labels, counts in items:
+            for bound, count in zip(self.buckets + ('+Inf',), counts[:len(self.buckets)] + [counts[-1]]):
+                yield '{}_bucket{} {}'.format(self.name, _labels(self.labels + ('le',), labels + (bound,)), count)
+            yield '{}_sum{} {}'.format(self.name, _labels(self.labels, labels), counts[-2])
+            yield '{}_count{} {}'.format(self.name, _labels(self.labels, labels), counts[-1])
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._gauges = []
+
+    def counter(self, name, help, labels=()):
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labels=(), buckets=LATENCE_BUCKETS):
+        metric = Histogram(name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def callback(self, name, help, labels=(), type='gauge'):
+        """Décorateur : la fonction renvoie une liste de (valeurs des labels, valeur) à la collecte."""
+        def register(fn):
+            self._gauges.append((name, help, tuple(labels), type, fn))
+            return fn
+        return register
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, help, labels, type, fn in self._gauges:
+            lines.append('# HELP {} {}'.format(name, help))
+            lines.append('# TYPE {} {}'.format(name, type))
+            for values, value in fn():
+                lines.append('{}{} {}'.format(name, _labels(labels, values), value))
+        return '\n'.join(lines) + '\n'
+
+
+def rss_bytes():
+    """Mémoire résidente du processus (Linux : /proc/self/statm ; sinon maximum via getrusage)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
@@ -0,0 +1,1662 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 断语规则：bazi.py中"条件 -> 输出断语"的判断以数据表示。
+# 每条规则有编号、所在段落(block)、索引键、条件和断语。编号为手写的简称，发布后不再更改；
+# 条件test以Facts为参数，见chart_facts；逐柱的段落另有柱序号参数，见pillar_filters。
+# 断语text为字符串，或以Facts为参数、返回字符串的函数(断语中带有命盘数据时)。
+# 索引键me/ge/month/female为日主、格局、月支、男女的可选值，tou为须透干的十神之一，None表示不限，
+# 按索引键先筛出候选规则，只对候选规则求值。
+
+import collections
+import functools
+
+from datas import *
+from common import *
+
+Rule = collections.namedtuple("Rule", "id block me ge month female tou test text", 
+                              defaults=(None, None, None, None, None, None, ''))
+
+rules = (
+    Rule('缺四生', 0,
+         test=lambda f: len(set('寅申巳亥') & set(f.zhis)) == 0,
+         text='缺四生：一生不敢作为\n'),
+    Rule('缺四正', 0,
+         test=lambda f: len(set('子午卯酉') & set(f.zhis)) == 0,
+         text='缺四柱地支缺四正，一生避是非\n'),
+    Rule('缺四库', 0,
+         test=lambda f: len(set('辰戌丑未') & set(f.zhis)) == 0,
+         text='四柱地支缺四库，一生没有潜伏性凶灾。\n'),
+    Rule('地上三奇', 0,
+         test=lambda f: ('甲', '戊', '庚') in (tuple(f.gans)[:3], tuple(f.gans)[1:]),
+         text='地上三奇：白天生有申佳，需身强四柱有贵人。\n'),
+    Rule('人间三奇', 0,
+         test=lambda f: ('辛', '壬', '癸') in (tuple(f.gans)[:3], tuple(f.gans)[1:]),
+         text='人间三奇，需身强四柱有贵人。\n'),
+    Rule('天上三奇', 0,
+         test=lambda f: ('乙', '丙', '丁') in (tuple(f.gans)[:3], tuple(f.gans)[1:]),
+         text='天上三奇：晚上生有亥佳，需身强四柱有贵人。\n'),
+    Rule('二重亡神', 0,
+         test=lambda f: f.zhi_shens2.count('亡神') > 1,
+         text='二重亡神，先丧母；\n'),
+    Rule('时坐空亡', 0,
+         test=lambda f: get_empty(f.zhus[2], f.zhis.time),
+         text='时坐空亡，子息少。 母法P24-41 母法P79-4：损破祖业，后另再成就。\n'),
+    Rule('胎绝过多', 0,
+         test=lambda f: f.zhis.count(f.me_jue) + f.zhis.count(f.me_tai) > 2,
+         text='胎绝超过3个：夭或穷。母法P24-44 丁未 壬子 丙子 戊子\n'),
+    Rule('阴日主日时入比劫库', 0,
+         test=lambda f: not_yang(f.me) and zhi_ku(f.zhis[2], (f.me, f.jie)) and zhi_ku(f.zhis[3], (f.me, f.jie)),
+         text='阴日主时日支入比劫库：性格孤独，难发达。母法P28-112 甲申 辛未 辛丑 己丑 母法P55-11 为人孤独，且有灾疾\n'),
+    #print(cai_lu, piancai_lu)
+    Rule('日月时无财禄旺', 0,
+         test=lambda f: f.zhis[1:].count(f.piancai_lu) + f.zhis[1:].count(f.cai_lu) + f.zhis[1:].count(f.piancai_di) + f.zhis[1:].count(f.cai_di) == 0,
+         text='月日时支没有财或偏财的禄旺。\n'),
+    Rule('日月时无官禄旺', 0,
+         test=lambda f: f.zhis[1:].count(f.guan_lu) + f.zhis[1:].count(f.guan_di) == 0,
+         text='月日时支没有官的禄旺。\n'),
+    Rule('女命有辰无戌', 0, female=True,
+         test=lambda f: '辰' in f.zhis and '戌' not in f.zhis and f.female,
+         text='女命有辰无戌：孤。\n'),
+    Rule('女命有戌无辰', 0, female=True,
+         test=lambda f: '戌' in f.zhis and '辰' not in f.zhis and f.female,
+         text='女命有戌无辰：带禄。\n'),
+    Rule('四大空亡', 0,
+         test=lambda f: emptie4_table[f.jiazi_ids[2]] != 0 and f.scores[emptie4_table[f.jiazi_ids[2]]] == 0,
+         text='四大空亡：33岁以前身体不佳！\n'),
+    Rule('女命标题', 1, female=True,
+         test=lambda f: f.female,
+         text='#################### 女命\n'),
+    Rule('女命二逢驿马', 1, female=True,
+         test=lambda f: f.female and f.all_shens_list.count('驿马') > 1,
+         text='二逢驿马，母家荒凉。P110 丙申 丙申 甲寅 丁卯\n'),
+    Rule('女命年上伤官', 1, female=True, tou='伤',
+         test=lambda f: f.female and f.gan_shens[0] == '伤',
+         text='年上伤官：带疾生产。P110 戊寅 戊午 丁未 丁未\n'),
+    Rule('地网', 2,
+         test=lambda f: '辰' in f.zhis and '巳' in f.zhis,
+         text='地网：地支辰巳。天罗：戌亥。天罗地网全凶。\n'),
+    # 天罗
+    Rule('天罗', 2,
+         test=lambda f: '戌' in f.zhis and '亥' in f.zhis,
+         text='天罗：戌亥。地网：地支辰巳。天罗地网全凶。\n'),
+    # 魁罡格
+    Rule('魁罡格', 2,
+         test=lambda f: f.zhus[2] in (('庚', '辰'), ('庚', '戌'), ('壬', '辰'), ('戊', '戌')),
+         text='魁罡格：基础96，日主庚辰,庚戌,壬辰, 戊戌，重叠方有力。日主强，无刑冲佳。\n魁罡四柱曰多同，贵气朝来在此中，日主独逢冲克重，财官显露祸无穷。魁罡重叠是贵人，天元健旺喜临身，财官一见生灾祸，刑煞俱全定苦辛。\n'),
+    # 金神格
+    Rule('金神格', 2,
+         test=lambda f: f.zhus[3] in (('乙', '丑'), ('己', '巳'), ('癸', '酉')),
+         text='金神格：基础97，时柱乙丑、己巳、癸酉。只有甲和己日，甲日为主，甲子、甲辰最突出。月支通金火2局为佳命。不通可以选其他格\n'),
+    # 六阴朝阳
+    Rule('六阴朝阳', 2, me=('辛',),
+         test=lambda f: f.me == '辛' and f.zhis.time == '子',
+         text='六阴朝阳格：基础98，辛日时辰为子。\n'),
+    # 六乙鼠贵
+    Rule('六乙鼠贵', 2, me=('乙',),
+         test=lambda f: f.me == '乙' and f.zhis.time == '子',
+         text='六阴朝阳格：基础99，乙日时辰为子。忌讳午冲，丑合，不适合有2个子。月支最好通木局，水也可以，不适合金火。申酉大运有凶，午也不行。夏季为伤官。入其他格以格局论。\n'),
+    # 从格
+    Rule('五行过旺', 2,
+         test=lambda f: max(f.scores.values()) > 25,
+         text='有五行大于25分，需要考虑专格或者从格。\n从旺格：安居远害、退身避位、淡泊名利,基础94;从势格：日主无根。\n'),
+    Rule('日时干邻支合', 2,
+         test=lambda f: f.zhi_6he[3] and abs(f.gan_ids[3] - f.gan_ids[2]) == 1,
+         text='日时干邻支合：连珠得合：妻贤子佳，与事业无关。母法总则P21-11\n'),
+    Rule('财坐劫库', 3,
+         test=lambda f, seq: f.gan_shens[seq] in ('才', '财'),
+         text='财坐劫库，大破败。母法P61-4 戊寅 丙辰 壬辰 庚子\n'),
+    Rule('日时天比地冲', 4,
+         test=lambda f: f.zhi_6chong[3] and f.gans[3] == f.me,
+         text='日时天比地冲：女为家庭辛劳，男艺术宗教。 母法P61-5 己丑 丙寅 甲辰 甲戌\n'),
+    #print(zhi_6chong[3], gans, me)
+    Rule('日时天克地刑', 4,
+         test=lambda f: f.zhi_xing[3] and gan_ke(f.me, f.gans[3]),
+         text='日时天克地刑：破败祖业、自立发展、后无终局。 母法P61-7 己丑 丙寅 甲午 庚午\n'),
+    Rule('浮财坐印禄', 4,
+         test=lambda f: (f.cai, f.yin_lu) in f.zhus and f.cai not in f.zhi_shens2,
+         text='浮财坐印禄:破祖之后，自己也败。 母法P78-29 辛丑 丁酉 壬寅 庚子\n'),
+    Rule('阴日主天克地刑', 5,
+         test=lambda f, seq: f.zhi_xing[seq] and f.zhi_xing[seq + 1] and gan_ke(f.gans[seq], f.gans[seq + 1]),
+         text='阴日主天克地刑：孤独、双妻。 母法P61-7 己丑 丙寅 甲午 庚午\n'),
+    Rule('建禄格', 6,
+         test=lambda f: True,
+         text='建禄格：最好天干有财官。如果官杀不成格，有兄弟，且任性。有争财和理财的双重性格。如果创业独自搞比较好，如果合伙有完善的财务制度也可以。\n'),
+    Rule('建禄年透比劫', 6, tou='比劫',
+         test=lambda f: f.gan_shens[0] in '比劫',
+         text='\t建禄年透比劫凶\n'),
+    Rule('建禄财官双透', 6, tou='财',
+         test=lambda f: not (f.gan_shens[0] in '比劫') and '财' in f.gan_shens and '官' in f.gan_shens,
+         text='\t建禄财官双透，吉\n'),
+    Rule('建禄甲乙', 6, me=('甲', '乙'),
+         test=lambda f: f.me in ('甲', '乙'),
+         text='\t甲乙建禄四柱劫财多，无祖财，克妻，一生不聚财，做事虚诈，为人大模大样，不踏实。乙财官多可为吉。甲壬申时佳；乙辛巳时佳；\n'),
+    Rule('建禄丙', 6, me=('丙',),
+         test=lambda f: f.me in '丙',
+         text='\t丙：己亥时辰佳；\n'),
+    Rule('建禄丁', 6, me=('丁',),
+         test=lambda f: f.me in '丁',
+         text='\t丁：阴男克1妻，阳男克3妻。财官多可为吉。庚子时辰佳；\n'),
+    Rule('建禄戊', 6, me=('戊',),
+         test=lambda f: f.me in '戊',
+         text='\t戊：四柱无财克妻，无祖业，后代多事端。如合申子辰，子息晚，有2子。甲寅时辰佳；\n'),
+    Rule('建禄己', 6, me=('己',),
+         test=lambda f: f.me in '己',
+         text='\t己：即使官财出干成格，妻也晚。偏财、杀印成格为佳。乙丑时辰佳；\n'),
+    Rule('建禄庚', 6, me=('庚',),
+         test=lambda f: f.me in '庚',
+         text='\t庚：上半月生难有祖财，下半月较好，财格比官杀要好。丙戌时辰佳；\n'),
+    Rule('建禄辛', 6, me=('辛',),
+         test=lambda f: f.me in '辛',
+         text='\t辛：干透劫财，妻迟财少；丁酉时辰佳；\n'),
+    Rule('建禄壬', 6, me=('壬',),
+         test=lambda f: f.me in '壬',
+         text='\t 壬：戊申时辰佳；\n'),
+    Rule('建禄癸', 6, me=('癸',),
+         test=lambda f: f.me in '癸',
+         text='\t 癸：己亥时辰佳\n'),
+    Rule('甲日辰戌多', 7, me=('甲',),
+         test=lambda f: f.me == '甲' and (f.zhis.count('辰') > 1 or f.zhis.count('戌') > 1),
+         text='甲日：辰或戌多、性能急躁不能忍。\n'),
+    Rule('甲子日', 7, me=('甲',),
+         test=lambda f: f.me == '甲' and f.zhis[2] == '子',
+         text='甲子：调候要火。\n'),
+    Rule('甲寅日', 7, me=('甲',),
+         test=lambda f: f.me == '甲' and f.zhis[2] == '寅',
+         text='甲寅：有主见之人，需要财官旺支。\n'),
+    Rule('甲辰日', 7, me=('甲',),
+         test=lambda f: f.me == '甲' and f.zhis[2] == '辰',
+         text='甲辰：印库、性柔和而有实权。\n'),
+    Rule('甲午日', 7, me=('甲',),
+         test=lambda f: f.me == '甲' and f.zhis[2] == '午',
+         text='甲午：一生有财、调候要水。\n'),
+    Rule('甲戌日', 7, me=('甲',),
+         test=lambda f: f.me == '甲' and f.zhis[2] == '戌',
+         text='甲戌：自坐伤官，不易生财，为人仁善。\n'),
+    Rule('冬金子月重子', 7, me=('庚', '辛'), month=('子',),
+         test=lambda f: f.me in ('庚', '辛') and f.zhis[1] == '子' and (f.zhis.count('子') > 1),
+         text='冬金子月，再有一子字，孤克。 母法P28-106 甲戌 丙子 庚子 丁丑\n'),
+    Rule('比肩透干', 8,
+         test=lambda f: True,
+         text='比：同性相斥。讨厌自己。老是想之前有没有搞错。没有持久性，最多跟你三五年。 散财，月上比肩，做事没有定性，不看重钱，感情不持久。不怀疑人家，人心很好。善意好心惹麻烦。年上问题不大。\n'),
+    Rule('比肩年月并透', 8, tou='比',
+         test=lambda f: f.gan_shens[0] == '比' and f.gan_shens[1] == '比',
+         text='比肩年月天干并现：不是老大，出身平常。女仪容端庄，有自己的思想；不重视钱财,话多不能守秘。30随以前是非小人不断。\n'),
+    Rule('比肩月柱干支', 8, tou='比',
+         test=lambda f: f.gan_shens[1] == '比' and '比' in f.zhi_shen3[1],
+         text='月柱干支比肩：争夫感情丰富。30岁以前钱不够花。\n'),
+    Rule('比肩年干', 8, tou='比',
+         test=lambda f: f.gan_shens[0] == '比',
+         text='年干比：上面有哥或姐，出身一般。\n'),
+    Rule('比肩透坐比', 8,
+         test=lambda f: f.zhi_shens[2] == '比',
+         text='基52女坐比透比:夫妻互恨 丙辰 辛卯 辛酉 甲午。\n'),
+    Rule('天干二比', 8, tou='比',
+         test=lambda f: f.gan_shens.count('比') > 1,
+         text='----基51:天干2比\n        自我排斥，易后悔、举棋不定、匆促决定而有失；男倾向于群力，自己决策容易孤注一掷，小事谨慎，大事决定后不再重复考虑。\n        女有自己的思想、容貌佳，注意细节，喜欢小孩重过丈夫。轻视老公。对丈夫多疑心，容易吃醋冲动。\n        男不得女欢心.\n        难以保守秘密，不适合多言；\n        地支有根，一生小是非不断。没官杀制，无耐心。 END\n'),
+    # 比肩过多
+    #print(shens2, zhi_shens2)
+    Rule('比肩过多', 8,
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens,
+         text='----比肩过多基51：\n        女的爱子女超过丈夫；轻易否定丈夫。 换一种说法：有理想、自信、贪财、不惧内。男的双妻。\n        兄弟之间缺乏帮助。夫妻有时不太和谐。好友知交相处不会很久。\n        即使成好格局，也是劳累命，事必躬亲。除非有官杀制服。感情烦心。\n        基53：善意多言，引无畏之争；难以保守秘密，不适合多言；易犯无事忙的自我表现；不好意思拒绝他人;累积情绪而突然放弃。\n        比肩过多，女：你有帮夫运，多协助他的事业，多提意见，偶尔有争执，问题也不大。女：感情啰嗦\n        对人警惕性低，乐天知命;情感过程多有波折\n        \n'),
+    Rule('比肩多无官杀', 8,
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens and not '官' in f.shens and (not '杀' in f.shens),
+         text='基51: 比肩多，四柱无正官七杀，性情急躁。\n'),
+    Rule('比肩多比劫并透', 8, tou='劫',
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens and '劫' in f.gan_shens,
+         text='天干比劫并立，比肩地支专位，女命感情丰富，多遇争夫。基52\n'),
+    Rule('比肩多年干比', 8, tou='比',
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens and f.gan_shens[0] == '比',
+         text='年干为比，不是长子，父母缘较薄，晚婚。\n'),
+    Rule('比肩多时干比', 8, tou='比',
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens and f.gan_shens[3] == '比',
+         text='母法总则P21-6：时干为比，如日时地支冲，男的对妻子不利，女的为夫辛劳，九流艺术、宗教则关系不大。\n'),
+    Rule('比肩多月比坐食', 8, tou='比',
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens and f.gan_shens[1] == '比' and f.zhi_shens[1] == '食',
+         text='月柱比坐食，易得贵人相助。\n'),
+    Rule('比肩多月比坐伤', 8, tou='比',
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens and f.gan_shens[1] == '比' and f.zhi_shens[1] == '伤',
+         text='月柱比坐伤，一生只有小财气，难富贵。\n'),
+    Rule('比肩多月比坐比', 8, tou='比',
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens and f.gan_shens[1] == '比' and f.zhi_shens[1] == '比',
+         text='月柱比坐比，单亲家庭，一婚不能到头。地支三合或三会比，天干2比也如此。\n'),
+    Rule('比肩多月比坐财', 8, tou='比',
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens and f.gan_shens[1] == '比' and f.zhi_shens[1] == '财',
+         text='月柱比坐财，不利妻，也主父母身体不佳。因亲友、人情等招财物的无谓损失。\n'),
+    Rule('比肩多月比坐杀', 8, tou='比',
+         test=lambda f: f.shens2.count('比') > 2 and '比' in f.zhi_shens and f.gan_shens[1] == '比' and f.zhi_shens[1] == '杀',
+         text='月柱比坐杀，稳重。\n'),
+    Rule('比肩坐空亡', 9,
+         test=lambda f, seq: get_empty(f.zhus[2], f.zhis[seq]) == '空',
+         text='基51:比肩坐空亡，不利父亲与妻。年不利父，月不利父和妻，在时则没有关系。甲戌 丙寅 甲子 己巳\n\t基52女：夫妻缘分偏薄，在年只是不利父，在月30岁以前夫妻缘薄 E\n'),
+    Rule('比坐比', 9,
+         test=lambda f, seq: f.zhi_shens[seq] == '比',
+         text='比坐比-平吉：与官杀对立，无主权。养子：克偏财，泄正印。吉：为朋友尽力；凶：受兄弟朋友拖累。父缘分薄，自我孤僻，男多迟婚\n'),
+    Rule('比坐劫', 9,
+         test=lambda f, seq: f.zhi_shens[seq] == '劫',
+         text='女比肩坐劫:夫妻互恨，基52丁丑 壬子 壬戌 壬寅。\n\t还有刑冲且为羊刃，女恐有不测之灾：比如车祸、开刀和意外等。基52丙午 庚子 丙戌 丙申\n比坐劫-大凶：为忌亲友受损，合作事业中途解散，与妻子不合。如年月3见比，父缘薄或已死别。\n'),
+    Rule('比肩坐劫绝', 9,
+         test=lambda f, seq: f.zhi_shens[seq] == '劫' and ten_deities[f.gans[seq]][f.zhis[seq]] == '绝' and seq < 2,
+         text='比肩坐绝，兄弟不多，或者很难谋面。戊己和壬癸的准确率偏低些。\n'),
+    Rule('比肩坐财', 9,
+         test=lambda f, seq: f.zhi_shens[seq] == '财',
+         text='比肩坐财：因亲人、人情等原因引起无谓损失。\n'),
+    Rule('比肩坐杀', 9,
+         test=lambda f, seq: f.zhi_shens[seq] == '杀',
+         text='比肩坐杀:稳重。\n'),
+    Rule('比肩坐偏印', 9,
+         test=lambda f, seq: f.zhi_shens[seq] == '枭',
+         text='比肩坐偏印：三五年发达，后面守成。\n'),
+    Rule('比肩坐阳刃', 9,
+         test=lambda f, seq: f.zhi_shens[seq] == '劫' and f.gan_ids[2] % 2 == 0,
+         text='比肩坐阳刃：父亲先亡，基于在哪柱判断时间。基51：丙午 丙申 丙申 丁酉。E在年不利父，在其他有刀伤、车祸、意外灾害。\t基52女命年克父亲，月若30岁以前结婚不利婚姻\n'),
+    Rule('比劫并立坐比劫', 9, tou='劫',
+         test=lambda f, seq: f.zhi_shens[seq] in ('劫', '比') and '劫' in f.gan_shens,
+         text='天干比劫并立，比肩又坐比劫，女多遇争夫，个性强，不易协调。\n'),
+    Rule('比肩坐刑', 9,
+         test=lambda f, seq: f.zhi_xing[seq],
+         text='比肩坐刑(注意不是半刑)，幼年艰苦，白手自立长。 甲申 己巳 甲寅 庚午 基51\n'),
+    Rule('比肩坐刑劫', 9,
+         test=lambda f, seq: f.zhi_xing[seq] and f.zhi_shens[seq] == '劫',
+         text='比肩坐刑劫,兄弟不合、也可能与妻子分居。\n'),
+    Rule('比肩冲', 9,
+         test=lambda f, seq: f.zhi_6chong[seq],
+         text='比肩冲，手足不和，基于柱定时间 甲申 己巳 甲寅 庚午 基51。女命忌讳比劫和合官杀，多为任性引发困难之事。\n'),
+    Rule('日支比', 10,
+         test=lambda f: f.zhi_shens[2] == '比',
+         text='日支比：1-39对家务事有家长式领导；钱来得不容易且有时有小损财。e 自我，如有刑冲，不喜归家！\n'),
+    Rule('时支比', 10,
+         test=lambda f: f.zhi_shens[3] == '比',
+         text='时支比：子女为人公正倔强、行动力强，能得资产。\n'),
+    Rule('月柱比', 10,
+         test=lambda f: '比' in (f.gan_shens[1], f.zhi_shens[1]),
+         text='月柱比：三十岁以前难有成就。冒进、不稳定。女友不持久、大男子主义。\n'),
+    Rule('时柱比', 10,
+         test=lambda f: '比' in (f.gan_shens[3], f.zhi_shens[3]),
+         text='时柱比：与亲人意见不合。\n'),
+    Rule('比劫过多', 10,
+         test=lambda f: f.shens.count('比') + f.shens.count('劫') > 1,
+         text='比劫大于2，男：感情阻碍、事业起伏不定。\n'),
+    # 日坐禄
+    Rule('双禄带比印', 10, tou='比劫',
+         test=lambda f: f.me_lu == f.zhis[2] and f.zhis.count(f.me_lu) > 1 and f.yin_lu in f.zhis and ('比' in f.gan_shens or '劫' in f.gan_shens),
+         text='双禄带比印（专旺）、孤克之命。比论孤，劫论凶。母法总则P20-3。比禄印劫不可合见四位\n'),
+    Rule('透比坐禄六合有印', 10, tou='比',
+         test=lambda f: f.me_lu == f.zhis[2] and f.zhi_6he[2] and '比' in f.gan_shens and f.yin_lu in f.zhis,
+         text='透比，坐禄六合，有印专旺：官非、残疾。六合近似劫财，如地支会印，法死。 母法总则P20-4\n'),
+    Rule('透比坐禄六合', 10, tou='比',
+         test=lambda f: f.me_lu == f.zhis[2] and f.zhi_6he[2] and '比' in f.gan_shens,
+         text='透比，坐禄六合，如地支会印，法死。 母法总则P20-4\n'),
+    Rule('日禄正财干合支刑', 10,
+         test=lambda f: f.me_lu == f.zhis[2] and (f.zhi_xing[3] and f.gan_he[3] and (f.gan_shens[3] == '财') or (f.zhi_xing[2] and f.gan_he[2] and f.zhi_xing[1] and f.gan_he[1] and (f.gan_shens[1] == '财'))),
+         text='日禄与正财干合支刑：克妻子，即便是吉命，也无天伦之乐。 母法总则P22-21\n'),
+    Rule('三禄', 10,
+         test=lambda f: f.zhis.count(f.me_lu) > 2,
+         text='禄有三，孤。 母法总则P23-36\n'),
+    Rule('时支日库透财', 10, tou='财才',
+         test=lambda f: f.zhis[3] == f.me_ku and ('财' in f.gan_shens or '才' in f.gan_shens),
+         text='时支日库，透财：清高、艺术九流。 母法总则P59-5 己未 辛未 丁巳 庚戌 P61-8 丁未 壬寅 癸卯 丙辰\n'),
+    Rule('时支日库坐偏财', 10,
+         test=lambda f: f.zhis[3] == f.me_ku and f.piancai_lu == f.zhis[2],
+         text='时支日库，坐偏财：吉祥近贵，但亲属淡薄。 母法总则P59-6 辛未 辛卯 丁酉 庚戌\n'),
+    # 时坐禄
+    Rule('时禄伤官格', 10, tou='伤',
+         test=lambda f: f.me_lu == f.zhis[3] and '伤' in f.gan_shens and '伤' in f.zhi_shens2,
+         text='时禄，伤官格，晚年吉。 母法总则P56-26 己未 丙寅 乙丑 己卯\n'),
+    Rule('杀坐时禄', 10, tou='杀',
+         test=lambda f: f.me_lu == f.zhis[3] and '杀' == f.gan_shens[3],
+         text='杀坐时禄：为人反复不定。 母法总则P56-28 己未 丙寅 乙丑 己卯\n'),
+    # 自坐劫库
+    Rule('坐劫库时杀格', 10, tou='杀',
+         test=lambda f: f.zhis[2] == f.me_ku and f.gan_shens[3] == '杀' and '杀' in f.zhi_shen3[3],
+         text='自坐劫库,时杀格，贵！母法总则P30-143 辛未 辛卯 壬辰 戊申 母法总则P55-14 P60-22\n'),
+    Rule('坐劫库时官格', 10, tou='官',
+         test=lambda f: f.zhis[2] == f.me_ku and f.gan_shens[3] == '官' and '官' in f.zhi_shen3[3],
+         text='自坐劫库,正官格，孤贵！母法总则P56-24 辛未 辛卯 壬辰 戊申 母法总则P55-14\n'),
+    Rule('坐劫库时财库', 10,
+         test=lambda f: f.zhis[2] == f.me_ku and zhi_ku(f.zhis[3], (f.cai, f.piancai)),
+         text='自坐劫库,时财库，另有刃禄孤刑艺术，无者辛劳！母法总则P30-149 母法总则P56-17 56-18\n'),
+    Rule('坐劫库时财格', 10, tou='财',
+         test=lambda f: f.zhis[2] == f.me_ku and f.gan_shens[3] == '财' and '财' in f.zhi_shen3[3],
+         text='自坐劫库，时正财格，双妻，丧妻。 母法总则P55-13 己酉 戊寅 壬辰 丁未 P61-6 乙酉 戊寅 壬辰 丁未\n'),
+    Rule('坐劫库印禄', 10,
+         test=lambda f: f.zhis[2] == f.me_ku and (f.yin, f.me_lu) in f.zhus,
+         text='自坐劫库,即便吉，也会猝亡 母法总则P61-9 丁丑 甲辰 壬辰 辛亥\n'),
+    # 劫财分析
+    Rule('劫财透干', 10, tou='劫',
+         test=lambda f: '劫' in f.gan_shens,
+         text='劫财扶助，无微不至。劫财多者谦虚之中带有傲气。凡事先理情，而后情理。先细节后全局。性刚强、精明干练、女命不适合干透支藏。\n务实，不喜欢抽象性的空谈。不容易认错，比较倔。有理想，但是不够灵活。不怕闲言闲语干扰。不顾及别人面子。\n合作事业有始无终。太重细节。做小领导还是可以的。有志向，自信。杀或食透干可解所有负面。女命忌讳比劫和合官杀，多为任性引发困难之事。\n'),
+    Rule('劫财年月并透', 10, tou='劫',
+         test=lambda f: '劫' in f.gan_shens and f.gan_shens[0] == '劫' and f.gan_shens[1] == '劫',
+         text='劫年月天干并现：喜怒形于色，30岁以前大失败一次。过度自信，精明反被精明误。\n'),
+    Rule('劫财月柱干支', 10, tou='劫',
+         test=lambda f: '劫' in f.gan_shens and f.gan_shens[1] == '劫' and '劫' in f.zhi_shen3[1],
+         text='月柱干支劫：与父亲无缘，30岁以前任性，早婚防分手，自我精神压力极其重。\n'),
+    Rule('月干劫坐财禄印旺', 10, tou='劫',
+         test=lambda f: '劫' in f.gan_shens and f.gan_shens[1] == '劫' and f.zhis[1] == f.cai_lu and f.zhis.count(f.yin_lu) > 1,
+         text='月干劫：月支财禄，如地支2旺印，旺财不敌，官非、刑名意外。\n'),
+    Rule('劫财过多', 10, tou='劫',
+         test=lambda f: '劫' in f.gan_shens and f.shens2.count('劫') > 2,
+         text='----劫财过多, 婚姻不好\n'),
+    Rule('劫财透坐劫', 10, tou='劫',
+         test=lambda f: '劫' in f.gan_shens and f.zhi_shens[2] == '劫',
+         text='日坐劫财，透天干。在年父早亡，在月夫妻关系不好。比如财产互相防范；鄙视对方；自己决定，哪怕对方不同意；老夫少妻；身世有差距；斤斤计较；敢爱敢恨的后遗症\n\t以上多针对女。男的一般有双妻。天干有杀或食可解。基54丁未 己酉 丙午 己丑\n'),
+    Rule('日主专位劫财', 10,
+         test=lambda f: f.zhus[2] in (('壬', '子'), ('丙', '午'), ('戊', '午')),
+         text='日主专位劫财，壬子和丙午，晚婚。不透天干，一般是眼光高、独立性强。对配偶不利，互相轻视；若刑冲，做事立场不明遭嫉妒，但不会有大灾。女性婚后通常还有自己的事业,能办事。\n'),
+    Rule('劫伤同柱', 10,
+         test=lambda f: (('劫', '伤') in f.shen_zhus or ('伤', '劫') in f.shen_zhus),
+         text='同一柱中，劫财、阳刃伤官都有，外表华美，富屋穷人，婚姻不稳定，富而不久；年柱不利家长，月柱不利婚姻，时柱不利子女。伤官的狂妄。基55丙申 丁酉 甲子 丁卯\n'),
+    Rule('年干劫财', 10, tou='劫',
+         test=lambda f: f.gan_shens[0] == '劫',
+         text='年干劫财：家运不济。克父，如果坐劫财，通常少年失父；反之要看地支劫财根在哪一柱子。\n'),
+    Rule('月柱劫', 10,
+         test=lambda f: '劫' in (f.gan_shens[1], f.zhi_shens[1]),
+         text='月柱劫：容易孤注一掷，30岁以前难稳定。男早婚不利。\n'),
+    Rule('时柱劫', 10,
+         test=lambda f: '劫' in (f.gan_shens[3], f.zhi_shens[3]),
+         text='时柱劫：只要不是去经济大权还好。\n'),
+    Rule('日支劫', 10,
+         test=lambda f: f.zhi_shens[2] == '劫',
+         text='日支劫：男的克妻，一说是家庭有纠纷，对外尚无重大损失。如再透月或时天干，有严重内忧外患。\n'),
+    Rule('阴干比劫印全', 10,
+         test=lambda f: '劫' in f.shens2 and '比' in f.zhi_shens and ('印' in f.shens2) and not_yang(f.me),
+         text='阴干比劫印齐全，单身，可入道！\n'),
+    Rule('年阳刃', 10,
+         test=lambda f: f.zhi_shens[0] == '劫' and is_yang(f.me),
+         text='年阳刃：得不到长辈福；不知足、施恩反怨。\n'),
+    Rule('时阳刃', 10,
+         test=lambda f: f.zhi_shens[3] == '劫' and is_yang(f.me),
+         text='时阳刃：与妻子不和，晚无结果，四柱再有比刃，有疾病与外灾。\n'),
+    Rule('阳刃格', 11,
+         test=lambda f: True,
+         text='阳刃格：喜七杀或三四个官。基础90 甲戊庚逢冲多祸，壬丙逢冲还好。\n'),
+    Rule('阳刃格庚壬戊', 11, me=('戊', '庚', '壬'),
+         test=lambda f: f.me in ('庚', '壬', '戊'),
+         text="阳刃'庚', '壬','午'忌讳正财运。庚逢辛酉凶，丁酉吉，庚辰和丁酉六合不凶。壬逢壬子凶，戊子吉；壬午和戊子换禄不凶。\n"),
+    Rule('阳刃格甲丙', 11,
+         test=lambda f: not (f.me in ('庚', '壬', '戊')),
+         text="阳刃'甲', '丙',忌讳杀运，正财偏财财库运还好。甲：乙卯凶，辛卯吉；甲申与丁卯暗合吉。丙：丙午凶，壬午吉。丙子和壬午换禄不凶。\n"),
+    Rule('阳刃格月干劫印禄', 11, tou='劫',
+         test=lambda f: f.zhis.count(f.yin_lu) > 0 and f.gan_shens[1] == '劫',
+         text='阳刃格月干为劫：如果印禄位有2个，过旺，凶灾。不透劫财，有一印禄,食伤泄，仍然可以吉。 母法总则P20-1\n'),
+    Rule('阳刃格时偏印格', 11, tou='枭',
+         test=lambda f: f.gan_shens[3] == '枭' and '枭' in f.zhi_shen3[3],
+         text='阳刃格:时柱成偏印格，贫、夭、带疾。 母法总则P28-107 癸未 辛酉 庚寅 戊寅\n'),
+    Rule('双阳刃坐印', 12,
+         test=lambda f: f.zhi_shens.count('劫') > 1 and f.gan_ids[2] % 2 == 0 and f.zhis.day == f.yin_lu,
+         text='双阳刃，自坐印专位：刑妻、妨子。凶终、官非、意外灾害。母法总则P21-13\n'),
+    Rule('阳刃坐印透比劫', 12, tou='劫比',
+         test=lambda f: f.zhi_shens[1:].count('劫') > 0 and f.gan_ids[2] % 2 == 0 and f.zhis.day == f.yin_lu and ('劫' in f.gan_shens or '比' in f.gan_shens),
+         text='阳刃，自坐印专位，透比或劫：刑妻。母法总则P36-8 己酉 丁卯 甲子 乙亥\n'),
+    Rule('日时禄刃全', 12,
+         test=lambda f: f.zhis[2] in (f.me_lu, f.me_di) and f.zhis[3] in (f.me_lu, f.me_di),
+         text='日时禄刃全，如没有官杀制，刑伤父母，妨碍妻子。母法总则P30-151 丁酉 癸卯 壬子 辛亥 母法总则P31-153 \n'),
+    Rule('劫财坐财禄', 13,
+         test=lambda f, seq: f.zhis[seq] in (f.cai_lu, f.piancai_lu),
+         text='劫财坐财禄，如逢冲，大凶。先冲后合和稍缓解！母法总则P21-7 书上实例不准！\n'),
+    Rule('劫财坐六合财', 13,
+         test=lambda f, seq: f.zhis[seq] in (f.cai_lu, f.piancai_lu) and f.zhi_shens[seq] == '财' and f.zhi_6he[seq],
+         text='劫财坐六合财支：久疾暗病！母法总则P28-113 乙未 丙戌 辛亥 庚寅！\n'),
+    Rule('月干劫坐财禄二印禄', 14, tou='劫',
+         test=lambda f: f.gan_shens[1] == '劫' and f.zhis[1] in (f.cai_lu, f.piancai_lu) and (f.zhis.count(f.yin_lu) > 1) and ('劫' in f.gan_shens),
+         text='月干劫坐财禄，有2印禄，劫透，财旺也败：官非、刑名、意外灾害！  母法总则P20-2\n'),
+    # 自坐阳刃
+    Rule('坐阳刃时财禄', 14,
+         test=lambda f: '劫' in f.zhi_shen3[2] and is_yang(f.me) and (f.zhis[2] in zhengs) and f.zhis[3] in (f.cai_lu, f.piancai_lu),
+         text='坐阳刃,时支财禄，吉祥但是妻子性格不受管制！母法总则P30-137 丁未 庚戌 壬子 乙巳\n'),
+    Rule('坐阳刃时财库', 14,
+         test=lambda f: '劫' in f.zhi_shen3[2] and is_yang(f.me) and (f.zhis[2] in zhengs) and zhi_ku(f.zhis[3], (f.cai, f.piancai)),
+         text='坐阳刃,时支财库，名利时进时退！母法总则P30-148 丙寅 壬寅 壬子 庚戌\n'),
+    Rule('坐阳刃时杀格', 14, tou='杀',
+         test=lambda f: '劫' in f.zhi_shen3[2] and is_yang(f.me) and (f.zhis[2] in zhengs) and f.gan_shens[3] == '杀' and '杀' in f.zhi_shen3[3],
+         text='坐阳刃,时杀格，贵人提携而富贵！母法总则P30-143 甲戌 丙寅 壬子 戊申\n'),
+    Rule('偏印透干', 15,
+         test=lambda f: True,
+         text='----偏印在天干如成格：偏印在前，偏财(财次之)在后，有天月德就是佳命(偏印格在日时，不在月透天干也麻烦)。忌讳倒食，但是坐绝没有这能力。\n经典认为：偏印不能扶身，要身旺；偏印见官杀未必是福；喜伤官，喜财；忌日主无根；   女顾兄弟姐妹；男六亲似冰\n偏印格干支有冲、合、刑，地支是偏印的绝位也不佳。\n'),
+    Rule('枭月重叠', 15, tou='枭',
+         test=lambda f: f.gan_shens[1] == '枭' and '枭' in f.zhi_shen3[1],
+         text='枭月重叠：福薄慧多，青年孤独，有文艺宗教倾向。\n'),
+    Rule('偏印根透二柱', 15,
+         test=lambda f: f.zhi_shens2.count('枭') > 1,
+         text='偏印根透2柱，孤独有色情之患难。做事有始无终，女声誉不佳！pd40\n'),
+    Rule('偏印成格', 16,
+         test=lambda f: f.zhi_shens2.count('枭'),
+         text='偏印成格基础89生财、配印；最喜偏财同时成格，偏印在前，偏财在后。最忌讳日时坐实比劫刃。\n'),
+    Rule('偏印过多', 16,
+         test=lambda f: f.shens2.count('枭') > 2,
+         text='偏印过多，性格孤僻，表达太含蓄，要别人猜，说话有时带刺。偏悲观。有偏财和天月德贵人可以改善。有艺术天赋。做事大多有始无终。如四柱全阴，女性声誉不佳。\n对兄弟姐妹不错。男的因才干受子女尊敬。女的偏印多，子女不多。第1克伤食，第2艺术性。\n'),
+    Rule('偏印多伤官透', 16, tou='伤',
+         test=lambda f: f.shens2.count('枭') > 2 and '伤' in f.gan_shens,
+         text='女命偏印多，又与伤官同透，夫离子散。有偏财和天月德贵人可以改善。\n'),
+    Rule('天干二偏印', 16, tou='枭',
+         test=lambda f: f.gan_shens.count('枭') > 1,
+         text='天干两个偏印：迟婚，独身等，婚姻不好。三偏印，家族人口少，亲属不多建。基56甲午 甲戌 丙午 丙申\n'),
+    Rule('偏印在年干支', 16,
+         test=lambda f: f.shen_zhus[0] == ('枭', '枭'),
+         text='偏印在年，干支俱透，不利于长辈。偏母当令，正母无权，可能是领养，庶出、同父异母等。 基56乙卯 甲申 丁丑 丁未\n'),
+    Rule('月支专位偏印', 16,
+         test=lambda f: f.zhi_shen3[1] == ['枭'],
+         text='月专位偏印：有手艺。坐衰其貌不扬。\n'),
+    Rule('偏印坐绝', 17,
+         test=lambda f, seq: ten_deities[f.gans[seq]][f.zhis[seq]] == '绝',
+         text='偏印坐绝，或者天干坐偏印为绝，难以得志。费力不讨好。基56辛酉 辛卯 丁巳 甲辰  丁卯 丁未 己丑 丁卯\n'),
+    Rule('干支偏印', 17,
+         test=lambda f, seq: f.gan_shens[seq] == '枭' and '枭' in f.zhi_shen3[seq],
+         text='干支都与偏印，克夫福薄！\n'),
+    Rule('偏印坐比', 17,
+         test=lambda f, seq: f.gan_shens[seq] == '枭' and '比' in f.zhi_shen3[seq],
+         text='偏印坐比：劳心劳力，常遇阴折 pd41\n'),
+    Rule('偏印坐伤官', 17,
+         test=lambda f, seq: f.gan_shens[seq] == '枭' and f.zhi_shens[seq] == '伤',
+         text='偏印坐伤官：克夫丧子 pd41\n'),
+    Rule('偏印年干时支', 18, tou='枭',
+         test=lambda f: f.zhi_shens[3] == '枭' and f.gan_shens[0] == '枭',
+         text='偏印透年干-时支，一直受家里影响。\n'),
+    Rule('偏印在年', 18,
+         test=lambda f: '枭' in (f.gan_shens[0], f.zhi_shens[0]),
+         text='偏印在年：少有富贵家庭；有宗教素养，不喜享乐，第六感强。\n'),
+    Rule('偏印在月', 18,
+         test=lambda f: '枭' in (f.gan_shens[1], f.zhi_shens[1]),
+         text='偏印在月：有慧少福，能舍己为人。\n'),
+    Rule('偏印专位在月支', 18,
+         test=lambda f: '枭' in (f.gan_shens[1], f.zhi_shens[1]) and f.zhi_shens[1] == '枭' and f.zhis[1] in '子午卯酉',
+         text='偏印专位在月支：比较适合音乐，艺术，宗教等。子午卯酉。22-30之间职业定型。基56：壬午 癸卯 丁丑 丁未\n'),
+    Rule('偏印月柱干支专位', 18, tou='枭',
+         test=lambda f: '枭' in (f.gan_shens[1], f.zhi_shens[1]) and f.zhi_shens[1] == '枭' and f.zhis[1] in '子午卯酉' and f.gan_shens[1] == '枭',
+         text='干支偏印月柱，专位入格，有慧福浅，不争名利。基57:戊子 辛酉 癸未 丁巳\n'),
+    Rule('偏印在时', 18,
+         test=lambda f: '枭' in (f.gan_shens[3], f.zhi_shens[3]),
+         text='偏印在时：女与后代分居；男50以前奠定基础，晚年享清福。\n'),
+    Rule('偏印在日支', 18,
+         test=lambda f: (f.zhi_shens[2] == '枭' or f.zhis.day == f.xiao_lu),
+         text='偏印在日支：家庭生活沉闷\n'),
+    Rule('偏印在日支刑冲', 18,
+         test=lambda f: (f.zhi_shens[2] == '枭' or f.zhis.day == f.xiao_lu) and (f.zhi_6chong[2] or f.zhi_xing[2]),
+         text='偏印在日支(专位？),有冲刑：孤独。基57：甲午 癸酉 丁卯 丁未 母法总则P55-5： 辛丑 辛卯 癸酉 戊午 P77-13\n'),
+    Rule('日专坐偏印', 18,
+         test=lambda f: (f.zhi_shens[2] == '枭' or f.zhis.day == f.xiao_lu) and f.zhus[2] in (('丁', '卯'), ('癸', '酉')),
+         text='日专坐偏印：丁卯和癸酉。婚姻不顺。又刑冲，因性格而起争端而意外伤害。 基56\n'),
+    Rule('日坐偏印时绝', 18,
+         test=lambda f: (f.zhi_shens[2] == '枭' or f.zhis.day == f.xiao_lu) and f.zhis[3] == f.me_jue,
+         text='日坐偏印，日支绝：无亲人依靠，贫乏。 母法总则P55-5：丙辰 丙申 丁卯 壬子。pd41 专位偏印：男女姻缘都不佳。\n'),
+    Rule('日坐偏印成格时刃', 18, tou='枭',
+         test=lambda f: (f.zhi_shens[2] == '枭' or f.zhis.day == f.xiao_lu) and '枭' in f.gan_shens and is_yang(f.me) and (f.zhis.time == f.me_di),
+         text='日坐偏印成格，时支阳刃：不利妻子，自身有疾病。 母法总则P55-6：甲子 甲戌 丙寅 甲午\n'),
+    Rule('日坐偏印时干支劫', 18,
+         test=lambda f: (f.zhi_shens[2] == '枭' or f.zhis.day == f.xiao_lu) and f.gan_shens[3] == f.zhi_shens[3] == '劫',
+         text='日坐偏印，时干支劫：因自己性格而引灾。 母法总则P57-34：甲子 甲戌 丙寅 甲午\n'),
+    Rule('日坐偏印双阳刃', 18,
+         test=lambda f: (f.zhi_shens[2] == '枭' or f.zhis.day == f.xiao_lu) and f.zhis.count(f.me_di) > 1 and is_yang(f.me),
+         text='日坐偏印，地支双阳刃：性格有极端倾向。 母法总则P57-35：甲申 庚午 丙寅 甲午\n'),
+    Rule('时支偏印成格有财', 18, tou='枭',
+         test=lambda f: f.zhis.time == f.xiao_lu and f.zhi_shens[3] == '枭' and '枭' in f.gan_shens and ('财' in f.shens2 or '才' in f.shens2),
+         text='时支偏印成格有财：因机智引凶。 母法总则P60-18：甲申 乙亥 丁亥 癸卯\n'),
+    Rule('时支偏印成格无财', 18, tou='枭',
+         test=lambda f: f.zhis.time == f.xiao_lu and f.zhi_shens[3] == '枭' and '枭' in f.gan_shens and not ('财' in f.shens2 or '才' in f.shens2),
+         text='时支偏印成格无财：顽固引凶。 母法总则P60-17：甲子 乙亥 丁亥 癸卯\n'),
+    Rule('正印成格', 19,
+         test=lambda f: '印' in f.zhi_shens2,
+         text='基础82，成格喜官杀、身弱、忌财克印。合印留财，见利忘义.透财官杀通关或印生比劫；合冲印若无他格或调候破格。日主强凶，禄刃一支可以食伤泄。\n'),
+    Rule('印月重叠', 19, tou='印',
+         test=lambda f: f.gan_shens[1] == '印' and '印' in f.zhi_shen3[1],
+         text='印月重叠：女迟婚，月阳刃者离寡，能独立谋生，有修养的才女。\n'),
+    Rule('年干印', 19, tou='印',
+         test=lambda f: f.gan_shens[0] == '印',
+         text='年干印为喜：出身于富贵之家。\n'),
+    Rule('正印过多', 19,
+         test=lambda f: f.shens2.count('印') > 2,
+         text='正印多的：聪明有谋略，比较含蓄，不害人，识时务。正印不怕日主死绝，反而怕太强。日主强，正印多，孤寂，不善理财。 pd41男的克妻，子嗣少。女的克母。\n'),
+    Rule('正印坐死绝', 20,
+         test=lambda f, seq: ten_deities[f.gans[seq]][f.zhis[seq]] in ('绝', '死') and seq < 3,
+         text='正印坐死绝，或天干正印地支有冲刑，不利母亲。时柱不算。\n'),
+    Rule('正印坐正财', 20,
+         test=lambda f, seq: f.zhi_shens[seq] == '财',
+         text='男正印坐正财，夫妻不好。月柱正印坐正财专位，必离婚。在时柱，50多岁才有正常婚姻。(男) 基59 乙酉 己卯 庚子 丁亥  庚申 庚辰 庚午 己卯\n'),
+    Rule('正印坐正印', 20,
+         test=lambda f, seq: f.zhi_shens[seq] == '印',
+         text='正印坐正印，专位，过于自信。基59：戊辰 乙卯 丙申 丙申。务实，拿得起放得下。女的话大多晚婚。母长寿；女子息迟，头胎恐流产。女四柱没有官杀，没有良缘。男的搞艺术比较好，经商则孤僻，不聚财。\n'),
+    Rule('正印坐偏印专位', 20,
+         test=lambda f, seq: f.zhi_shens[seq] == '枭' and len(zhi5[f.zhis[seq]]) == 1,
+         text='正印坐偏印专位：基59壬寅 壬子 乙酉 甲申。有多种职业;家庭不吉：亲人有疾或者特别嗜好。子息迟;财务双关。明一套，暗一套。女的双重性格。\n'),
+    Rule('正印坐伤官', 20,
+         test=lambda f, seq: f.zhi_shens[seq] == '伤',
+         text='正印坐伤官：适合清高的职业。不适合追逐名利，女的婚姻不好。基59辛未 丁酉 戊子 丙辰\n'),
+    Rule('正印坐阳刃', 20, me=('甲', '庚', '壬'),
+         test=lambda f, seq: f.zhi_shens[seq] == '劫' and f.me in ('甲', '庚', '壬'),
+         text='正印坐阳刃，身心多伤，心疲力竭，偶有因公殉职。主要指月柱。工作看得比较重要。\n'),
+    Rule('正印七杀阳刃', 21, me=('甲', '庚', '壬'), tou='杀',
+         test=lambda f: '杀' in f.gan_shens and '劫' in f.zhi_shens and (f.me in ('甲', '庚', '壬')),
+         text='正印、七杀、阳刃全：基60癸巳 庚申 甲寅 丁卯：女命宗教人，否则独身，清高，身体恐有隐疾，性格狭隘缺耐心。男小疾多，纸上谈兵，婚姻不佳，恐非婚生子女，心思细腻对人要求也高。\n'),
+    Rule('印透官杀', 21, tou='官杀',
+         test=lambda f: ('官' in f.gan_shens or '杀' in f.gan_shens),
+         text='身弱官杀和印都透天干，格局佳。\n'),
+    Rule('印独透', 21,
+         test=lambda f: not ('官' in f.gan_shens or '杀' in f.gan_shens),
+         text='单独正印主秀气、艺术、文才。性格保守\n'),
+    Rule('印透官杀比', 21, tou='官杀比',
+         test=lambda f: ('官' in f.gan_shens or '杀' in f.gan_shens or '比' in f.gan_shens),
+         text='正印多者，有比肩在天干，不怕财。有官杀在天干也不怕。财不强也没关系。\n'),
+    Rule('印怕财', 21,
+         test=lambda f: not ('官' in f.gan_shens or '杀' in f.gan_shens or '比' in f.gan_shens),
+         text='正印怕财。\n'),
+    Rule('印财并透', 21, tou='财',
+         test=lambda f: '财' in f.gan_shens,
+         text='印和财都透天干，都有根，最好先财后印，一生吉祥。先印后财，能力不错，但多为他人奔波。(男)\n'),
+    Rule('月支印', 22,
+         test=lambda f: f.zhi_shens[1] == '印',
+         text='月支印：女命觉得丈夫不如自己，分居是常态，自己有能力。\n'),
+    Rule('月干支印', 22, tou='印',
+         test=lambda f: f.zhi_shens[1] == '印' and f.gan_shens[1] == '印',
+         text='月干支印：男权重于名，女命很自信，与夫平权。pd41:聪明有权谋，自我\n'),
+    Rule('月干支印透比', 22, tou='印',
+         test=lambda f: f.zhi_shens[1] == '印' and f.gan_shens[1] == '印' and '比' in f.gan_shens,
+         text='月干支印格，透比，有冲亡。\n'),
+    Rule('坐印时偏财格', 22, tou='才',
+         test=lambda f: f.zhi_shens[2] == '印' and f.gan_shens[3] == '才' and '才' in f.zhi_shen3[3],
+         text='坐印，时偏财格：他乡发迹，改弦易宗，妻贤子孝。 母法总则：P55-1 丁丑 丁未 甲子 戊辰\n'),
+    Rule('坐印时正财格', 22, tou='财',
+         test=lambda f: f.zhi_shens[2] == '印' and f.gan_shens[3] == '财' and ('财' in f.zhi_shen3[3] or f.zhis[3] in (f.cai_di, f.cai_lu)),
+         text='坐印，时财正格：晚年发达，妻贤子不孝。 母法总则：P55-2 乙酉 丙申 甲子 己巳\n'),
+    Rule('时支专位正印', 22,
+         test=lambda f: f.zhi_shens[3] == '印' and f.zhis[3] in zhengs,
+         text='时支专位正印。男忙碌到老。女的子女各居一方。亲情淡薄。\n'),
+    Rule('时柱正印格', 22, tou='印',
+         test=lambda f: f.gan_shens[3] == '印' and '印' in f.zhi_shen3[3],
+         text='时柱正印格，不论男女，老年辛苦。女的到死都要控制家产。子女无缘。\n'),
+    Rule('印枭二透', 22,
+         test=lambda f: f.gan_shens.count('印') + f.gan_shens.count('枭') > 1,
+         text='印枭在年干月干，性格迂腐，故作清高，女子息迟，婚姻有阻碍。印枭在时干，不利母子，性格不和谐。\n'),
+    Rule('印枭在月支', 22,
+         test=lambda f: f.zhis[1] in (f.yin_lu, f.xiao_lu),
+         text='印或枭在月支，有压制丈夫的心态。\n'),
+    Rule('印枭在时支', 22,
+         test=lambda f: f.zhis[3] in (f.yin_lu, f.xiao_lu),
+         text='印或枭在时支，夫灾子寡。\n'),
+    # 坐印库
+    Rule('坐印库印多', 22,
+         test=lambda f: zhi_ku(f.zhis[2], (f.yin, f.xiao)) and f.shens2.count('印') > 2,
+         text='母法总则P21-5: 日坐印库，又成印格，意外伤残，凶终。过旺。\n'),
+    Rule('坐印库时刃', 22,
+         test=lambda f: zhi_ku(f.zhis[2], (f.yin, f.xiao)) and f.zhi_shens[3] == '劫',
+         text='自坐印库，时阳刃。带比禄印者贫，不带吉。 母法总则P21-14\n'),
+    Rule('月干支印透比印旺', 22, tou='印',
+         test=lambda f: f.zhis.count('印') > 1 and f.gan_shens[1] == '印' and f.zhi_shens[1] == '印' and ('比' in f.gan_shens),
+         text='月干支印，印旺，透比，旺而不久，冲亡。母法总则P21-8\n'),
+    Rule('月支印禄成财格', 22,
+         test=lambda f: f.zhis[1] == f.yin_lu and ('财' in f.gan_shens and '财' in f.zhi_shens or ('才' in f.gan_shens and '才' in f.zhi_shens)),
+         text='母法总则P22-18 自坐正印专旺，成财格，移他乡易宗，妻贤子孝。\n'),
+    Rule('偏财透干', 23,
+         test=lambda f: True,
+         text='偏财明现天干，不论是否有根:财富外人可见;实际财力不及外观一半。没钱别人都不相信;协助他人常超过自己的能力\n偏财出天干，又与天月德贵人同一天干者。在年月有声明远扬的父亲，月时有聪慧的红颜知己。喜奉承。\n偏财透天干，四柱没有刑冲，长寿。女子为孝顺女，主要针对年月。时柱表示中年以后有自己的事业，善于理财。\n'),
+    Rule('偏财成格', 23,
+         test=lambda f: '才' in f.zhi_shens2,
+         text='财格基础80:比劫用食伤通关或官杀制；身弱有比劫仍然用食伤通关。如果时柱坐实比劫，晚年破产。\n'),
+    Rule('偏财透干原则', 23,
+         test=lambda f: True,
+         text='偏财透天干，讲究原则，不拘小节。喜奉承，善于享受。财格基础80\n'),
+    Rule('比劫时透偏财', 23,
+         test=lambda f: ('比' in f.gan_shens or ('劫' in f.gan_shens and f.gan_shens[3] == '才')),
+         text='年月比劫，时干透出偏财。祖业凋零，再白手起家。有刑冲为千金散尽还复来\n'),
+    Rule('偏财七杀并位', 23, tou='杀',
+         test=lambda f: '杀' in f.gan_shens and '杀' in f.zhi_shens,
+         text='偏财和七杀并位，地支又有根，父子外合心不合。因为偏财生杀攻身。偏财七杀在日时，则为有难伺候的女朋友。 基62壬午 甲辰 戊寅 癸亥\n'),
+    Rule('偏财根在年', 23,
+         test=lambda f: f.zhi_shens[0] == '才',
+         text='偏财根透年柱，家世良好，且能承受祖业。\n'),
+    Rule('偏财坐阳刃劫财', 24,
+         test=lambda f, seq: '劫' in f.zhi_shen3[seq] and f.zhis[seq] in zhengs,
+         text='偏财坐阳刃劫财,可做父缘薄，也可幼年家贫。也可以父先亡，要参考第一大运。偏财坐专位阳刃劫财,父亲去他乡.基61壬午 壬寅 戊子 丁巳\n'),
+    Rule('偏财坐空亡', 24,
+         test=lambda f, seq: get_empty(f.zhus[2], f.zhis[seq]) == '空',
+         text='偏财坐空亡，财官难求。\n'),
+    Rule('偏财过多', 25,
+         test=lambda f: f.shens2.count('才') > 2,
+         text='偏财多的人慷慨，得失看淡。花钱一般不会后悔。偏乐观，甚至是浮夸。生活习惯颠倒。适应能力强。有团队精神。得女性欢心。小事很少失信。\n乐善好施，有团队精神，女命偏财，听父亲的话。时柱偏财女，善于理财，中年以后有事业。\n'),
+    Rule('日时专位偏财', 25,
+         test=lambda f: (f.zhi_shens[2] == '才' and len(zhi5[f.zhis[2]]) == 1 or (f.zhi_shens[3] == '才' and len(zhi5[f.zhis[3]]) == 1)),
+         text='日时地支坐专位偏财。不见刑冲，时干不是比劫，大运也没有比劫刑冲，晚年发达。\n'),
+    # 财分析
+    Rule('财月重叠', 25,
+         test=lambda f: (f.gan_shens[0] in ('财', '才') and f.gan_shens[1] in ('财', '才') or (f.gan_shens[1] in ('财', '才') and ('财' in f.zhi_shen3[1] or '才' in f.zhi_shen3[1]))),
+         text='财或偏财月重叠：女职业妇女，有理财办事能力。因自己理财能力而影响婚姻。一财得所，红颜失配。男的双妻。\n'),
+    Rule('阳日合财', 26,
+         test=lambda f: is_yang(f.me),
+         text='男日主合财星，夫妻恩爱。如果争合或天干有劫财，双妻。\n'),
+    Rule('财格透财', 26,
+         test=lambda f: '财' in f.zhi_shens,
+         text='财格基础80:比劫用食伤通关或官杀制；身弱有比劫仍然用食伤通关。\n'),
+    Rule('正官正财并透', 26, tou='官',
+         test=lambda f: '官' in f.gan_shens,
+         text='正官正财并行透出，(身强)出身书香门第。\n'),
+    Rule('官杀财并透', 26, tou='官杀',
+         test=lambda f: ('官' in f.gan_shens or '杀' in f.gan_shens),
+         text='官或杀与财并行透出，女压夫，财生官杀，老公压力大。\n'),
+    Rule('年干正财', 26, tou='财',
+         test=lambda f: f.gan_shens[0] == '财',
+         text='年干正财若为喜，富裕家庭，但不利母亲。\n'),
+    Rule('财旺透官杀', 26, tou='官杀',
+         test=lambda f: '财' in f.zhi_shens and ('官' in f.gan_shens or '杀' in f.gan_shens),
+         text='男财旺透官杀，女厌夫。\n'),
+    Rule('天干二正财', 26, tou='财',
+         test=lambda f: f.gan_shens.count('财') > 1,
+         text='天干两正财，财源多，大多做好几种生意，好赶潮流，人云亦云。有时会做自己外行的生意。\n'),
+    Rule('正财多无根', 26, tou='财',
+         test=lambda f: f.gan_shens.count('财') > 1 and '财' not in f.zhi_shens2,
+         text='正财多而无根虚而不踏实。重财不富。\n'),
+    Rule('女柱有财驿马', 27,
+         test=lambda f, seq: f.zhis[seq] in day_shens['驿马'][f.zhis.day] and seq != 2,
+         text='女柱有财+驿马，动力持家。\n'),
+    Rule('女柱有财桃花', 27,
+         test=lambda f, seq: f.zhis[seq] in day_shens['桃花'][f.zhis.day] and seq != 2,
+         text='女柱有财+桃花，不吉利。\n'),
+    Rule('财坐空亡', 27,
+         test=lambda f, seq: get_empty(f.zhus[2], f.zhis[seq]) == '空',
+         text='财坐空亡，不持久。\n'),
+    Rule('财坐绝墓', 27,
+         test=lambda f, seq: ten_deities[f.gans[seq]][f.zhis[seq]] in ('绝', '墓'),
+         text='男财坐绝或墓，不利婚姻。\n'),
+    Rule('正财过多', 28,
+         test=lambda f: f.shens2.count('财') > 2,
+         text='正财多者，为人端正，有信用，简朴稳重。\n'),
+    Rule('正财多有根身弱', 28,
+         test=lambda f: f.shens2.count('财') > 2 and '财' in f.zhi_shens2 and f.me not in f.zhi_shens2,
+         text='正财多而有根，日主不在生旺库，身弱惧内。\n'),
+    Rule('女命月支正财', 28, female=True,
+         test=lambda f: f.zhi_shens[1] == '财' and f.female,
+         text='女命月支正财，有务实的婚姻观。\n'),
+    Rule('月令正财', 28,
+         test=lambda f: f.zhi_shens[1] == '财',
+         text='月令正财，无冲刑，有贤内助，但是母亲与妻子不和。生活简朴，多为理财人士。\n'),
+    Rule('时支专位正财', 28,
+         test=lambda f: f.zhi_shens[3] == '财' and len(zhi5[f.zhis[3]]) == 1,
+         text='时支正财，一般两个儿子。\n'),
+    Rule('戊子日时', 28,
+         test=lambda f: (f.zhus[2] in (('戊', '子'),) or f.zhus[3] in (('戊', '子'),)),
+         text='日支专位正财，得勤俭老婆。即戊子。日时专位支正财，又透正官，中年以后发达，独立富贵。\n'),
+    Rule('坐财官印', 28,
+         test=lambda f: f.zhus[2] in (('壬', '午'), ('癸', '巳')),
+         text='坐财官印，只要四柱没有刑冲，大吉！\n'),
+    Rule('甲戌乙亥日女命', 28,
+         test=lambda f: f.zhus[2] in (('甲', '戌'), ('乙', '亥')),
+         text="女('甲','戌'),('乙','亥'） 晚婚 -- 不准！\n"),
+    Rule('时柱正财', 28,
+         test=lambda f: ('财' == f.gan_shens[3] or '财' == f.zhi_shens[3]),
+         text='未必准确：时柱有正财，口快心直，不喜拖泥带水，刑冲则浮躁。阳刃也不佳.反之有美妻佳子\n'),
+    Rule('四柱无财', 28,
+         test=lambda f: not '财' in f.shens2 and (not '才' in f.shens2),
+         text='四柱无财，即便逢财运，也是虚名虚利. 男的晚婚\n'),
+    #print("shang", shang, ten_deities[shang].inverse['建'], zhi_shens)
+    #if ten_deities[shang].inverse['建'] in zhis:
+    #print("女命一财得所，红颜失配。")
+    Rule('坐财禄月时阳刃', 28,
+         test=lambda f: f.zhis.day in (f.cai_lu, f.cai_di) and (f.zhi_shens[1] == '劫' or f.zhi_shens[3] == '劫') and f.gan_ids[2] % 2 == 0,
+         text='自坐财禄，月支或时支为阳刃，凶。无冲是非多，冲刑主病灾。 母法总则P22-15  母法总则P36-4 丙寅 戊戌 甲午 丁卯 P56-32 己未 丙寅 丙申 甲午\n'),
+    Rule('坐财禄透劫有刃', 28, tou='劫',
+         test=lambda f: f.zhis.day in (f.cai_lu, f.cai_di) and '劫' in f.zhi_shens and f.gan_ids[2] % 2 == 0 and ('劫' in f.gan_shens),
+         text='自坐财禄，透劫财，有阳刃，刑妻无结局。 母法总则P36-7 戊子 乙卯 甲午 乙亥\n'),
+    Rule('甲乙坐财禄透土', 28, me=('甲', '乙'),
+         test=lambda f: f.zhis.day in (f.cai_lu, f.cai_di) and f.me in ('甲', '乙') and ('戊' in f.gans or '己' in f.gans),
+         text='火土代用财，如果透财，多成多败，早年灰心。 母法总则P22-19 辛未 癸巳 甲午 戊辰\n'),
+    Rule('坐财禄时干偏印', 28, tou='枭',
+         test=lambda f: f.zhis.day in (f.cai_lu, f.cai_di) and f.gan_shens[3] == '枭',
+         text='财禄时干偏印：主亲属孤独 母法总则P31-158 丁丑 丙午 甲辰 己巳\n'),
+    Rule('坐财禄时偏印格', 28, tou='枭',
+         test=lambda f: f.zhis.day in (f.cai_lu, f.cai_di) and f.gan_shens[3] == '枭' and '枭' in f.zhi_shen3[3],
+         text='财禄时干偏印格：财虽吉、人丁孤单、性格艺术化 母法总则P56-20 己巳 丙辰 甲午 壬申\n'),
+    Rule('坐财禄时印禄', 28,
+         test=lambda f: f.zhis.day in (f.cai_lu, f.cai_di) and f.zhis[3] == f.yin_lu,
+         text='坐财禄，时支印禄：先难后易 母法总则P30-147 甲申 己巳 壬午 己酉 母法总则P55-16\n'),
+    Rule('日主合财进角合', 28,
+         test=lambda f: (f.gan_he[3] and f.gan_shens[3] == '财' and jin_jiao(f.zhis[2], f.zhis[3]) or (f.gan_he[2] and f.gan_he[1] and (f.gan_shens[1] == '财') and jin_jiao(f.zhis[1], f.zhis[2]))),
+         text='日主合财且进角合：一生吉祥、平安有裕！ 母法总则P22-22 丁丑 丙午 甲辰 己巳\n'),
+    Rule('日坐财时偏印格', 28, tou='枭',
+         test=lambda f: (f.zhis.day == f.cai_lu or f.zhi_shens[2] == '财') and f.gan_shens[3] == '枭' and ('枭' in f.zhi_shen3[3] or f.zhis[3] == f.xiao_lu),
+         text='日坐财，时偏印格：他乡有成，为人敦厚。母法总则P55-4 甲寅 辛未 甲午 壬申\n'),
+    Rule('日坐财刑冲', 28,
+         test=lambda f: (f.zhis.day == f.cai_lu or f.zhi_shens[2] == '财') and (f.zhi_6chong[2] or f.zhi_xing[2]),
+         text='日坐财，有冲或刑：财吉而有疾。母法总则P55-10 丙寅 戊戌 甲午 甲子\n'),
+    Rule('时干正财坐日库', 28, tou='财',
+         test=lambda f: f.gan_shens[3] == '财' and zhi_ku(f.zhis[3], (f.me, f.jie)),
+         text='正财坐日库于时柱:孤独、难为父母，但事业有成。 母法总则P31-156 丁丑 丙午 甲辰 己巳\n'),
+    # 自坐财库
+    Rule('坐财库时劫库', 28,
+         test=lambda f: f.zhis[2] == f.cai_ku and f.zhis[3] == f.me_ku,
+         text='自坐财库,时劫库：有财而孤单。 母法总则P30-136 丁丑 丙午 甲辰 己巳 母法总则P55-11 P61-5 甲子 己巳 壬戌 甲辰\n'),
+    Rule('日时同坐财库', 28,
+         test=lambda f: f.zhis[2] == f.cai_ku and f.zhis[2] == f.zhis[3],
+         text='自坐财库,时坐财库：妻有灾，妻反被妾制服。 母法总则P30-150 辛酉 乙未 壬戌 庚戌 母法总则P56-19\n'),
+    Rule('坐财库时杀格', 28, tou='杀',
+         test=lambda f: f.zhis[2] == f.cai_ku and f.gan_shens[3] == '杀' and '杀' in f.zhi_shen3[3],
+         text='自坐财库,时杀格，财生杀，凶！母法总则P30-147 甲寅 己巳 壬戌 戊申 有可能是时柱有杀就算。 母法总则P55-15\n'),
+    # 时坐财库
+    Rule('时财库伤官生财', 28, tou='伤',
+         test=lambda f: zhi_ku(f.zhis[3], (f.cai, f.piancai)) and '伤' in f.gan_shens and '伤' in f.zhi_shens,
+         text='时坐财库,伤官生财:财好，体弱，旺处寿倾倒！母法总则P59-8 戊申 辛酉 戊子 丙辰\n'),
+    Rule('时上正财格', 28, tou='财',
+         test=lambda f: f.gan_shens[3] == '财' and '财' in f.zhi_shen3[3],
+         text='时上正财格:不必财旺，因妻致富。 母法总则P30-140 丙午 戊戌 壬寅 丁未 母法总则P60-21\n'),
+    Rule('时上正财格坐劫库', 28, tou='财',
+         test=lambda f: f.gan_shens[3] == '财' and '财' in f.zhi_shen3[3] and f.zhis[3] == f.me_ku,
+         text='时上正财格坐比劫库，克妻。 母法总则P30-141 丙午 戊戌 壬寅 丁未\n'),
+    Rule('时上正财格坐财库', 28, tou='财',
+         test=lambda f: f.gan_shens[3] == '财' and '财' in f.zhi_shen3[3] and f.zhis[2] == f.cai_ku,
+         text='时上正财格自坐财库，妻佳，中年丧妻，续弦也佳。 母法总则P30-142 庚子 辛巳 壬戌 丁未 P61-7\n'),
+    #print(cai_di, cai_lu, zhis, gan_he)
+    Rule('时财禄日时干合', 28,
+         test=lambda f: f.zhis[3] in (f.cai_di, f.cai_lu) and f.gan_he[3],
+         text='时财禄，天干日时双合，损妻家财。 母法总则P31-157 庚戌 戊寅 癸酉 戊午\n'),
+    Rule('时财禄时伤成格', 28, tou='伤',
+         test=lambda f: f.zhis[3] in (f.cai_di, f.cai_lu) and '伤' == f.gan_shens[3] and '伤' in f.zhi_shens2,
+         text='时支正财时干伤成格：虽富有也刑克。 母法总则P59-1 丁丑 壬寅 丁巳 戊申\n'),
+    #print(zhi_ku(zhis[1], (shi,shang)) , (shi,shang), zhis[3] == cai_lu)
+    Rule('时财禄月伤入墓', 28,
+         test=lambda f: f.zhis[3] in (f.cai_di, f.cai_lu) and zhi_ku(f.zhis[1], (f.shi, f.shang)) and f.zhis[3] == f.cai_lu,
+         text='时支正财禄，月支伤入墓：生财极为辛勤。 母法总则P59-4 甲子 戊辰 庚戌 己卯\n'),
+    # print(cai_di, cai_lu, zhis, gan_he)
+    Rule('时财禄刑冲', 28,
+         test=lambda f: f.zhis[3] == f.cai_lu and (f.zhi_xing[3] or f.zhi_6chong[3]),
+         text='时支正财禄有冲刑：得女伴且文学清贵。 母法总则P60-11 丁丑 辛亥 己巳 乙亥\n'),
+    Rule('时财禄它支刑冲', 28,
+         test=lambda f: f.zhis[3] == f.cai_lu and (any(f.zhi_xing[:3]) or any(f.zhi_6chong[:3])),
+         text='时支正财禄,它支有冲刑：刑妻、孤高、艺术、近贵人。 母法00总则P60-19 乙未 己丑 庚寅 己卯\n'),
+    Rule('时财禄天干财多', 28, tou='财',
+         test=lambda f: f.zhis[3] == f.cai_lu and f.gan_shens.count('财') > 1,
+         text='时支正财禄,天干财星多：孤雅、九流、表面风光。 母法总则P60-20 乙酉 乙酉 庚辰 己卯\n'),
+    Rule('正官成格', 29,
+         test=lambda f: True,
+         text='官若成格：忌伤；忌混杂；基础78。有伤用财通关或印制。混杂用合或者身官两停。日主弱则不可扶。\n'),
+    Rule('官格透比劫', 29, tou='比劫',
+         test=lambda f: ('比' in f.gan_shens or '劫' in f.gan_shens),
+         text='官格透比或劫：故做清高或有洁癖的文人。\n'),
+    Rule('官格透伤', 29, tou='伤',
+         test=lambda f: '伤' in f.gan_shens,
+         text='官格透伤：表里不一。\n'),
+    Rule('官格透财', 29, tou='财才',
+         test=lambda f: ('财' in f.gan_shens or '才' in f.gan_shens),
+         text='官格透财：聚财。\n'),
+    Rule('官格透印', 29, tou='印',
+         test=lambda f: '印' in f.gan_shens,
+         text='官格透印：人品清雅。\n'),
+    Rule('官格独透', 29,
+         test=lambda f: not ('印' in f.gan_shens or '财' in f.gan_shens or '才' in f.gan_shens),
+         text='官独透成格：敦厚人。\n'),
+    Rule('官月重叠', 30,
+         test=lambda f: (f.gan_shens[0] == '官' and f.gan_shens[1] == '官' or (f.gan_shens[1] == '官' and '官' in f.zhi_shen3[1])),
+         text='官月重叠：女易离婚，早婚不吉利。为人性格温和。\n'),
+    Rule('时官坐专位', 30, tou='官',
+         test=lambda f: f.gan_shens[3] == '官' and len(zhi5[f.zhis[3]]) == 1,
+         text='官专位时坐地支，男有得力子息。\n'),
+    Rule('年干官', 30, tou='官',
+         test=lambda f: f.gan_shens[0] == '官',
+         text='年干为官，身强有可能出身书香门第。\n'),
+    Rule('年时干官', 30, tou='官',
+         test=lambda f: f.gan_shens[0] == '官' and f.gan_shens[3] == '官',
+         text='男命年干，时干都为官，对后代和头胎不利。\n'),
+    Rule('官独透无财印', 30,
+         test=lambda f: not '财' in f.gan_shens and (not '印' in f.gan_shens),
+         text='官独透天干成格，四柱无财或印，为老实人。\n'),
+    Rule('官伤通根透', 30, tou='伤',
+         test=lambda f: '伤' in f.gan_shens,
+         text='正官伤官通根透，又无其他格局，失策。尤其是女命，异地分居居多，婚姻不美满。基64:辛未 丁酉 甲戌 辛未 \n'),
+    Rule('官杀并透', 30, tou='杀',
+         test=lambda f: '杀' in f.gan_shens,
+         text='年月干杀和偏官，30以前婚姻不稳定。月时多为体弱多病。\n'),
+    Rule('官印同根透', 30, tou='印',
+         test=lambda f: '印' in f.gan_shens and '印' in f.zhi_shens2 and ('官' in f.zhi_shens2),
+         text='官印同根透，无刑冲合，吉。\n'),
+    Rule('财官印同根透', 30, tou='印',
+         test=lambda f: '印' in f.gan_shens and '印' in f.zhi_shens2 and ('官' in f.zhi_shens2) and '财' in f.gan_shens and '财' in f.zhi_shens2,
+         text='财官印同根透，无刑冲合，吉。\n'),
+    Rule('月官坐墓绝', 30,
+         test=lambda f: f.gan_shens[1] == '官' in ten_deities[f.me][f.zhis[1]] in ('绝', '墓'),
+         text='官在月坐墓绝，不是特殊婚姻就是迟婚。如果与天月德同柱，依然不错。丈夫在库中：1，老夫少妻；2，不为外人所知的亲密感情；3，特殊又合法的婚姻。\n'),
+    Rule('月柱官坐官', 30, tou='官',
+         test=lambda f: f.zhi_shens[1] == '官' and f.gan_shens[1] == '官',
+         text='月柱正官坐正官，婚变。月柱不宜通。坐禄的。\n'),
+    Rule('正官坐比劫', 31,
+         test=lambda f, seq: f.zhi_shens[seq] in ('劫', '比'),
+         text='天干正官，地支比肩或劫财，亲友之间不适合合作，但是他适合经营烂摊子。\n'),
+    Rule('正官坐七杀', 31,
+         test=lambda f, seq: f.zhi_shens[seq] == '杀',
+         text='正官坐七杀，男命恐有诉讼之灾。女命婚姻不佳。月柱尤其麻烦，二度有感情纠纷。年不算，时从轻。 基64 壬子 壬子 丁丑 癸卯\n'),
+    Rule('官坐羊刃', 31,
+         test=lambda f, seq: f.zhi_shens[seq] == '劫' and f.gan_ids[2] % 2 == 0,
+         text='官坐羊刃：要杀才能制服阳刃，有力不从心之事情。 辛卯 丁酉 庚午 庚辰 基65\n'),
+    Rule('官坐印', 31,
+         test=lambda f, seq: f.zhi_shens[seq] == '印',
+         text='官坐印，无刑冲合，吉\n'),
+    Rule('正官过多', 32, tou='官',
+         test=lambda f: f.shens2.count('官') > 2 and '官' in f.gan_shens and ('官' in f.zhi_shens2),
+         text='正官多者，虚名。为人性格温和，比较实在。做七杀看\n'),
+    Rule('日坐正官', 32,
+         test=lambda f: (f.zhis.day == f.guan_lu or f.zhi_shens[2] == '官'),
+         text='日坐正官专位，淑女。 基65 庚申 癸未 丙子 乙未\n'),
+    Rule('日坐正官时刃', 32,
+         test=lambda f: (f.zhis.day == f.guan_lu or f.zhi_shens[2] == '官') and is_yang(f.me) and f.zhis.time == f.me_di,
+         text='日坐正官，时支阳刃：先富后败，再东山再起。 子平母法 P55-7\n'),
+    Rule('天干多官', 32, tou='官',
+         test=lambda f: f.gan_shens.count('官') > 2,
+         text='天干2官，女下有弟妹要照顾，一生为情所困。\n'),
+    Rule('月官伤官格', 32,
+         test=lambda f: f.zhi_shens[1] == '官' and '伤' in f.zhi_shens2,
+         text='月支正官，又成伤官格，难做真正夫妻。有实，无名。 基66辛丑 辛卯 戊子 辛酉\n'),
+    Rule('七杀透干', 33,
+         test=lambda f: True,
+         text='七杀是非多。但是对男人有时是贵格。比如毛主席等。成格基础85可杀生印或食制印、身杀两停、阳刃驾杀。\n'),
+    Rule('七杀成格', 34,
+         test=lambda f: True,
+         text='杀格：喜食神制，要食在前，杀在后。阳刃驾杀：杀在前，刃在后。身杀两停：比如甲寅日庚申月。杀印相生，忌食同成格。\n'),
+    Rule('杀格透比劫', 34, tou='比劫',
+         test=lambda f: ('比' in f.gan_shens or '劫' in f.gan_shens),
+         text='杀格透比或劫：性急但还有分寸。\n'),
+    Rule('杀格透官', 34, tou='杀',
+         test=lambda f: '杀' in f.gan_shens,
+         text='杀格透官：精明琐屑，不怕脏。\n'),
+    Rule('杀格透食伤', 34, tou='食伤',
+         test=lambda f: ('食' in f.gan_shens or '伤' in f.gan_shens),
+         text='杀格透食伤：外表宁静，内心刚毅。\n'),
+    Rule('杀格透印', 34, tou='印',
+         test=lambda f: '印' in f.gan_shens,
+         text='杀格透印：圆润、精明干练。\n'),
+    Rule('杀年月干并透', 35, tou='杀',
+         test=lambda f: f.gan_shens[0] == '杀' and f.gan_shens[1] == '杀',
+         text='杀月干年干重叠：不是老大，出身平常，多灾，为人不稳重。\n'),
+    Rule('杀月重叠', 35, tou='杀',
+         test=lambda f: f.gan_shens[1] == '杀' and '杀' in f.zhi_shen3[1],
+         text='杀月重叠：女易离婚，其他格一生多病。\n'),
+    Rule('年干七杀', 35, tou='杀',
+         test=lambda f: f.gan_shens[0] == '杀',
+         text='年干七杀，早年不好。或家里穷或身体不好。\n'),
+    Rule('年月干七杀', 35, tou='杀',
+         test=lambda f: f.gan_shens[0] == '杀' and f.gan_shens[1] == '杀',
+         text='年月天干七杀，家庭复杂。\n'),
+    Rule('官杀并见', 35, tou='官',
+         test=lambda f: '官' in f.gan_shens,
+         text='官和杀同见天干不佳。女在年干月干，30以前婚姻不佳，或体弱多病。基65 甲寅 乙亥 戊子 丙辰\n'),
+    Rule('月柱干支七杀', 35, tou='杀',
+         test=lambda f: f.gan_shens[1] == '杀' and f.zhi_shens[1] == '杀',
+         text='月柱都是七杀，克得太过。有福不会享。六亲福薄。时柱没关系。\n'),
+    Rule('月干杀无根', 35, tou='杀',
+         test=lambda f: f.gan_shens[1] == '杀' and f.zhi_shens[1] == '杀' and '杀' not in f.zhi_shens2,
+         text='七杀年月浮现天干，性格好变，不容易定下来。30岁以前不行。\n'),
+    Rule('七杀有根有刃', 35,
+         test=lambda f: '杀' in f.zhi_shens and '劫' in f.zhi_shens,
+         text='七杀地支有根时要有阳刃强为佳。杀身两停。\n'),
+    Rule('月时干七杀', 35, tou='杀',
+         test=lambda f: f.gan_shens[1] == '杀' and f.gan_shens[3] == '杀',
+         text='月时天干为七杀：体弱多病\n'),
+    Rule('年时干七杀', 35, tou='杀',
+         test=lambda f: f.gan_shens[0] == '杀' and f.gan_shens[3] == '杀',
+         text='七杀年干时干：男头胎麻烦（概率），女婚姻有阻碍。\n'),
+    Rule('时干七杀', 35, tou='杀',
+         test=lambda f: f.gan_shens[3] == '杀',
+         text='七杀在时干，固执有毅力。基67\n'),
+    Rule('杀印并透', 35, tou='印',
+         test=lambda f: '印' in f.gan_shens,
+         text='身弱杀生印，不少是精明练达的商人。\n'),
+    Rule('财生杀', 35, tou='财才',
+         test=lambda f: '财' in f.gan_shens or '才' in f.gan_shens,
+         text='财生杀，如果不是身弱有印，不佳。\n'),
+    Rule('杀财同根', 36,
+         test=lambda f, seq: set((ten_deities[f.me].inverse['杀'], ten_deities[f.me].inverse['财'])) in set(zhi5[f.zhis[seq]]),
+         text='杀不喜与财同根透出，这样杀的力量太强。\n'),
+    Rule('七杀坐七杀', 37,
+         test=lambda f, seq: f.gan_shens[seq] == '杀' and '杀' in f.zhi_shen3[seq] and seq != 3,
+         text='七杀坐七杀，六亲福薄。\n'),
+    Rule('七杀坐空亡', 37,
+         test=lambda f, seq: get_empty(f.zhus[2], f.zhis[seq]) == '空',
+         text='七杀坐空亡，女命夫缘薄。 基68 壬申 庚戌 甲子 丙寅\n'),
+    Rule('七杀坐食', 37,
+         test=lambda f, seq: f.zhis[seq] == '食',
+         text='七杀坐食：易有错误判断。\n'),
+    Rule('七杀坐刑冲', 37,
+         test=lambda f, seq: f.zhi_xing[seq] or f.zhi_6chong[seq],
+         text='七杀坐刑或对冲，夫妻不和。\n'),
+    Rule('七杀过多', 38,
+         test=lambda f: f.shens2.count('杀') > 2,
+         text='杀多者如果无制，性格刚强。打抱不平，不易听人劝。女的喜欢佩服的人。\n'),
+    Rule('日坐专位七杀', 38,
+         test=lambda f: f.zhi_shens[2] == '杀' and len(zhi5[f.zhis[2]]) == 1,
+         text='天元坐杀：乙酉，己卯，如无食神，阳刃，性急，聪明，对人不信任。如果七杀还透出月干无制，体弱多病，甚至夭折。如果在时干，晚年不好。\n'),
+    Rule('七杀坐桃花', 38,
+         test=lambda f: f.zhus[2] in (('丁', '卯'), ('丁', '亥'), ('丁', '未')) and f.zhis.time == '子',
+         text='七杀坐桃花，如有刑冲，引感情引祸。忌讳午运。\n'),
+    Rule('天干多杀', 38, tou='杀',
+         test=lambda f: f.gan_shens.count('杀') > 2,
+         text='天干2杀，不是老大、性格浮躁不持久。\n'),
+    Rule('女命地支杀禄', 38, female=True,
+         test=lambda f: ten_deities[f.shang].inverse['建'] in f.zhis and f.female,
+         text='女地支有杀的禄：丈夫条件还可以。对外性格急，对丈夫还算顺从。\n'),
+    Rule('自坐绝标题', 38,
+         test=lambda f: f.zhis[2] == f.me_jue,
+         text='########## 自坐绝\n'),
+    Rule('自坐绝六合', 38,
+         test=lambda f: f.zhis[2] == f.me_jue and f.zhi_6he[2],
+         text='自己坐绝（天元坐杀）：日支与它支合化、双妻，子息迟。母法总则P21-9 P56-30 d第10点暂未编码。\n'),
+    Rule('自坐绝支', 38,
+         test=lambda f: f.zhis[2] == f.me_jue,
+         text='自己坐绝支，绝支合会，先贫后富。母法总则P57-3 母法总则P23-33\n'),
+    Rule('日时绝', 38,
+         test=lambda f: f.zhis[2] == f.me_jue and f.zhis[3] == f.zhis[2],
+         text='日主日时绝，旺达则有刑灾。母法总则P57-2 母法总则P24-43 戊午 癸亥 乙酉 乙酉\n'),
+    Rule('月日时绝', 38,
+         test=lambda f: f.zhis[2] == f.me_jue and f.zhis[3] == f.zhis[2] == f.zhis[1],
+         text='日主月日时绝，旺达则有刑灾，平常人不要紧。母法总则P57-1\n'),
+    Rule('自坐绝比劫多', 38,
+         test=lambda f: f.zhis[2] == f.me_jue and f.zhi_shens.count('比') + f.zhi_shens.count('劫') > 1,
+         text='自坐绝，地支比劫大于1，旺衰巨变，凶：母法总则P22-16。 母法总则P36-5月支或时支都为阳刃，凶。\n'),
+    Rule('月日绝', 38,
+         test=lambda f: f.zhis[2] == f.me_jue and f.zhis[1] == f.me_jue,
+         text='日主月日绝，有格也疾病夭。母法总则P23-35\n'),
+    Rule('自坐绝时财禄', 38,
+         test=lambda f: f.zhis[2] == f.me_jue and f.zhis[3] == f.cai_lu,
+         text=' 母法总则P59-2  自坐绝，月支财禄:身弱财旺有衰困时，克妻子。书上例子不对\n'),
+    Rule('自坐绝时财帝旺', 38,
+         test=lambda f: f.zhis[2] == f.me_jue and f.zhis[3] == f.cai_di,
+         text=' 母法总则P59-3  自坐绝，月支偏财禄:有困顿时娶背景不佳妻。书上例子不对\n'),
+    Rule('时坐绝', 38,
+         test=lambda f: f.zhis[3] == f.me_jue,
+         text='########## 自己时坐绝: 母法总则P57-4: 若成伤官格，难求功名，适合艺术九流。\n'),
+    Rule('时坐绝日坐枭', 38,
+         test=lambda f: f.zhis[3] == f.me_jue and f.zhi_shens[2] == '枭',
+         text='母法总则P57-5: 自时支坐绝，自坐枭: 不是生意人，清贫艺术九流人士。\n'),
+    #print(zhi_shens, cai_di, cai_lu)
+    Rule('时坐绝月支财', 38,
+         test=lambda f: f.zhis[3] == f.me_jue and f.zhis[1] in (f.cai_di, f.cai_lu),
+         text=' 母法总则P57-6  自时支坐绝，月支坐财:先富，晚年大败，刑破。 癸未 庚申 丁巳 庚子\n'),
+    Rule('时坐绝月禄刃', 38,
+         test=lambda f: f.zhis[3] == f.me_jue and f.zhis[1] in (f.me_lu, f.me_di),
+         text=' 母法总则P28-114  自时支坐绝，月支帝:刑妻克子。 甲子 癸酉 辛丑 辛卯 -- 阴干也算阳刃？\n'),
+    Rule('时坐绝时财', 38,
+         test=lambda f: f.zhis[3] == f.me_jue and f.zhis[3] in (f.cai_di, f.cai_lu),
+         text=' 母法总则P57-8  自时支坐绝，时支财:中年发后无作为。 甲子 癸酉 辛丑 辛卯\n'),
+    Rule('坐杀禄时官杀库', 38,
+         test=lambda f: f.zhis[2] == f.sha_lu and zhi_ku(f.zhis[3], (f.guan, f.sha)),
+         text='自坐杀禄，时支为官杀库，一生有疾，生计平常。 母法总则P21-12 母法总则P55-8 甲子 丙寅 乙酉 己丑 P56-31\n'),
+    Rule('时杀禄刑冲', 38,
+         test=lambda f: f.zhis[3] == f.sha_lu and (f.zhi_xing[3] or f.zhi_6chong[3]),
+         text='时支杀禄带刑冲：纵然吉命也带疾不永寿。 母法总则P60-15 乙未 乙酉 戊申 甲寅\n'),
+    Rule('时杀坐财禄', 38, tou='杀',
+         test=lambda f: f.gan_shens[3] == '杀' and f.zhis[3] in (f.cai_di, f.cai_lu),
+         text='七杀时柱坐财禄旺：性格严肃。 母法总则P59-7 母法总则P79-3 双妻，子息迟。 \n'),
+    #print(sha_lu, zhi_6chong,zhi_xing )
+    Rule('时杀禄刑冲寿夭', 38,
+         test=lambda f: f.zhis[3] == f.sha_lu and (f.zhi_6chong[3] or f.zhi_xing[3]),
+         text='七杀时禄旺：遇刑冲寿夭带疾。 母法总则P28-118 冲别的柱也算？ 乙未 戊寅 辛丑 甲午 \n'),
+    Rule('时月杀禄', 38,
+         test=lambda f: f.zhis[3] == f.sha_lu and f.zhis[1] == f.sha_lu,
+         text='七杀时月禄旺：体疾。 母法总则P28-119 甲寅 庚午 辛丑 甲午  母法总则P60-16\n'),
+    #print(zhi_ku(zhis[2], (guan,sha)),set(zhis), set('辰戌丑未'))
+    Rule('坐官杀库四库全', 38,
+         test=lambda f: zhi_ku(f.zhis[2], (f.guan, f.sha)) and set(f.zhis).issubset(set('辰戌丑未')),
+         text='自坐七杀入墓：地支都为库，孤独艺术。 母法总则P57-33  丙辰 戊戌 乙丑 庚辰\n'),
+    Rule('杀透地支双根', 38, tou='杀',
+         test=lambda f: '杀' in f.gan_shens and f.zhi_shens.count('杀') > 1,
+         text='七杀透干，地支双根，不论贫富，亲属离散。母法总则P79-6 乙未 丙戌 戊寅 甲寅\n'),
+    Rule('杀局透比劫', 38, tou='比劫',
+         test=lambda f: '杀' in f.jus + f.all_ges and ('比' in f.gan_shens or '劫' in f.gan_shens),
+         text='杀格透比或劫：性急但还有分寸。\n'),
+    Rule('杀局透官', 38, tou='杀',
+         test=lambda f: '杀' in f.jus + f.all_ges and '杀' in f.gan_shens,
+         text='杀格透官：精明琐屑，不怕脏。\n'),
+    Rule('杀局透食伤', 38, tou='食伤',
+         test=lambda f: '杀' in f.jus + f.all_ges and ('食' in f.gan_shens or '伤' in f.gan_shens),
+         text='杀格透食伤：外表宁静，内心刚毅。\n'),
+    Rule('杀局透印', 38, tou='印',
+         test=lambda f: '杀' in f.jus + f.all_ges and '印' in f.gan_shens,
+         text='杀格透印：圆润、精明干练。\n'),
+    Rule('食神成格', 39,
+         test=lambda f: '食' in f.zhi_shens2,
+         text='食神成格的情况下，寿命比较好。食神和偏财格比较长寿。食神厚道，为人不慷慨。食神有口福。成格基础84，喜财忌偏印(只能偏财制)。\n食神无财一生衣食无忧，无大福。有印用比劫通关或财制。\n'),
+    Rule('食月重叠', 39,
+         test=lambda f: (f.gan_shens[0] == '食' and f.gan_shens[1] == '食' or (f.gan_shens[1] == '食' and '食' in f.zhi_shen3[1])),
+         text='食月重叠：生长安定环境，性格仁慈、无冲刑长寿。女早年得子。无冲刑偏印者是佳命。\n'),
+    Rule('食神见偏印', 39, tou='枭',
+         test=lambda f: '枭' in f.gan_shens,
+         text='男的食神碰到偏印，身体不好。怕偏印，正印要好一点。四柱透出偏财可解。\n'),
+    Rule('食劫枭并透', 39, tou='枭',
+         test=lambda f: '枭' in f.gan_shens and '劫' in f.gan_shens,
+         text='食神不宜与劫财、偏印齐出干。体弱多病。基69\n'),
+    Rule('食杀枭并透', 39, tou='枭',
+         test=lambda f: '枭' in f.gan_shens and '杀' in f.gan_shens,
+         text='食神不宜与杀、偏印齐成格。体弱多病。\n'),
+    Rule('食神透藏', 39,
+         test=lambda f: '食' in f.zhi_shens,
+         text='食神天透地藏，女命阳日主适合社会性职业，阴日主适合上班族。\n'),
+    Rule('食神无财', 39,
+         test=lambda f: not '财' in f.gan_shens and (not '才' in f.gan_shens),
+         text='食神多，要食伤生财才好，无财难发。\n'),
+    Rule('食伤并透', 39, tou='伤',
+         test=lambda f: '伤' in f.gan_shens,
+         text='食伤混杂：食神和伤官同透天干：志大才疏。\n'),
+    Rule('食神制杀', 39, tou='杀',
+         test=lambda f: '杀' in f.gan_shens,
+         text='食神制杀，杀不是主格，施舍后后悔。\n'),
+    Rule('食神坐阳刃', 40,
+         test=lambda f, seq: f.zhi_shens[seq] == '劫',
+         text='食神坐阳刃，辛劳。基69 戊申 戊午 丙子 丙申\n'),
+    Rule('食神过多', 41,
+         test=lambda f: f.shens2.count('食') > 2,
+         text='食神四个及以上的为多，做伤官处理。食神多，要食伤生财才好，无财难发。\n'),
+    Rule('食神多透比劫', 41, tou='劫比',
+         test=lambda f: f.shens2.count('食') > 2 and ('劫' in f.gan_shens or '比' in f.gan_shens),
+         text='食神带比劫，好施舍，乐于做社会服务。\n'),
+    Rule('食杀同柱', 41,
+         test=lambda f: (('杀', '食') in f.shen_zhus or ('食', '杀') in f.shen_zhus),
+         text='食神与七杀同一柱，易怒。食神制杀，最好食在前。有一定概率。基69辛未 丁酉 乙未 戊寅\n'),
+    Rule('食枭同柱', 41,
+         test=lambda f: (('枭', '食') in f.shen_zhus or ('食', '枭') in f.shen_zhus),
+         text='女命最怕食神偏印同一柱。不利后代，时柱尤其重要。基69庚午 己卯 丁未 丁未\n'),
+    Rule('日支专位食神', 41,
+         test=lambda f: '食' in f.zhi_shen3[2] and f.zhis[2] in zhengs,
+         text='日支食神专位容易发胖，有福。只有2日：癸卯，己酉。男命有有助之妻。\n'),
+    Rule('坐食时杀', 41,
+         test=lambda f: f.zhi_shens[2] == '食' and f.zhi_shens[2] == '杀',
+         text='自坐食神，时支杀专，二者不出天干，多成败，最后失局。\n'),
+    Rule('自坐食神', 41,
+         test=lambda f: f.zhi_shens[2] == '食',
+         text='自坐食神，相敬相助，即使透枭也无事，不过心思不定，做事毅力不足，也可能假客气。专位容易发胖，有福。\n'),
+    Rule('坐食时杀专', 41,
+         test=lambda f: f.zhis[2] == f.shi_lu and f.zhis[3] == f.sha_lu and f.sha not in f.gan_shens,
+         text='自坐食，时支专杀不透干：多成败，终局失制。母法总则P56-22 丙子 庚寅 己酉 丁卯\n'),
+    Rule('时支食神逢枭', 41,
+         test=lambda f: '食' in f.zhi_shen3[3] and '枭' in f.zhi_shen3[3] + f.gan_shens[3],
+         text='时支食神逢偏印：体弱，慢性病，女的一婚不到头。\n'),
+    Rule('自坐食伤库', 41,
+         test=lambda f: f.zhis[2] in kus and f.zhi_shen3[2][2] in ('食', '伤'),
+         text='自坐食伤库：总觉得钱不够。\n'),
+    Rule('年柱食', 41,
+         test=lambda f: '食' in (f.gan_shens[0], f.zhi_shens[0]),
+         text='年柱食：可三代同堂。\n'),
+    Rule('时食库月食令', 41,
+         test=lambda f: zhi_ku(f.zhis[3], (f.shi, f.shang)) and ('食' in f.zhi_shen3[1] or '伤' in f.zhi_shen3[1]),
+         text='时食库，月食当令，孤克。\n'),
+    # 自坐食伤库
+    Rule('坐食伤库时官', 41,
+         test=lambda f: zhi_ku(f.zhis[2], (f.shi, f.shang)) and f.zhis[3] == f.guan_lu,
+         text='坐食伤库：时支官，发达时接近寿终。 母法总则P60-13 乙丑 丙戌 庚辰 壬午\n'),
+    # 自坐食伤库
+    Rule('时食伤库月食伤令', 41,
+         test=lambda f: zhi_ku(f.zhis[3], (f.shi, f.shang)) and f.zhis[1] in (f.shi_di, f.shi_lu),
+         text='坐食伤库：月支食伤当令，吉命而孤克。 母法总则P60-14 甲戌 丙子 辛卯 壬辰\n'),
+    Rule('伤官透干', 42,
+         test=lambda f: True,
+         text='伤官有才华，但是清高。要生财，或者印制。\n'),
+    Rule('伤官成格', 42,
+         test=lambda f: '伤' in f.zhi_shens2,
+         text='食神重成伤官，不适合伤官配印。金水、土金、木火命造更高。火土要调候，容易火炎土燥。伤官和七杀的局不适合月支为库。\n伤官成格基础87生财、配印。不考虑调候逆用比顺用好，调候更重要。生正财用偏印，生偏财用正印。\n伤官配印，如果透杀，透财不佳。伤官七杀同时成格，不透财为上好命局。\n'),
+    Rule('伤月重叠', 42,
+         test=lambda f: (f.gan_shens[0] == '伤' and f.gan_shens[1] == '伤' or (f.gan_shens[1] == '伤' and '伤' in f.zhi_shen3[1])),
+         text='父母兄弟均无缘。孤苦，性刚毅好掌权。30岁以前有严重感情苦重，适合老夫少妻，继室先同居后结婚。\n'),
+    Rule('伤官配印', 42, tou='印',
+         test=lambda f: '印' in f.gan_shens and '财' not in f.gan_shens,
+         text='伤官配印，无财，有手艺，但是不善于理财。有一定个性\n'),
+    Rule('伤年月干浮透', 42, tou='伤',
+         test=lambda f: f.gan_shens[0] == '伤' and f.gan_shens[1] == '伤' and (not '伤' in f.zhi_shens2),
+         text='年月天干都浮现伤官，亲属少。\n'),
+    Rule('月柱伤坐专位伤', 42, tou='伤',
+         test=lambda f: f.zhi_shens[1] == '伤' and len(zhi5[f.zhis[1]]) == 1 and (f.gan_shens[1] == '伤'),
+         text='月柱：伤官坐专位伤官，夫缘不定。假夫妻。比如老板和小蜜。\n'),
+    Rule('伤官坐阳刃', 43,
+         test=lambda f, seq: f.zhi_shens[seq] == '劫',
+         text='伤官地支坐阳刃，力不从心 基70己酉 丁卯 甲午 辛未。背禄逐马，克官劫财。影响15年。伤官坐劫财：只适合纯粹之精明商人或严谨掌握财之人。\n'),
+    Rule('女命伤官多', 44, female=True,
+         test=lambda f: f.shens2.count('伤') > 2 and f.female,
+         text='女命伤官多，即使不入伤官格，也缘分浅，多有苦情。\n'),
+    Rule('天干多伤官', 44, tou='伤',
+         test=lambda f: f.shens2.count('伤') > 2 and f.gan_shens.count('伤') > 2,
+         text='天干2伤官：性骄，六亲不靠。婚前诉说家人，婚后埋怨老公。30岁以前为婚姻危机期。\n'),
+    Rule('日坐专位伤官', 44,
+         test=lambda f: f.zhi_shens[2] == '伤' and len(zhi5[f.zhis[2]]) == 1,
+         text='女命婚姻宫伤官：强势克夫。男的对妻子不利。只有庚子日。\n'),
+    Rule('伤官坐时禄', 44, tou='伤',
+         test=lambda f: f.gan_shens[3] == '伤' and f.me_lu == f.zhis[3],
+         text='伤官坐时禄：六亲不靠，无冲刑晚年发，有冲刑不发。 母法P27-96己未 壬申 己亥 庚午, 可以参三命。\n'),
+    Rule('月时食伤当令', 44,
+         test=lambda f: f.zhis[3] in (f.shang_lu, f.shang_di) and f.zhis[1] in (f.shang_lu, f.shang_di),
+         text='月支时支食伤当令：日主无根，泄尽日主，凶。 母法P28-104 甲午 乙亥 庚戌 丙子  母法P60-104\n'),
+    #print("shang", shang, ten_deities[shang].inverse['建'], zhi_shens)
+    Rule('女命地支伤官禄', 44, female=True,
+         test=lambda f: ten_deities[f.shang].inverse['建'] in f.zhis and f.female,
+         text='女命地支伤官禄：婚姻受不得穷。\n'),
+    Rule('建禄格详解', 45, ge=('建',),
+         test=lambda f: True,
+         text=lambda f: '{}\n{}\n{}\n{}\n\n'.format(jianlu_desc, '-' * 120, jianlus[(f.me, f.zhis.month)], '-' * 120)),
+    Rule('库中有财', 46,
+         test=lambda f, seq: nayins[f.zhus[seq]][-1] == ten_deities[f.me]['克'],
+         text='库中有财，其人必丰厚\n'),
+    Rule('绝处无依', 46,
+         test=lambda f, seq: nayins[f.zhus[seq]][-1] == ten_deities[f.me]['被克'],
+         text='绝处无依，其人必滞\n'),
+    Rule('食神格', 47, ge=('食',),
+         test=lambda f: True,
+         text='\n****食神分析****: 格要日主食神俱生旺，无冲破。有财辅助财有用。  食神可生偏财、克杀\n 阳日食神暗官星，阴日食神暗正印。食神格人聪明、乐观、优雅、多才多艺。食居先，煞居后，功名显达。\n======================================\n\n    喜:身旺 宜行财乡 逢食看财  忌:身弱 比 倒食(偏印)  一名进神\u3000\u3000二名爵星\u3000\u3000三名寿星\n    月令建禄最佳，时禄次之，更逢贵人运\n    \n'),
+    Rule('食神格食多', 47, ge=('食',),
+         test=lambda f: f.shi_num > 2,
+         text='食神过多:食神重见，变为伤官，令人少子，纵有，或带破拗性. 行印运 '),
+    Rule('食神格祖荫', 47, ge=('食',),
+         test=lambda f: set(('财', '食')) in set(f.gan_shens[:2] + f.zhi_shens[:2]),
+         text='祖父荫业丰隆 '),
+    Rule('食神格妻子获福', 47, ge=('食',),
+         test=lambda f: set(('财', '食')) in set(f.gan_shens[2:] + f.zhi_shens[2:]),
+         text='妻男获福，怕母子俱衰绝，两皆无成 '),
+    Rule('食神格财多', 47, ge=('食',),
+         test=lambda f: f.cai_num > 1,
+         text='财多则不清，富而已 '),
+    Rule('食神格食入墓', 48, ge=('食',),
+         test=lambda f, seq: ten_deities[f.gans[seq]][f.zhis[seq]] == '墓',
+         text='食入墓，即是伤官入墓，住寿难延。\n'),
+    Rule('食神格空亡', 49, ge=('食',),
+         test=lambda f, seq: get_empty(f.zhus[2], f.zhis[seq]),
+         text='大忌空亡，更有官煞显露，为太医师巫术数九流之士，若食神逢克，又遇空亡，则不贵，再行死绝或枭运，则因食上气上生灾，翻胃噎食，缺衣食，忍饥寒而已\n'),
+    Rule('倒食', 50, ge=('食',),
+         test=lambda f: f.daoshi,
+         text='倒食:凡命带倒食，福薄寿夭，若有制合没事，主要为地支为天干的杀;日支或者偏印的坐支为日主的建禄状态。偏印和日支的主要成分天干合\n凡命有食遇枭，犹尊长之制我，不得自由，作事进退悔懒，有始无终，财源屡成屡败，容貌欹斜，身品琐小，胆怯心虚，凡事无成，克害六亲，幼时克母，长大伤妻子\n身旺遇此方为福\n'),
+    Rule('食神格结束', 51, ge=('食',),
+         test=lambda f: True,
+         text='\n------------------------------------------------------------------------------------------------------------------------\n'),
+    Rule('伤官格', 52, ge=('伤',),
+         test=lambda f: True,
+         text='\n****伤官分析****: 喜:身旺,财星,印绶,伤尽 忌:身弱,无财,刑冲,入墓枭印\u3000\n 多材艺，傲物气高，心险无忌惮，多谋少遂，弄巧成拙，常以天下之人不如己，而人亦惮之、恶之。 一名剥官神\u3000\u3000二名羊刃煞\n 身旺用财，身弱用印。用印不忌讳官煞。用印者须去财方能发福\n官星隐显，伤之不尽，岁运再见官星，官来乘旺，再见刑冲破害，刃煞克身，身弱财旺，必主徒流死亡，五行有救，亦残疾。若四柱无官而遇伤煞重者，运入官乡，岁君又遇，若不目疾，必主灾破。\n娇贵伤不起、谨慎过头了略显胆小，节俭近于吝啬\n======================================\n'),
+    Rule('伤官生财', 52, ge=('伤',),
+         test=lambda f: ('财' in f.shens or '才' in f.shens),
+         text='伤官生财\n'),
+    Rule('伤官无财', 52, ge=('伤',),
+         test=lambda f: not ('财' in f.shens or '才' in f.shens),
+         text='伤官无财，主贫穷\n'),
+    Rule('伤官佩印', 52, ge=('伤',),
+         test=lambda f: ('印' in f.shens or '枭' in f.shens),
+         text='印能制伤，所以为贵，反要伤官旺，身稍弱，始为秀气;印旺极深，不必多见，偏正叠出，反为不秀，故伤轻身重而印绶多见，贫穷之格也。\n'),
+    Rule('伤官财印并见', 52, ge=('伤',),
+         test=lambda f: ('印' in f.shens or '枭' in f.shens) and ('财' in f.shens or '才' in f.shens),
+         text='财印相克，本不并用，只要干头两清而不相碍；又必生财者，财太旺而带印，佩印者印太重而带财，调停中和，遂为贵格\n'),
+    Rule('伤官格见官', 53, ge=('伤',),
+         test=lambda f: '官' in f.shens,
+         text=lambda f: '{}\n金水独宜，然要财印为辅，不可伤官并透。若冬金用官，而又化伤为财，则尤为极秀极贵。若孤官无辅，或官伤并透，则发福不大矣。\n'.format(shang_guans[ten_deities[f.me]['本']])),
+    Rule('伤官制煞', 53, ge=('伤',),
+         test=lambda f: '杀' in f.shens,
+         text='煞因伤而有制，两得其宜，只要无财，便为贵格\n'),
+    Rule('伤官年干', 53, ge=('伤',), tou='伤',
+         test=lambda f: f.gan_shens[0] == '伤',
+         text='年干伤官最重，谓之福基受伤，终身不可除去，若月支更有，甚于伤身七煞\n'),
+    Rule('伤官格伤官入墓', 54, ge=('伤',),
+         test=lambda f, seq: ten_deities[f.gans[seq]][f.zhis[seq]] == '墓',
+         text='食入墓，即是伤官入墓，住寿难延。\n'),
+    Rule('伤官格食神空亡', 55, ge=('伤',),
+         test=lambda f, seq: get_empty(f.zhus[2], f.zhis[seq]),
+         text='大忌空亡，更有官煞显露，为太医师巫术数九流之士，若食神逢克，又遇空亡，则不贵，再行死绝或枭运，则因食上气上生灾，翻胃噎食，缺衣食，忍饥寒而已\n'),
+    Rule('伤官格结束', 56, ge=('伤',),
+         test=lambda f: True,
+         text='\n------------------------------------------------------------------------------------------------------------------------\n'),
+    Rule('劫财格', 57, ge=('劫',),
+         test=lambda f: True,
+         text='\n****劫财(阳刃)分析****：阳刃冲合岁君,勃然祸至。身弱不作凶。\n======================================\n'),
+    Rule('劫财格时刃', 57, ge=('劫',),
+         test=lambda f: ('劫' == f.gan_shens[3] or '劫' == f.zhi_shens[3]),
+         text='劫财阳刃,切忌时逢,岁运并临,灾殃立至,独阳刃以时言,重于年月日也。\n'),
+    Rule('劫财格结束', 57, ge=('劫',),
+         test=lambda f: True,
+         text='------------------------------------------------------------------------------------------------------------------------\n'),
+    Rule('财格', 58, ge=('财', '才'),
+         test=lambda f: True,
+         text='\n****财分析 **** 喜:旺,印,食,官 忌:比 羊刃 空绝 冲合   财星,天马星,催官星,壮志神\n'),
+    Rule('财格财多透', 58, ge=('才', '财'),
+         test=lambda f: f.gan_shens.count('财') + f.gan_shens.count('才') > 1,
+         text='财喜根深，不宜太露，然透一位以清用，格所最喜，不为之露。即非月令用神，若寅透乙、卯透甲之类，一亦不为过，太多则露矣。\n财旺生官，露亦不忌，盖露不忌，盖露以防劫，生官则劫退，譬如府库钱粮，有官守护，即使露白，谁敢劫之？\n'),
+    Rule('财格透伤', 58, ge=('才', '财'), tou='伤',
+         test=lambda f: '伤' in f.gan_shens,
+         text='有伤官，财不能生官\n'),
+    Rule('财格见食', 58, ge=('才', '财'),
+         test=lambda f: '食' in f.shens,
+         text='有财用食生者，身强而不露官，略带一位比劫，益觉有情\n'),
+    Rule('财格印食', 58, ge=('才', '财'),
+         test=lambda f: '食' in f.shens and ('印' in f.shens or '枭' in 'shens'),
+         text='注意印食冲突\n'),
+    Rule('财格见比', 58, ge=('才', '财'),
+         test=lambda f: '比' in f.shens,
+         text='比不吉，但是伤官食神可化!\n'),
+    Rule('财格见杀', 58, ge=('才', '财'),
+         test=lambda f: '杀' in f.shens,
+         text='不论合煞制煞，运喜食伤身旺之方!\n'),
+    Rule('岁带正马', 58, ge=('才', '财'),
+         test=lambda f: '财' == f.zhi_shens[0],
+         text='岁带正马：月令有财或伤食，不犯刑冲分夺，旺祖业丰厚。同类月令且带比，或遇运行伤劫 贫\n'),
+    Rule('时带正马', 58, ge=('才', '财'),
+         test=lambda f: '财' == f.zhi_shens[3],
+         text='时带正马：无冲刑破劫，主招美妻，得外来财物，生子荣贵，财产丰厚，此非父母之财，乃身外之财，招来产业，宜俭不宜奢。\n'),
+    Rule('天元坐财', 58, ge=('才', '财'),
+         test=lambda f: '财' == f.zhi_shens[2] and f.me not in ('壬', '癸'),
+         text='天元坐财：喜印食 畏官煞，喜月令旺 \n'),
+    Rule('财旺生官', 58, ge=('才', '财'),
+         test=lambda f: '官' not in f.shens and '伤' not in f.shens and ('食' not in f.shens),
+         text='财旺生官:若月令财无损克，亦主登科\n'),
+    Rule('财多身弱', 58, ge=('才', '财'),
+         test=lambda f: f.cai_num > 2 and '劫' not in f.shens and ('比' not in f.shens) and ('比' not in f.shens) and ('印' not in f.shens),
+         text='财\u3000不重叠多见\u3000财多身弱，柱无印助; 若财多身弱，柱无印助不为福。\n'),
+    Rule('财格见印', 58, ge=('才', '财'),
+         test=lambda f: '印' in f.shens,
+         text='先财后印，反成其福，先印后财，反成其辱是也?\n'),
+    Rule('财格透官', 58, ge=('才', '财'), tou='官',
+         test=lambda f: '官' in f.gan_shens,
+         text='官星显露，别无伤损，或更食生印助日主健旺，富贵双全\n'),
+    Rule('财格明露', 58, ge=('才', '财'), tou='财',
+         test=lambda f: '财' in f.gan_shens and ('劫' not in f.shens and '比' not in f.shens),
+         text='财不宜明露\n'),
+    Rule('财星入墓', 59, ge=('财', '才'),
+         test=lambda f, seq: ten_deities[f.gans[seq]][f.zhis[seq]] == '墓',
+         text='财星入墓，必定刑妻\n'),
+    Rule('财遇长生', 59, ge=('财', '才'),
+         test=lambda f, seq: ten_deities[f.gans[seq]][f.zhis[seq]] == '长',
+         text='财遇长生，田园万顷\n'),
+    Rule('财格比劫无官', 60, ge=('才', '财'),
+         test=lambda f: '官' not in f.shens and ('劫' in f.shens or '比' in f.shens),
+         text='切忌有姊妹兄弟分夺，柱无官星，祸患百出。\n'),
+    Rule('财格兄弟辈出', 60, ge=('才', '财'),
+         test=lambda f: f.bi_num + f.jie_num > 1,
+         text='兄弟辈出: 纵入官乡，发福必渺.\n'),
+    Rule('财格偏财空亡', 61, ge=('财', '才'),
+         test=lambda f, seq: get_empty(f.zhus[2], f.zhis[seq]),
+         text='空亡 官将不成，财将不住\n'),
+    Rule('财格结束', 62, ge=('财', '才'),
+         test=lambda f: True,
+         text='------------------------------------------------------------------------------------------------------------------------\n'),
+    Rule('财临库墓', 63,
+         test=lambda f: ten_deities[ten_deities[f.me].inverse['财']]['库'][-1] in f.zhis,
+         text='财临库墓: 一生财帛丰厚，因财致官, 天干透土更佳\n'),
+    Rule('财少身强', 63,
+         test=lambda f: f.cai_num < 2 and ('劫' in f.shens or '比' in f.shens),
+         text='财少身强，柱有比劫，不为福\n'),
+    Rule('正官格', 64, ge=('官',),
+         test=lambda f: True,
+         text='\n**** 官分析 ****\n 喜:身旺 财印   忌：身弱 偏官 伤官 刑冲 泄气 贪合 入墓\n一曰正官 二曰禄神 最忌刑冲破害、伤官七煞，贪合忘官，劫财比等等，遇到这些情况便成为破格 财印并存要分开\n运：财旺印衰喜印，忌食伤生财；旺印财衰喜财，喜食伤生财；带伤食用印制；\n带煞伤食不碍。劫合煞财运可行，伤食可行，身旺，印绶亦可行；伤官合煞，则伤食与财俱可行，而不宜逢印\n======================================\n'),
+    Rule('官多变杀', 64, ge=('官',),
+         test=lambda f: f.guan_num > 1,
+         text='官多变杀，以干为准\n'),
+    Rule('官格财印扶持', 64, ge=('官',),
+         test=lambda f: '财' in f.shens and '印' in f.shens and ('伤' not in f.shens) and ('杀' not in f.shens),
+         text='官星通过天干显露出来，又得到财、印两方面的扶持，四柱中又没有伤煞，行运再引到官乡，是大富大贵的命。\n'),
+    Rule('官格财辅', 64, ge=('官',),
+         test=lambda f: ('财' in f.shens or '才' in f.shens),
+         text='有财辅助\n'),
+    Rule('官格印辅', 64, ge=('官',),
+         test=lambda f: ('印' in f.shens or '枭' in f.shens),
+         text='有印辅助\u3000正官带伤食而用印制，运喜官旺印旺之乡，财运切忌。若印绶叠出，财运亦无害矣。\n'),
+    Rule('官格见食', 64, ge=('官',),
+         test=lambda f: '食' in f.shens,
+         text='又曰凡论官星，略见一位食神坐实，便能损局，有杀则无妨。惟月令隐禄，见食却为三奇之贵。因为食神和官相合。\n'),
+    Rule('官格见伤', 64, ge=('官',),
+         test=lambda f: '伤' in f.shens,
+         text='伤官需要印或偏印来抑制，\u3000有杀也无妨\n'),
+    Rule('官格见杀', 64, ge=('官',),
+         test=lambda f: '杀' in f.shens,
+         text='伤官需要印或偏印来抑制。用劫合煞，则财运可行，伤食可行，身旺，印绶亦可行，只不过复露七煞。若命用伤官合煞，则伤食与财俱可行，而不宜逢印矣。\n'),
+    Rule('官格坐财印', 64, ge=('官',),
+         test=lambda f: f.zhi_shens[2] in ('财', '印'),
+         text='凡用官，日干自坐财印，终显\n'),
+    Rule('官格坐伤杀', 64, ge=('官',),
+         test=lambda f: f.zhi_shens[2] in ('伤', '杀'),
+         text='自坐伤、煞，终有节病\n'),
+    # 检查天福贵人
+    Rule('天福贵人', 64, ge=('官',),
+         test=lambda f: (f.guan, ten_deities[f.guan].inverse['建']) in f.zhus,
+         text='天福贵人:主科名巍峨，官职尊崇，多掌丝纶文翰之美!\n'),
+    Rule('天元作禄', 65, ge=('官',),
+         test=lambda f: f.guan in zhi5[f.zhis[2]],
+         text=lambda f: '天元作禄: 日主与官星并旺,才是贵命。大多不贵即富,即使是命局中有缺点,行到好的大运时,便能一发如雷。\n{}\n'.format(tianyuans[ten_deities[f.me]['本']])),
+    Rule('岁德正官', 65, ge=('官',),
+         test=lambda f: (f.gan_shens[0] == '官' or f.zhi_shens[0] == '官'),
+         text='岁德正官: 必生宦族,或荫袭祖父之职,若月居财官分野,运向财官旺地,日主健旺,贵无疑矣。凡年干遇官,福气最重,发达必早。\n'),
+    # 时上正官
+    Rule('时上正官', 65, ge=('官',),
+         test=lambda f: (f.gan_shens[0] == '官' or f.zhi_shens[0] == '官'),
+         text='时上正官: 正官有用不须多，多则伤身少则和，日旺再逢生印绶，定须平步擢高科。\n'),
+    Rule('正官格结束', 65, ge=('官',),
+         test=lambda f: True,
+         text='\n------------------------------------------------------------------------------------------------------------------------\n'),
+    Rule('官临库墓', 66,
+         test=lambda f: ten_deities[ten_deities[f.me].inverse['官']]['库'][-1] in f.zhis,
+         text='官临库墓\n'),
+    Rule('官印禄库', 66,
+         test=lambda f: ten_deities[ten_deities[f.me].inverse['官']]['库'][-1] in f.zhis and lu_ku_cai[f.me] in f.zhis,
+         text='官印禄库: 有官库，且库中有财\n'),
+    Rule('七杀格', 67, ge=('杀',),
+         test=lambda f: True,
+         text='\n杀(偏官)分析 **** 喜:身旺  印绶  合煞  食制 羊刃  比  逢煞看印及刃  以食为引   忌：身弱  财星  正官  刑冲  入墓\n一曰偏官 二曰七煞 三曰五鬼 四曰将星 五曰孤极星 原有制伏,煞出为福,原无制伏,煞出为祸   性情如虎，急躁如风,尤其是七杀为丙、丁火时。\n坐长生、临官、帝旺,更多带比同类相扶,则能化鬼为官,化煞为权,行运引至印乡,必发富贵。倘岁运再遇煞地,祸不旋踵。\n七杀喜酒色而偏争好斗、爱轩昂而扶弱欺强\n======================================\n'),
+    Rule('杀格看财', 67, ge=('杀',),
+         test=lambda f: '财' in f.shens,
+         text='逢煞看财,如身强煞弱,有财星则吉,身弱煞强,有财引鬼盗气,非贫则夭;\n'),
+    Rule('杀格见比', 67, ge=('杀',),
+         test=lambda f: '比' in f.shens,
+         text='如果比比自己弱，可以先挨杀。\n'),
+    Rule('杀格食制', 67, ge=('杀',),
+         test=lambda f: '食' in f.shens,
+         text='有食神透制,即《经》云:一见制伏,却为贵本\n'),
+    Rule('杀格食制财印', 67, ge=('杀',),
+         test=lambda f: '食' in f.shens and ('财' in f.shens or '印' in f.shens or '才' in f.shens or ('枭' in f.shens)),
+         text='煞用食制，不要露财透印，以财能转食生煞，而印能去食护煞也。然而财先食后，财生煞而食以制之，或印先食后，食太旺而印制，则格成大贵。\n'),
+    Rule('杀格阳刃', 67, ge=('杀',),
+         test=lambda f: '劫' in f.shens,
+         text='有阳刃配合,即《经》云:煞无刃不显,逢煞看刃是也。\n'),
+    Rule('杀格见印', 67, ge=('杀',),
+         test=lambda f: '印' in f.shens,
+         text='印: 则煞生印，印生身\n'),
+    Rule('七煞重逢', 67, ge=('杀',),
+         test=lambda f: f.sha_num > 1,
+         text='七煞重逢\n'),
+    Rule('弃命从煞', 67, ge=('杀',),
+         test=lambda f: f.sha_num > 1 and f.weak,
+         text='弃命从煞，须要会煞从财.四柱无一点比印绶方论，如遇运扶身旺，与煞为敌，从煞不专，故为祸患\n阴干从地支，煞纯者多贵，以阴柔能从物也。阳干从地支，煞纯者亦贵，但次于阴，以阳不受制也。\n水火金土皆从，惟阳木不能从，死木受斧斤，反遭其伤故也。\n古歌曰：五阳坐日全逢煞，弃命相从寿不坚，如是五阴逢此地，身衰煞旺吉堪言。\n'),
+    Rule('坐杀性急', 67, ge=('杀',),
+         test=lambda f: '杀' == f.zhi_shens[2],
+         text='为人心多性急，阴险怀毒，僭伪谋害，不近人情\n'),
+    Rule('时杀', 67, ge=('杀',),
+         test=lambda f: ('杀' == f.zhi_shens[3] or '杀' == f.gan_shens[3]),
+         text=' 时杀：月制干强，其煞反为权印。《经》云：时上偏官身要强，阳刃、冲刑煞敢当，制多要行煞旺运，煞多制少必为殃。\n 一位为妙，年、月、日重见，反主辛苦劳碌。若身旺，煞制太过，喜行煞旺运，或三合煞运，如无制伏，要行制伏运方发。但忌身弱，纵得运扶持发福，运过依旧不济。\n《独步》云：时上一位，贵藏在支中，是日，主要旺强名利，方有气。\n《古歌》云：时上偏官喜刃冲，身强制伏禄丰隆。正官若也来相混，身弱财多主困穷。\n时上偏官一位强，日辰自旺喜非常。有财有印多财禄，定是天生作栋梁。\n煞临子位，必招悖逆之儿。\n'),
+    Rule('年上七煞', 67, ge=('杀',),
+         test=lambda f: '杀' == f.zhi_shens[0],
+         text=' 年上七煞：出身寒微，命有贵子。\n岁煞一位不宜制，四柱重见却宜制，日主生旺，制伏略多，喜行煞旺地，制伏太过，或煞旺身衰，官煞混杂，岁运如之，碌碌之辈。若制伏不及，运至身衰煞旺乡，必生祸患。\n《独步》云：时上一位，贵藏在支中，是日，主要旺强名利，方有气。\n《古歌》云：时上偏官喜刃冲，身强制伏禄丰隆。正官若也来相混，身弱财多主困穷。\n时上偏官一位强，日辰自旺喜非常。有财有印多财禄，定是天生作栋梁。\n'),
+    Rule('官煞混杂', 67, ge=('杀',),
+         test=lambda f: '官' in f.shens,
+         text='官煞混杂：身弱多夭贫\n'),
+    Rule('七煞遇长生', 68, ge=('杀',),
+         test=lambda f, seq: ten_deities[f.gans[seq]][f.zhis[seq]] == '长',
+         text='七煞遇长生乙位，女招贵夫。\n'),
+    Rule('七杀格结束', 69, ge=('杀',),
+         test=lambda f: True,
+         text='\n------------------------------------------------------------------------------------------------------------------------\n'),
+    Rule('印格', 70, ge=('印',),
+         test=lambda f: f.ge == '印',
+         text='\n印分析 **** 喜:食神 天月德 七煞 逢印看煞 以官为引   忌： 刑冲 伤官 死墓 辰戊印怕木 丑未印不怕木\n一曰正印 二曰魁星 三曰孙极星\n以印绶多者为上,月最要,日时次之,年干虽重,须归禄月、日、时,方可取用,若年露印,月日时无,亦不济事。\n======================================\n'),
+    Rule('印格见官', 70, ge=('印',),
+         test=lambda f: f.ge == '印' and '官' in f.shens,
+         text='官能生印。身旺印强，不愁太过，只要官星清纯\n'),
+    Rule('印格见杀', 70, ge=('印',),
+         test=lambda f: f.ge == '印' and '杀' in f.shens,
+         text='喜七煞,但煞不可太多,多则伤身。原无七煞,行运遇之则发;原有七煞,行财运,或印绶死绝,或临墓地,皆凶。\n'),
+    Rule('印格见食伤', 70, ge=('印',),
+         test=lambda f: f.ge == '印' and ('伤' in f.shens or '食' in f.shens),
+         text='伤食：身强印旺，恐其太过，泄身以为秀气；若印浅身轻，而用层层伤食，则寒贫之局矣。\n'),
+    Rule('印格见财', 70, ge=('印',),
+         test=lambda f: f.ge == '印' and ('财' in f.shens or '才' in f.shens),
+         text='有印多而用财者，印重身强，透财以抑太过，权而用之，只要根深，无防财破。 若印轻财重，又无劫财以救，则为贪财破印，贫贱之局也。\n'),
+    Rule('印格印多', 70, ge=('印',),
+         test=lambda f: f.ge == '印' and f.yin_num > 1,
+         text='印绶复遇拱禄、专禄、归禄、鼠贵、夹贵、时贵等格,尤为奇特,但主少子或无子,印绶多者清孤。\n'),
+    Rule('印格见劫', 70, ge=('印',),
+         test=lambda f: f.ge == '印' and '劫' in f.shens,
+         text='化印为劫；弃之以就财官\n'),
+    Rule('印格结束', 70, ge=('印',),
+         test=lambda f: f.ge == '印',
+         text='\n------------------------------------------------------------------------------------------------------------------------\n'),
+    # 偏印分析
+    Rule('偏印格', 70, ge=('枭',),
+         test=lambda f: f.ge == '枭',
+         text='\n印分析 **** 喜:食神 天月德 七煞 逢印看煞 以官为引   忌： 刑冲 伤官 死墓 辰戊印怕木 丑未印不怕木\n一曰正印 二曰魁星 三曰孙极星\n以印绶多者为上,月最要,日时次之,年干虽重,须归禄月、日、时,方可取用,若年露印,月日时无,亦不济事。\n======================================\n'),
+    Rule('偏印格见官', 70, ge=('枭',),
+         test=lambda f: f.ge == '枭' and '官' in f.shens,
+         text='官能生印。身旺印强，不愁太过，只要官星清纯\n'),
+    Rule('偏印格见杀', 70, ge=('枭',),
+         test=lambda f: f.ge == '枭' and '杀' in f.shens,
+         text='喜七煞,但煞不可太多,多则伤身。原无七煞,行运遇之则发;原有七煞,行财运,或印绶死绝,或临墓地,皆凶。\n'),
+    Rule('偏印格见食伤', 70, ge=('枭',),
+         test=lambda f: f.ge == '枭' and ('伤' in f.shens or '食' in f.shens),
+         text='伤食：身强印旺，恐其太过，泄身以为秀气；若印浅身轻，而用层层伤食，则寒贫之局矣。\n'),
+    Rule('偏印格弃印就财', 70, ge=('枭',),
+         test=lambda f: f.ge == '枭' and ('财' in f.shens or '才' in f.shens),
+         text='弃印就财。\n'),
+    Rule('偏印格印多', 70, ge=('枭',),
+         test=lambda f: f.ge == '枭' and f.yin_num > 1,
+         text='印绶复遇拱禄、专禄、归禄、鼠贵、夹贵、时贵等格,尤为奇特,但主少子或无子,印绶多者清孤。\n'),
+    Rule('偏印格见劫', 70, ge=('枭',),
+         test=lambda f: f.ge == '枭' and '劫' in f.shens,
+         text='化印为劫；弃之以就财官\n'),
+    Rule('偏印格结束', 70, ge=('枭',),
+         test=lambda f: f.ge == '枭',
+         text='\n------------------------------------------------------------------------------------------------------------------------\n'),
+    Rule('羊刃', 71,
+         test=lambda f: True,
+         text=lambda f: '\n羊刃: {} {}\n======================参考：https://www.jianshu.com/p/c503f7b3ed04\n'.format(
+             f.me, ten_deities[f.me].inverse['帝' if f.gan_ids[2] % 2 == 0 else '冠'])),
+    Rule('羊刃见冠', 71,
+         test=lambda f: ten_deities[f.me].inverse['冠'],
+         text='羊刃重重又见禄，富贵饶金玉。 官、印相助福相资。\n'),
+    Rule('羊刃无冠', 71,
+         test=lambda f: not ten_deities[f.me].inverse['冠'],
+         text='劳累命！\n'),
+    Rule('将星', 72,
+         test=lambda f: f.jiangxings,
+         text='\n\n将星: 常欲吉星相扶，贵煞加临乃为吉庆。\n=========================\n理愚歌》云：将星若用亡神临，为国栋梁臣。言吉助之为贵，更夹贵库墓纯粹而\n    不杂者，出将入相之格也，带华盖、正印而不夹库，两府之格也；只带库墓而带正印，员郎\n    以上，既不带墓又不带正印，止有华盖，常调之禄也；带华印而正建驿马，名曰节印，主旌节\n    之贵；若岁干库同库为两重福，主大贵。\n'),
+    Rule('将星所在', 72,
+         test=lambda f: f.jiangxings,
+         text=lambda f: '{}\n'.format(f.jiangxings)),
+    Rule('华盖', 73,
+         test=lambda f: f.huagai,
+         text='\n\n华盖: 多主孤寡，总贵亦不免孤独，作僧道艺术论。\n=========================\n《理愚歌》云：华盖虽吉亦有妨，或为孽子或孤孀。填房入赘多阙口，炉钳顶笠拔缁黄。\n    又云：华盖星辰兄弟寡，天上孤高之宿也；生来若在时与胎，便是过房庶出者。\n'),
+    Rule('咸池', 74,
+         test=lambda f: f.taohuas,
+         text='\n\n咸池(桃花): 墙里桃花，煞在年月；墙外桃花，煞在日时；\n=========================\n一名败神，一名桃花煞，其神之奸邪淫鄙，如生旺则美容仪，耽酒色，疏财好欢，\n    破散家业，唯务贪淫；如死绝，落魄不检，言行狡诈，游荡赌博，忘恩失信，私滥奸淫，\n    靡所不为；与元辰并，更临生旺者，多得匪人为妻；与贵人建禄并，多因油盐酒货得生，\n    或因妇人暗昧之财起家，平生有水厄、痨瘵之疾，累遭遗失暗昧之灾。此人入命，有破无成，\n    非为吉兆，妇人尤忌之。\n    咸池非吉煞，日时与水命遇之尤凶。\n'),
+    Rule('咸池所在', 74,
+         test=lambda f: f.taohuas,
+         text=lambda f: '{} {}\n'.format(f.taohuas, f.zhis)),
+    Rule('文星贵人', 75,
+         test=lambda f: wenxing[f.me] in f.zhis,
+         text=lambda f: '文星贵人:  {} {}\n'.format(f.me, wenxing[f.me])),
+    Rule('天印贵人', 75,
+         test=lambda f: tianyin[f.me] in f.zhis,
+         text=lambda f: '天印贵人: 此号天印贵，荣达受皇封 {} {}\n'.format(f.me, tianyin[f.me])),
+    Rule('阳杀', 76,
+         test=lambda f: '杀' in f.shens and yinyang(f.me) == '+',
+         text='阳杀:话多,热情外向,异性缘好\n'),
+    Rule('阴杀', 76,
+         test=lambda f: '杀' in f.shens and not (yinyang(f.me) == '+'),
+         text='阴杀:话少,性格柔和\n'),
+    Rule('印才官三奇', 76,
+         test=lambda f: '印' in f.shens and '才' in f.shens and ('官' in f.shens),
+         text='印,偏财,官:三奇 怕正财\n'),
+    Rule('偏财七杀', 76,
+         test=lambda f: '才' in f.shens and '杀' in f.shens,
+         text='男:因女致祸、因色致祸; 女:赔货\n'),
+    Rule('偏印偏财', 76,
+         test=lambda f: '才' in f.shens and '枭' in f.shens,
+         text='偏印因偏财而不懒！\n'),
+)
+
+block_rules = collections.defaultdict(list)
+for rule in rules:
+    block_rules[rule.block].append(rule)
+rule_ids = {rule.id: rule for rule in rules}
+assert len(rule_ids) == len(rules), "规则编号重复"
+
+# 段落的前提，不满足时整段跳过；未列出的段落无前提
+block_gates = {
+    5: lambda f: not is_yang(f.me),
+    6: lambda f: f.zhi_shens[1] == '比',
+    8: lambda f: '比' in f.gan_shens,
+    9: lambda f: '比' in f.gan_shens,
+    11: lambda f: f.zhi_shens[1] == '劫' and is_yang(f.me),
+    15: lambda f: '枭' in f.gan_shens,
+    16: lambda f: '枭' in f.gan_shens,
+    19: lambda f: '印' in f.gan_shens,
+    20: lambda f: '印' in f.gan_shens,
+    21: lambda f: '印' in f.gan_shens,
+    23: lambda f: '才' in f.gan_shens,
+    24: lambda f: '才' in f.gan_shens,
+    26: lambda f: '财' in f.gan_shens,
+    29: lambda f: '官' in f.gan_shens and '官' in f.zhi_shens2,
+    30: lambda f: '官' in f.gan_shens,
+    31: lambda f: '官' in f.gan_shens,
+    33: lambda f: '杀' in f.gan_shens,
+    34: lambda f: '杀' in f.gan_shens and '杀' in f.zhi_shens2,
+    35: lambda f: '杀' in f.gan_shens,
+    36: lambda f: '杀' in f.gan_shens and ('财' in f.gan_shens or '才' in f.gan_shens),
+    39: lambda f: '食' in f.gan_shens,
+    40: lambda f: '食' in f.gan_shens,
+    42: lambda f: '伤' in f.gan_shens,
+    43: lambda f: '伤' in f.gan_shens,
+    45: lambda f: f.ge == '建',
+    46: lambda f: f.me_ku in f.zhis,
+    47: lambda f: f.ge == '食',
+    48: lambda f: f.ge == '食',
+    49: lambda f: f.ge == '食',
+    50: lambda f: f.ge == '食' and '枭' in f.shens and f.me not in ('庚', '辛', '壬'),
+    51: lambda f: f.ge == '食',
+    52: lambda f: f.ge == '伤',
+    53: lambda f: f.ge == '伤',
+    54: lambda f: f.ge == '伤',
+    55: lambda f: f.ge == '伤',
+    56: lambda f: f.ge == '伤',
+    57: lambda f: f.ge == '劫',
+    58: lambda f: f.ge in ('财', '才'),
+    59: lambda f: f.ge in ('财', '才'),
+    60: lambda f: f.ge in ('财', '才'),
+    61: lambda f: f.ge in ('财', '才'),
+    62: lambda f: f.ge in ('财', '才'),
+    64: lambda f: f.ge == '官',
+    65: lambda f: f.ge == '官',
+    67: lambda f: f.ge == '杀',
+    68: lambda f: f.ge == '杀',
+    69: lambda f: f.ge == '杀',
+    71: lambda f: ten_deities[f.me].inverse['帝' if f.gan_ids[2] % 2 == 0 else '冠'] in f.zhis,
+}
+
+# 逐柱的段落：依次对年月日时中满足筛选条件的柱求值段中规则，条件test以(Facts, 柱序号)为参数，
+# 同一条规则可在多柱触发
+pillar_filters = {
+    3: lambda f, seq: f.zhis[seq] == f.me_ku,
+    5: lambda f, seq: seq < 3,
+    9: lambda f, seq: f.gan_shens[seq] == '比',
+    13: lambda f, seq: f.gan_shens[seq] == '劫',
+    17: lambda f, seq: f.zhi_shens[seq] == '枭' or f.gan_shens[seq] == '枭',
+    20: lambda f, seq: f.gan_shens[seq] == '印',
+    24: lambda f, seq: True,
+    27: lambda f, seq: f.gan_shens[seq] == '财' or f.zhis[seq] == '财',
+    31: lambda f, seq: f.gan_shens[seq] == '官',
+    36: lambda f, seq: True,
+    37: lambda f, seq: f.gan_shens[seq] == '杀' or f.zhi_shens[seq] == '杀',
+    40: lambda f, seq: f.gan_shens[seq] == '食',
+    43: lambda f, seq: f.gan_shens[seq] == '伤',
+    46: lambda f, seq: f.me_ku == f.zhus[1],
+    48: lambda f, seq: f.gan_shens[seq] == '食',
+    49: lambda f, seq: f.gan_shens[seq] == '食' or f.zhi_shens[seq] == '食',
+    54: lambda f, seq: f.gan_shens[seq] == '伤',
+    55: lambda f, seq: f.gan_shens[seq] == '食' or f.zhi_shens[seq] == '食',
+    59: lambda f, seq: f.gan_shens[seq] == '财',
+    61: lambda f, seq: f.zhi_shens[seq] == '才' or ten_deities[f.me][f.zhis[seq]] == '才',
+    68: lambda f, seq: f.gan_shens[seq] == '杀',
+}
+
+Facts = collections.namedtuple("Facts", (
+    "gans zhis me zhus female gan_ids jiazi_ids gan_shens zhi_shens zhi_shens2 zhi_shen3 "
+    "shens shens2 shen_zhus scores weak zhi_6he zhi_6chong gan_he zhi_xing all_shens_list jus ge all_ges "
+    "me_lu me_jue me_tai me_di me_ku shang shang_lu shang_di yin yin_lu yin_ku xiao xiao_lu "
+    "cai cai_lu cai_di cai_ku piancai piancai_lu piancai_di guan guan_lu guan_di guan_ku "
+    "sha sha_lu sha_di jie shi shi_lu shi_di shi_ku "
+    "guan_num sha_num cai_num jie_num bi_num yin_num shi_num daoshi huagai jiangxings taohuas"))
+
+def chart_facts(chart):
+    """由排盘结果生成规则条件所用的Facts，需要已计算analysis段。"""
+    me_id = chart.gan_ids[2]
+    me_gans, me_zhis = shen_gans[me_id], stage_zhis[me_id]
+    lus, dis, kus = shen_lus[me_id], shen_dis[me_id], shen_kus[me_id]
+    gan = lambda shen: Gan[me_gans[shi_seqs[shen]]]
+    lu = lambda shen: Zhi[lus[shi_seqs[shen]]]
+    di = lambda shen: Zhi[dis[shi_seqs[shen]]]
+    ku = lambda shen: Zhi[kus[shi_seqs[shen]]]
+    gans, zhis, me = chart.gans, chart.zhis, chart.me
+    gan_shens, zhi_shens, zhi_shens2, shens = chart.gan_shens, chart.zhi_shens, chart.zhi_shens2, chart.shens
+
+    # 成格，顺序同print_chart的输出
+    all_ges = []
+    if zhi_shens[1] == '比':
+        all_ges.append('建')
+    if zhi_shens[1] == '劫' and is_yang(me):
+        all_ges.append('刃')
+    if '枭' in gan_shens and '枭' in zhi_shens2:
+        all_ges.append('枭')
+    for shen in ('印', '才', '财', '官', '杀', '食', '伤'):
+        if shen in gan_shens and shen in zhi_shens2:
+            all_ges.append(shen)
+
+    # 倒食：日支藏干无日主所合之干
+    daoshi = ten_deities[me]['合'] not in zhi5[zhis.day]
+    # 华盖：日支三合局的库见于其他地支
+    other_zhis = zhis[:2] + zhis[3:]
+    huagai = any(zhis.day in group and ku_ in other_zhis for group, ku_ in
+                 (("申子辰", "辰"), ("丑巳酉", "丑"), ("寅午戌", "戌"), ("亥卯未", "未")))
+    # 将星：日支三合局的中神见于其他地支
+    jiangxings = []
+    for group, zhi_ in (("申子辰", "子"), ("丑巳酉", "酉"), ("寅午戌", "午"), ("亥卯未", "卯")):
+        if zhis.day in group:
+            if zhi_ in other_zhis:
+                jiangxings.append((zhis.day, zhi_))
+            break
+    # 咸池：日支或年支三合局的桃花，酉见于四柱，其他见于日支以外
+    taohuas = []
+    for group, zhi_ in (("申子辰", "酉"), ("丑巳酉", "午"), ("寅午戌", "卯"), ("亥卯未", "子")):
+        if zhis.day in group or zhis.year in group:
+            if zhi_ in (zhis if zhi_ == "酉" else other_zhis):
+                taohuas.append(zhi_)
+            break
+
+    return Facts(
+        gans=gans, zhis=zhis, me=me, zhus=chart.zhus, female=bool(chart.female),
+        gan_ids=chart.gan_ids, jiazi_ids=chart.jiazi_ids,
+        gan_shens=gan_shens, zhi_shens=zhi_shens, zhi_shens2=zhi_shens2, zhi_shen3=chart.zhi_shen3,
+        shens=shens, shens2=chart.shens2, shen_zhus=list(zip(gan_shens, zhi_shens)),
+        scores=chart.scores, weak=chart.weak, zhi_6he=chart.zhi_6he, zhi_6chong=chart.zhi_6chong,
+        gan_he=chart.gan_he, zhi_xing=chart.zhi_xing, all_shens_list=chart.all_shens_list,
+        jus=chart.jus, ge=chart.ge, all_ges=all_ges,
+        me_lu=Zhi[me_zhis[stage_seqs['建']]], me_jue=Zhi[me_zhis[stage_seqs['绝']]],
+        me_tai=Zhi[me_zhis[stage_seqs['胎']]], me_di=Zhi[me_zhis[stage_seqs['帝']]], me_ku=ku('比'),
+        shang=gan('伤'), shang_lu=lu('伤'), shang_di=di('伤'),
+        yin=gan('印'), yin_lu=lu('印'), yin_ku=ku('印'),
+        xiao=gan('枭'), xiao_lu=lu('枭'),
+        cai=gan('财'), cai_lu=lu('财'), cai_di=di('财'), cai_ku=ku('财'),
+        piancai=gan('才'), piancai_lu=lu('才'), piancai_di=di('才'),
+        guan=gan('官'), guan_lu=lu('官'), guan_di=di('官'), guan_ku=ku('官'),
+        sha=gan('杀'), sha_lu=lu('杀'), sha_di=di('杀'),
+        jie=gan('劫'), shi=gan('食'), shi_lu=lu('食'), shi_di=di('食'), shi_ku=ku('食'),
+        guan_num=shens.count('官'), sha_num=shens.count('杀'), cai_num=shens.count('财'),
+        jie_num=shens.count('劫'), bi_num=shens.count('比'), yin_num=shens.count('印'),
+        shi_num=shens.count('食'), daoshi=daoshi, huagai=huagai, jiangxings=jiangxings, taohuas=taohuas)
+
+@functools.lru_cache(maxsize=None)
+def candidates(block, me, ge, month, female):
+    """block段中日主、格局、月支、男女均匹配索引键的规则。"""
+    return tuple(rule for rule in block_rules[block] 
+                 if (rule.me is None or me in rule.me) and (rule.ge is None or ge in rule.ge)
+                 and (rule.month is None or month in rule.month)
+                 and (rule.female is None or rule.female == female))
+
+def fire_rules(facts):
+    """按段落顺序对全部规则求值，返回触发的规则编号，逐柱的段落按柱的顺序排列。"""
+    tous = set(facts.gan_shens)
+    fired = []
+    for block in sorted(block_rules):
+        gate = block_gates.get(block)
+        if gate is not None and not gate(facts):
+            continue
+        block_candidates = [rule for rule in candidates(block, facts.me, facts.ge, facts.zhis.month, facts.female)
+                            if rule.tou is None or not tous.isdisjoint(rule.tou)]
+        pillar = pillar_filters.get(block)
+        if pillar is None:
+            fired.extend(rule.id for rule in block_candidates if rule.test(facts))
+            continue
+        for seq in range(4):
+            if pillar(facts, seq):
+                fired.extend(rule.id for rule in block_candidates if rule.test(facts, seq))
+    return fired
+
+def fired_blocks(fired):
+    """把触发的规则编号按段落分组，保持触发的顺序。"""
+    blocks = collections.defaultdict(list)
+    for rule_id in fired:
+        rule = rule_ids[rule_id]
+        blocks[rule.block].append(rule)
+    return blocks
+
+def print_rules(block, fired, facts, file=None):
+    """输出block段中已触发的断语，fired为fired_blocks的结果；断语可以是以Facts为参数的函数。"""
+    for rule in fired.get(block, ()):
+        text = rule.text(facts) if callable(rule.text) else rule.text
+        print(text, end='', file=file)
@@ -0,0 +1,44 @@
+# Textes classiques adressés par leur contenu, servis par GET /texts/<id>
+#
+# Chaque passage de datas.days60 (六十日用法口诀), yue.months (穷通宝鉴),
+# sizi.summarys (三命通会) et datas.chens (十二时辰) reçoit un identifiant
+# stable : le début du SHA-256 du livre et du texte. Les réponses de /bazi ne
+# portent que ces identifiants ; les corps JSON sont construits et compressés
+# une seule fois au chargement (avant le fork avec gunicorn) et ne changent
+# jamais pour un identifiant donné.
+import gzip
+import json
+import hashlib
+
+from bazi import classics_texts
+from datas import days60, chens
+from yue import months
+from sizi import summarys
+
+LIVRES = (('六十日用法口诀', days60), ('穷通宝鉴', months),
+          ('三命通会', summarys), ('十二时辰（初中末）出生吉凶', chens))
+
+
+def text_id(livre, texte):
+    """Identifiant d'un passage : 16 caractères hexadécimaux, fonction du seul contenu."""
+    return hashlib.sha256('{}\n{}'.format(livre, texte).encode()).hexdigest()[:16]
+
+
+def _corps():
+    # id -> (corps JSON, corps JSON compressé par gzip)
+    corps = {}
+    for livre, table in LIVRES:
+        for texte in table.values():
+            key = text_id(livre, texte)
+            if key not in corps:
+                body = json.dumps({'id': key, 'livre': livre, 'texte': texte},
+                                  sort_keys=True, separators=(',', ':')).encode()
+                corps[key] = (body, gzip.compress(body, 9, mtime=0))
+    return corps
+
+TEXTES = _corps()
+
+
+def references(chart):
+    """Passages classiques d'un bazi.Chart : [{'livre', 'id'}], dans l'ordre de la sortie texte."""
+    return [{'livre': livre, 'id': text_id(livre, texte)} for livre, texte in classics_texts(chart)]